@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+"""Compare per-instance OpenAI clients with the shared pooled client.
+
+Starts ``mock_openai_server`` in-process and runs the call sequence of
+``cli.py generate-full-notebook`` twice: once with each generator building
+its own client with the SDK's default pool (as before the shared client
+factory), once with every generator on the process-wide pooled client.
+
+Reported per variant: time spent constructing clients, TCP connections the
+server saw, wall time, and the mean per-call overhead (client-side call
+time minus the server's time answering it). The mock server speaks plain
+HTTP on localhost, so each new connection here costs a TCP handshake only;
+against the real API every one of them is also a TLS handshake.
+
+Usage:
+    python benchmarks/bench_client_pool.py --latency-ms 800
+    python benchmarks/bench_client_pool.py --subsystems intake,drivetrain,lift,claw
+"""
+
+import os
+import random
+import sys
+import time
+from pathlib import Path
+
+import openai
+import typer
+from rich.console import Console
+from rich.table import Table
+
+sys.path.insert(0, str(Path(__file__).parent))
+sys.path.insert(0, str(Path(__file__).parent.parent))
+os.environ.setdefault("OPENAI_API_KEY", "mock")
+
+from mock_openai_server import MockOpenAIServer
+from src.config import get_settings
+from src.generation import (
+    BrainstormGenerator,
+    ContentGenerator,
+    MeetingNotesGenerator,
+    TestingDataGenerator,
+)
+from src.llm import get_metrics_recorder
+
+console = Console()
+
+
+def generate_notebook(generator, brainstorm_gen, testing_gen, meeting_gen, subsystems):
+    """Make the model calls of ``generate-full-notebook``, discarding the text."""
+    generator.generate_game_analysis()
+    for subsystem in subsystems:
+        brainstorm_gen.generate_complete_brainstorm_section(subsystem)
+    for subsystem in subsystems:
+        generator.generate_build_documentation(subsystem)
+    for subsystem in subsystems:
+        testing_gen.generate_performance_test(
+            subsystem, f"{subsystem} efficiency", random.uniform(80, 120)
+        )
+    for subsystem in subsystems[:2]:
+        generator.generate_design_iteration(
+            subsystem, 2, "Performance below target, friction issues"
+        )
+    meeting_gen.generate_season_meetings(num_meetings=10, team_size=5)
+    generator.generate_programming_documentation("autonomous routine")
+
+
+def main(
+    latency_ms: float = typer.Option(800.0, help="Mock response latency (ms)"),
+    subsystems: str = typer.Option("intake,drivetrain,lift", help="Comma-separated subsystems"),
+):
+    settings = get_settings()
+    server = MockOpenAIServer(latency_ms=latency_ms, latency_distribution="fixed").start()
+    settings.openai_base_url = server.url
+    recorder = get_metrics_recorder()
+    recorder.enabled = False
+    subsystem_list = [s.strip() for s in subsystems.split(",") if s.strip()]
+
+    def own_client():
+        return openai.OpenAI(
+            api_key=settings.openai_api_key, base_url=server.url, max_retries=0
+        )
+
+    table = Table(
+        title=f"generate-full-notebook calls ({len(subsystem_list)} subsystems, "
+        f"{latency_ms:.0f} ms latency)"
+    )
+    table.add_column("Clients", style="cyan")
+    table.add_column("Setup ms", justify="right")
+    table.add_column("Calls", justify="right")
+    table.add_column("Connections", justify="right")
+    table.add_column("Wall s", justify="right")
+    table.add_column("Overhead ms/call", justify="right")
+
+    try:
+        for name, pooled in (("Per instance", False), ("Shared pool", True)):
+            server.reset()
+            start = len(recorder.snapshot())
+
+            started = time.perf_counter()
+            generators = [
+                cls(client=None if pooled else own_client())
+                for cls in (
+                    ContentGenerator,
+                    BrainstormGenerator,
+                    TestingDataGenerator,
+                    MeetingNotesGenerator,
+                )
+            ]
+            setup = time.perf_counter() - started
+
+            started = time.perf_counter()
+            generate_notebook(*generators, subsystem_list)
+            elapsed = time.perf_counter() - started
+
+            calls = recorder.snapshot()[start:]
+            served = sum(r["finished"] - r["arrived"] for r in server.records)
+            overhead = (sum(m.wall_seconds for m in calls) - served) / max(1, len(calls))
+            table.add_row(
+                name,
+                f"{setup * 1000:.1f}",
+                str(len(calls)),
+                str(server.connections),
+                f"{elapsed:.1f}",
+                f"{overhead * 1000:.2f}",
+            )
+    finally:
+        server.stop()
+
+    console.print(table)
+
+
+if __name__ == "__main__":
+    typer.run(main)
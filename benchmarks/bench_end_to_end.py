@@ -0,0 +1,191 @@
+#!/usr/bin/env python3
+"""End-to-end throughput benchmark against the local mock OpenAI server.
+
+Starts ``mock_openai_server`` in-process, then runs ``cli.py analyze`` and
+``cli.py generate-full-notebook`` as subprocesses pointed at it (with the
+analysis cache disabled and results written to a temporary directory), so
+no API calls are made and nothing in ``data/`` is touched.
+
+Reported per scenario:
+    - throughput (pages/s for analyze, requests/s for generation)
+    - p50/p95/p99 latency per request payload, measured by the server from
+      the first attempt's arrival to the successful response, so retries
+      and backoff are included
+    - attempts, injected 429s and 5xx errors
+    - peak RSS of the CLI process
+
+Usage:
+    python benchmarks/bench_end_to_end.py --pages 40 --latency-ms 500
+    python benchmarks/bench_end_to_end.py --rate-429 0.1 --rate-5xx 0.02
+"""
+
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict, List
+
+import typer
+from rich.console import Console
+from rich.table import Table
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from mock_openai_server import MockOpenAIServer
+
+PROJECT_ROOT = Path(__file__).parent.parent
+
+console = Console()
+
+
+def percentile(values: List[float], q: float) -> float:
+    """Nearest-rank percentile of ``values`` (0 if empty)."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = max(0, min(len(ordered) - 1, int(round(q / 100 * len(ordered))) - 1))
+    return ordered[index]
+
+
+def payload_latencies(records: List[Dict]) -> List[float]:
+    """Seconds from each payload's first attempt to its successful response."""
+    first_arrival, completed = {}, {}
+    for record in sorted(records, key=lambda r: r["arrived"]):
+        first_arrival.setdefault(record["key"], record["arrived"])
+        if record["status"] == 200:
+            completed[record["key"]] = record["finished"]
+    return [completed[key] - first_arrival[key] for key in completed]
+
+
+def run_cli(args: List[str], env: Dict[str, str]):
+    """Run cli.py to completion; return (wall seconds, exit code, peak RSS MB)."""
+    with tempfile.TemporaryFile() as stderr:
+        start = time.perf_counter()
+        process = subprocess.Popen(
+            [sys.executable, "cli.py", *args],
+            cwd=PROJECT_ROOT,
+            env=env,
+            stdout=subprocess.DEVNULL,
+            stderr=stderr,
+        )
+        # wait4 reports the resource usage of this child alone
+        _, status, usage = os.wait4(process.pid, 0)
+        elapsed = time.perf_counter() - start
+
+        exit_code = os.waitstatus_to_exitcode(status)
+        if exit_code != 0:
+            stderr.seek(0)
+            console.print(f"[red]cli.py {args[0]} exited with {exit_code}[/red]")
+            console.print(stderr.read().decode(errors="replace")[-2000:])
+
+    # ru_maxrss is kilobytes on Linux, bytes on macOS
+    scale = 1024 * 1024 if sys.platform == "darwin" else 1024
+    return elapsed, exit_code, usage.ru_maxrss / scale
+
+
+def main(
+    pages: int = typer.Option(40, help="Pages to analyze (from notebook-pages/)"),
+    concurrency: int = typer.Option(10, help="Requests in flight for analyze"),
+    pack_size: int = typer.Option(1, help="Pages per vision request"),
+    latency_ms: float = typer.Option(800.0, help="Mean mock response latency (ms)"),
+    latency_distribution: str = typer.Option(
+        "lognormal", help="fixed, uniform, exponential or lognormal"
+    ),
+    rate_429: float = typer.Option(0.0, help="Fraction of requests answered with 429"),
+    rate_5xx: float = typer.Option(0.0, help="Fraction of requests answered with 500/503"),
+    scenarios: str = typer.Option(
+        "analyze,generate", help="Comma-separated: analyze, generate"
+    ),
+    seed: int = typer.Option(0, help="Random seed for the mock server"),
+):
+    server = MockOpenAIServer(
+        latency_ms=latency_ms,
+        latency_distribution=latency_distribution,
+        rate_429=rate_429,
+        rate_5xx=rate_5xx,
+        seed=seed,
+    ).start()
+
+    table = Table(
+        title=(
+            f"End-to-end vs mock server ({latency_distribution} {latency_ms:.0f} ms, "
+            f"429 {rate_429:.0%}, 5xx {rate_5xx:.0%})"
+        )
+    )
+    table.add_column("Scenario", style="cyan")
+    table.add_column("Wall s", justify="right")
+    table.add_column("Throughput", justify="right")
+    table.add_column("p50 ms", justify="right")
+    table.add_column("p95 ms", justify="right")
+    table.add_column("p99 ms", justify="right")
+    table.add_column("Attempts", justify="right")
+    table.add_column("429 / 5xx", justify="right")
+    table.add_column("Peak RSS MB", justify="right")
+    table.add_column("Exit", justify="right")
+
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            env = dict(
+                os.environ,
+                OPENAI_API_KEY="mock",
+                OPENAI_BASE_URL=server.url,
+                RESULTS_DIR=str(Path(tmp) / "results"),
+                ANALYSIS_CACHE_ENABLED="false",
+            )
+            runs = {
+                "analyze": (
+                    [
+                        "analyze",
+                        "--pages",
+                        f"1-{pages}",
+                        "--no-cache",
+                        "--concurrency",
+                        str(concurrency),
+                        "--pack-size",
+                        str(pack_size),
+                    ],
+                    "pages/s",
+                ),
+                "generate": (
+                    ["generate-full-notebook", str(Path(tmp) / "notebook")],
+                    "req/s",
+                ),
+            }
+
+            for name in [s.strip() for s in scenarios.split(",") if s.strip()]:
+                args, unit = runs[name]
+                server.reset()
+                elapsed, code, rss_mb = run_cli(args, env)
+
+                records = list(server.records)
+                latencies = payload_latencies(records)
+                units = (
+                    min(pages, len(list((PROJECT_ROOT / "notebook-pages").glob("page_*.png"))))
+                    if name == "analyze"
+                    else len(latencies)
+                )
+                throttled = sum(r["status"] == 429 for r in records)
+                failed = sum(r["status"] >= 500 for r in records)
+
+                table.add_row(
+                    name,
+                    f"{elapsed:.1f}",
+                    f"{units / elapsed:.2f} {unit}",
+                    f"{percentile(latencies, 50) * 1000:.0f}",
+                    f"{percentile(latencies, 95) * 1000:.0f}",
+                    f"{percentile(latencies, 99) * 1000:.0f}",
+                    str(len(records)),
+                    f"{throttled} / {failed}",
+                    f"{rss_mb:.0f}",
+                    str(code),
+                )
+    finally:
+        server.stop()
+
+    console.print(table)
+
+
+if __name__ == "__main__":
+    typer.run(main)
@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""Compare page analysis with and without hedged requests.
+
+Starts ``mock_openai_server`` in-process with a fraction of straggling
+requests (several times the usual latency, as a slow backend replica
+would answer) and analyzes the pages in notebook-pages/ twice, once with
+hedging off and once with it on. Each run goes over the pages
+``--repeat`` times, for enough calls to place a p99. The hedger keeps the
+latencies it observed in the first run, so the second starts with a warm
+threshold, as a long-running process would.
+
+Reported per run: wall time, p50/p99 call latency, hedged calls, calls
+the duplicate won, and the extra tokens reserved by duplicates relative
+to the tokens of all calls.
+
+Usage:
+    python benchmarks/bench_hedging.py --rate-straggler 0.03
+    python benchmarks/bench_hedging.py --percentile 90 --budget 0.1
+"""
+
+import os
+import sys
+import time
+from pathlib import Path
+
+import typer
+from rich.console import Console
+from rich.table import Table
+
+sys.path.insert(0, str(Path(__file__).parent))
+sys.path.insert(0, str(Path(__file__).parent.parent))
+os.environ.setdefault("OPENAI_API_KEY", "mock")
+
+from mock_openai_server import MockOpenAIServer
+from src.analysis.vision_analyzer import VisionAnalyzer
+from src.config import get_settings
+from src.llm import get_hedger, get_metrics_recorder
+from src.llm.metrics import summarize
+from src.models import NotebookPage
+
+console = Console()
+
+
+def main(
+    pages: int = typer.Option(110, help="Pages to analyze"),
+    repeat: int = typer.Option(3, help="Times each page is analyzed per run"),
+    latency_ms: float = typer.Option(300.0, help="Mean mock response latency (ms)"),
+    rate_straggler: float = typer.Option(0.03, help="Fraction of straggling requests"),
+    straggler_factor: float = typer.Option(8.0, help="Slowdown of straggling requests"),
+    concurrency: int = typer.Option(10, help="Requests in flight"),
+    percentile: float = typer.Option(95.0, help="Latency percentile to hedge after"),
+    budget: float = typer.Option(0.05, help="Extra tokens allowed, as a fraction"),
+    seed: int = typer.Option(0, help="Random seed for the mock server"),
+):
+    settings = get_settings()
+    page_files = sorted(settings.notebook_pages_dir.glob("page_*.png"))[:pages]
+    if not page_files:
+        console.print("[red]No page_*.png files found in notebook-pages/[/red]")
+        raise typer.Exit(1)
+    notebook_pages = [
+        NotebookPage(page_number=i, file_path=f)
+        for i, f in enumerate(page_files * repeat, start=1)
+    ]
+
+    server = MockOpenAIServer(
+        latency_ms=latency_ms,
+        latency_distribution="lognormal",
+        rate_straggler=rate_straggler,
+        straggler_factor=straggler_factor,
+        seed=seed,
+    ).start()
+    settings.openai_base_url = server.url
+    recorder = get_metrics_recorder()
+    recorder.enabled = False
+    hedger = get_hedger()
+    hedger.percentile = percentile
+    hedger.budget = budget
+
+    table = Table(
+        title=f"Hedged requests ({len(notebook_pages)} calls, {concurrency} in flight, "
+        f"{rate_straggler:.0%} stragglers at {straggler_factor:.0f}x {latency_ms:.0f} ms)"
+    )
+    table.add_column("Hedging", style="cyan")
+    table.add_column("Wall s", justify="right")
+    table.add_column("p50 ms", justify="right")
+    table.add_column("p99 ms", justify="right")
+    table.add_column("Hedged", justify="right")
+    table.add_column("Hedge won", justify="right")
+    table.add_column("Extra tokens", justify="right")
+
+    try:
+        for enabled in (False, True):
+            hedger.enabled = enabled
+            hedger.sent_tokens = hedger.extra_tokens = 0
+            start = len(recorder.snapshot())
+
+            started = time.perf_counter()
+            VisionAnalyzer(use_cache=False, pages_per_request=1).analyze_pages(
+                notebook_pages, max_concurrency=concurrency, collect_results=False
+            )
+            elapsed = time.perf_counter() - started
+
+            summary = summarize(recorder.snapshot()[start:])
+            table.add_row(
+                "on" if enabled else "off",
+                f"{elapsed:.1f}",
+                f"{summary.wall_p50 * 1000:.0f}",
+                f"{summary.wall_p99 * 1000:.0f}",
+                f"{summary.hedged} ({summary.hedged / max(1, summary.calls):.1%})",
+                str(summary.hedge_won),
+                f"{hedger.extra_tokens / max(1, hedger.sent_tokens):.1%}",
+            )
+    finally:
+        server.stop()
+
+    console.print(table)
+
+
+if __name__ == "__main__":
+    typer.run(main)
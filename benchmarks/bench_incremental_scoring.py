@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""Compare full rescoring with incremental scoring as single pages change.
+
+Starts from synthetic notebooks (see ``bench_rubric_scoring.py``) and
+applies a sequence of random single-page edits: adding a page, removing
+one, or replacing one's analysis. After every edit the EN1-EN10 scores are
+read, either by running ``RubricMatcher.score_notebook`` over the whole
+notebook or from a ``ScoringState`` updated with the edit. The benchmark
+reports the time per edit of each and checks that every score, with its
+evidence and missing elements, is the same.
+
+Usage:
+    python benchmarks/bench_incremental_scoring.py
+    python benchmarks/bench_incremental_scoring.py --sizes 500 --updates 1000
+"""
+
+import os
+import random
+import sys
+import time
+from pathlib import Path
+
+import typer
+from rich.console import Console
+from rich.table import Table
+
+sys.path.insert(0, str(Path(__file__).parent))
+sys.path.insert(0, str(Path(__file__).parent.parent))
+os.environ.setdefault("OPENAI_API_KEY", "mock")
+
+from bench_rubric_scoring import synthetic_notebook
+from src.analysis.rubric_matcher import RubricMatcher
+from src.analysis.scoring_state import ScoringState
+
+console = Console()
+
+
+def edits(notebook, updates: int, seed: int):
+    """Random (operation, page) edits that keep the notebook near its size."""
+    rng = random.Random(seed)
+    donors = synthetic_notebook(max(100, updates), seed + 1)
+    numbers = [p.page_number for p in notebook]
+    next_number = max(numbers, default=0) + 1
+    result = []
+    for _ in range(updates):
+        roll = rng.random()
+        if roll < 0.5 and numbers:
+            page = rng.choice(donors).model_copy(update={"page_number": rng.choice(numbers)})
+            result.append(("replace", page))
+        elif roll < 0.75 or not numbers:
+            page = rng.choice(donors).model_copy(update={"page_number": next_number})
+            numbers.append(next_number)
+            next_number += 1
+            result.append(("add", page))
+        else:
+            number = numbers.pop(rng.randrange(len(numbers)))
+            result.append(("remove", number))
+    return result
+
+
+def main(
+    sizes: str = typer.Option("100,1000,10000", help="Comma-separated page counts"),
+    updates: int = typer.Option(200, help="Single-page edits per notebook"),
+    seed: int = typer.Option(0, help="Random seed"),
+):
+    matcher = RubricMatcher()
+    table = Table(title=f"Rescoring after each of {updates} single-page edits")
+    table.add_column("Pages", justify="right", style="cyan")
+    table.add_column("Full ms/edit", justify="right")
+    table.add_column("Incremental ms/edit", justify="right")
+    table.add_column("Speedup", justify="right")
+    table.add_column("Same scores", justify="right")
+
+    for size in [int(s) for s in sizes.split(",") if s.strip()]:
+        notebook = synthetic_notebook(size, seed)
+        changes = edits(notebook, updates, seed)
+
+        pages = {p.page_number: p for p in notebook}
+        full_scores = []
+        started = time.perf_counter()
+        for operation, change in changes:
+            if operation == "remove":
+                del pages[change]
+            else:
+                pages[change.page_number] = change
+            full_scores.append(matcher.score_notebook(list(pages.values())))
+        full = (time.perf_counter() - started) / updates
+
+        state = ScoringState(matcher, notebook)
+        incremental_scores = []
+        started = time.perf_counter()
+        for operation, change in changes:
+            if operation == "remove":
+                state.remove_page(change)
+            elif operation == "add":
+                state.add_page(change)
+            else:
+                state.replace_page(change)
+            incremental_scores.append(state.scores())
+        incremental = (time.perf_counter() - started) / updates
+
+        same = all(
+            {c: s.model_dump() for c, s in a.items()} == {c: s.model_dump() for c, s in b.items()}
+            for a, b in zip(full_scores, incremental_scores)
+        )
+        table.add_row(
+            f"{size:,}",
+            f"{full * 1000:.2f}",
+            f"{incremental * 1000:.3f}",
+            f"{full / incremental:.0f}x",
+            "yes" if same else "[red]no[/red]",
+        )
+
+    console.print(table)
+
+
+if __name__ == "__main__":
+    typer.run(main)
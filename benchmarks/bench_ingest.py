@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""Benchmark scan ingestion throughput against worker process count.
+
+Builds a folder of ``--images`` synthetic phone scans from the sample pages
+in notebook-pages/ (each rotated by a small random angle and saved as
+JPEG, like a camera upload), then runs ``PageIngester`` over it once per
+worker count and reports images/s and speedup over one worker.
+
+Speedup is bounded by the machine's cores: on a single-core machine every
+worker count runs at roughly the one-worker rate.
+
+Usage:
+    python benchmarks/bench_ingest.py --images 300
+    python benchmarks/bench_ingest.py --images 300 --workers 1,2,4,8
+"""
+
+import os
+import random
+import sys
+import tempfile
+from itertools import cycle, islice
+from pathlib import Path
+from typing import Optional
+
+import typer
+from PIL import Image
+from rich.console import Console
+from rich.table import Table
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.analysis.page_ingest import PageIngester
+from src.config import get_settings
+
+console = Console()
+
+
+def main(
+    images: int = typer.Option(120, help="Scans in the synthetic batch"),
+    workers: Optional[str] = typer.Option(
+        None, help="Comma-separated worker counts (default: 1, 2, 4, ... up to CPU count)"
+    ),
+    max_skew: float = typer.Option(3.0, help="Largest rotation applied to the scans"),
+    seed: int = typer.Option(0, help="Random seed for the rotations"),
+):
+    settings = get_settings()
+    sources = sorted(settings.notebook_pages_dir.glob("page_*.png"))
+    if not sources:
+        console.print("[red]No page_*.png files found in notebook-pages/[/red]")
+        raise typer.Exit(1)
+
+    cpus = os.cpu_count() or 1
+    if workers:
+        counts = [int(n) for n in workers.split(",")]
+    else:
+        counts = [1]
+        while counts[-1] * 2 <= cpus:
+            counts.append(counts[-1] * 2)
+        if counts[-1] != cpus:
+            counts.append(cpus)
+
+    rng = random.Random(seed)
+    with tempfile.TemporaryDirectory() as tmp:
+        scans = Path(tmp) / "scans"
+        scans.mkdir()
+        with console.status(f"Writing {images} synthetic scans..."):
+            for i, source in enumerate(islice(cycle(sources), images), start=1):
+                angle = rng.uniform(-max_skew, max_skew)
+                Image.open(source).convert("RGB").rotate(
+                    angle,
+                    resample=Image.Resampling.BICUBIC,
+                    expand=True,
+                    fillcolor=(255, 255, 255),
+                ).save(scans / f"IMG_{i:04d}.jpg", quality=90)
+
+        table = Table(title=f"Scan ingestion ({images} images, {cpus} CPUs)")
+        table.add_column("Workers", justify="right", style="cyan")
+        table.add_column("Seconds", justify="right")
+        table.add_column("Images/s", justify="right")
+        table.add_column("Speedup", justify="right")
+
+        baseline = None
+        for count in counts:
+            output = Path(tmp) / f"out_{count}"
+            result = PageIngester(max_workers=count).ingest(scans, output)
+            if result.failed:
+                console.print(f"[red]{len(result.failed)} images failed[/red]")
+            baseline = baseline or result.images_per_second
+            table.add_row(
+                str(count),
+                f"{result.seconds:.2f}",
+                f"{result.images_per_second:.1f}",
+                f"{result.images_per_second / baseline:.2f}x",
+            )
+
+    console.print(table)
+
+
+if __name__ == "__main__":
+    typer.run(main)
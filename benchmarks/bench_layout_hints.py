@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""Benchmark the local layout detectors against the vision model.
+
+Runs ``detect_layout`` on every page and reports:
+
+    - detector throughput (single process)
+    - how many key elements are settled locally and how much shorter the
+      single-page prompt gets
+    - agreement with the model's key_elements from a saved analysis, both
+      for settled flags (these replace the model's answer) and for all
+      candidate flags
+
+The reference should come from a run without layout hints, e.g.
+``python cli.py analyze --no-layout-hints``, so the model's answers are
+not themselves prefilled.
+
+Usage:
+    python benchmarks/bench_layout_hints.py
+    python benchmarks/bench_layout_hints.py --reference data/results/latest_analysis.json
+"""
+
+import sys
+import time
+from pathlib import Path
+from typing import Optional
+
+import typer
+from rich.console import Console
+from rich.table import Table
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.analysis.layout_detector import detect_layout
+from src.analysis.vision_analyzer import ANALYSIS_PROMPT, build_analysis_prompt
+from src.config import get_settings
+from src.models import NotebookAnalysis
+
+console = Console()
+
+
+def main(
+    pages: Optional[int] = typer.Option(None, help="Pages to scan (default: all)"),
+    reference: Optional[Path] = typer.Option(
+        None, help="Saved analysis to compare with (default: latest_analysis.json)"
+    ),
+    min_confidence: Optional[float] = typer.Option(
+        None, help="Confidence needed to settle a flag (default: LAYOUT_MIN_CONFIDENCE)"
+    ),
+):
+    settings = get_settings()
+    if min_confidence is None:
+        min_confidence = settings.layout_min_confidence
+    page_files = sorted(settings.notebook_pages_dir.glob("page_*.png"))[:pages]
+    if not page_files:
+        console.print("[red]No page_*.png files found in notebook-pages/[/red]")
+        raise typer.Exit(1)
+
+    reference = reference or settings.results_dir / "latest_analysis.json"
+    model_elements = {}
+    if reference.exists():
+        analysis = NotebookAnalysis.load_from_file(reference)
+        model_elements = {
+            a.page_number: a.key_elements
+            for a in analysis.page_analyses
+            if a.content_type not in ("error", "blank") and a.key_elements
+        }
+
+    images = [f.read_bytes() for f in page_files]
+    start = time.perf_counter()
+    hints = {i: detect_layout(image) for i, image in enumerate(images, start=1)}
+    elapsed = time.perf_counter() - start
+
+    settled = {page: h.settled(min_confidence) for page, h in hints.items()}
+    prompt_chars = [len(build_analysis_prompt(s)) for s in settled.values()]
+
+    summary = Table(title=f"Layout detectors ({len(images)} pages)")
+    summary.add_column("Metric", style="cyan")
+    summary.add_column("Value", justify="right")
+    summary.add_row("Detector ms/page", f"{elapsed / len(images) * 1000:.1f}")
+    summary.add_row("Pages/s (1 process)", f"{len(images) / elapsed:.1f}")
+    summary.add_row(
+        "Pages with settled flags",
+        f"{sum(bool(s) for s in settled.values())}/{len(settled)}",
+    )
+    summary.add_row("Full prompt chars", str(len(ANALYSIS_PROMPT)))
+    summary.add_row(
+        "Mean hinted prompt chars", f"{sum(prompt_chars) / len(prompt_chars):.0f}"
+    )
+    console.print(summary)
+
+    elements = sorted({name for h in hints.values() for name in h.flags})
+    table = Table(title=f"Per element (settled at confidence >= {min_confidence})")
+    table.add_column("Element", style="cyan")
+    table.add_column("Candidate true", justify="right")
+    table.add_column("Settled", justify="right")
+    table.add_column("Settled agree", justify="right")
+    table.add_column("Candidate agree", justify="right")
+
+    for name in elements:
+        compared = [p for p in hints if name in model_elements.get(p, {})]
+        settled_pages = [p for p in compared if name in settled[p]]
+
+        def ratio(pages):
+            if not pages:
+                return "-"
+            agree = sum(
+                hints[p].flags[name] == bool(model_elements[p][name]) for p in pages
+            )
+            return f"{agree}/{len(pages)}"
+
+        table.add_row(
+            name,
+            str(sum(h.flags[name] for h in hints.values())),
+            str(sum(name in s for s in settled.values())),
+            ratio(settled_pages),
+            ratio(compared),
+        )
+    console.print(table)
+
+    if not model_elements:
+        console.print(
+            f"[yellow]No model key elements found in {reference}; run "
+            "`python cli.py analyze --no-layout-hints` first to measure agreement.[/yellow]"
+        )
+
+
+if __name__ == "__main__":
+    typer.run(main)
@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""Benchmark how pages-per-request trades throughput against agreement.
+
+Each pack size analyzes the same pages with the cache disabled. Agreement
+is measured against the single-page (pack size 1) results: matching
+content type, Jaccard overlap of rubric categories, and matching
+key_elements flags.
+
+Usage:
+    python benchmarks/bench_pack_size.py --pages 20 --sizes 1,2,4,8
+"""
+
+import sys
+import time
+from pathlib import Path
+
+import typer
+from rich.console import Console
+from rich.table import Table
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.analysis import VisionAnalyzer
+from src.config import get_settings
+from src.models import NotebookPage
+
+console = Console()
+
+
+def agreement(baseline, analyses):
+    """Return (content type, rubric category, key element) agreement ratios."""
+    type_matches, category_overlap, element_matches, element_total = 0, 0.0, 0, 0
+
+    for base, other in zip(baseline, analyses):
+        type_matches += base.content_type == other.content_type
+
+        base_cats, other_cats = set(base.rubric_categories), set(other.rubric_categories)
+        union = base_cats | other_cats
+        category_overlap += len(base_cats & other_cats) / len(union) if union else 1.0
+
+        for element in set(base.key_elements) | set(other.key_elements):
+            element_total += 1
+            element_matches += bool(base.key_elements.get(element)) == bool(
+                other.key_elements.get(element)
+            )
+
+    count = len(baseline) or 1
+    return (
+        type_matches / count,
+        category_overlap / count,
+        element_matches / element_total if element_total else 1.0,
+    )
+
+
+def main(
+    pages: int = typer.Option(20, help="Number of pages to analyze per pack size"),
+    sizes: str = typer.Option("1,2,4", help="Comma-separated pack sizes; 1 is the baseline"),
+    concurrency: int = typer.Option(4, help="Requests in flight"),
+):
+    settings = get_settings()
+    page_files = sorted(settings.notebook_pages_dir.glob("page_*.png"))[:pages]
+    notebook_pages = [
+        NotebookPage(page_number=i, file_path=f) for i, f in enumerate(page_files, 1)
+    ]
+    pack_sizes = sorted({int(size) for size in sizes.split(",")} | {1})
+
+    table = Table(title=f"Pack size trade-off ({len(notebook_pages)} pages)")
+    table.add_column("Pages/request", justify="right", style="cyan")
+    table.add_column("Wall s", justify="right")
+    table.add_column("Pages/s", justify="right")
+    table.add_column("Errors", justify="right")
+    table.add_column("Type agree", justify="right")
+    table.add_column("Category overlap", justify="right")
+    table.add_column("Element agree", justify="right")
+
+    baseline = None
+    for pack_size in pack_sizes:
+        analyzer = VisionAnalyzer(
+            use_cache=False, max_concurrency=concurrency, pages_per_request=pack_size
+        )
+        start = time.perf_counter()
+        analyses = analyzer.analyze_pages(notebook_pages)
+        elapsed = time.perf_counter() - start
+
+        if baseline is None:
+            baseline = analyses
+        type_agree, category_agree, element_agree = agreement(baseline, analyses)
+
+        table.add_row(
+            str(pack_size),
+            f"{elapsed:.1f}",
+            f"{len(analyses) / elapsed:.2f}",
+            str(sum(a.content_type == "error" for a in analyses)),
+            f"{type_agree:.0%}",
+            f"{category_agree:.0%}",
+            f"{element_agree:.0%}",
+        )
+
+    console.print(table)
+
+
+if __name__ == "__main__":
+    typer.run(main)
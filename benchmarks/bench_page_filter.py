@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""Benchmark the local blank/near-duplicate page filter.
+
+Builds a notebook of ``--pages`` pages by linking the sample pages in
+notebook-pages/ repeatedly (so every page past the first pass is an exact
+duplicate of an earlier one), then times:
+
+    - cold: decoding every page to compute ink coverage and perceptual hash
+    - warm: planning again with signatures carried over in the manifest,
+      as an incremental or repeated run would
+
+Usage:
+    python benchmarks/bench_page_filter.py --pages 1000 --workers 8
+"""
+
+import os
+import sys
+import tempfile
+import time
+from itertools import cycle, islice
+from pathlib import Path
+from typing import Optional
+
+import typer
+from rich.console import Console
+from rich.table import Table
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.analysis.page_filter import PageFilter
+from src.analysis.page_manifest import build_manifest
+from src.config import get_settings
+
+console = Console()
+
+
+def main(
+    pages: int = typer.Option(1000, help="Pages in the synthetic notebook"),
+    workers: Optional[int] = typer.Option(None, help="Signature processes (default: CPU count)"),
+):
+    settings = get_settings()
+    sources = sorted(settings.notebook_pages_dir.glob("page_*.png"))
+    if not sources:
+        console.print("[red]No page_*.png files found in notebook-pages/[/red]")
+        raise typer.Exit(1)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        page_files = []
+        for i, source in enumerate(islice(cycle(sources), pages), start=1):
+            link = Path(tmp) / f"page_{i:04d}.png"
+            os.symlink(source.resolve(), link)
+            page_files.append(link)
+
+        start = time.perf_counter()
+        manifest = build_manifest(page_files)
+        hash_seconds = time.perf_counter() - start
+        page_numbers = [fp.page_number for fp in manifest]
+
+        page_filter = PageFilter(max_workers=workers)
+        start = time.perf_counter()
+        page_filter.ensure_signatures(manifest)
+        signature_seconds = time.perf_counter() - start
+        plan = page_filter.plan(manifest, page_numbers)
+        cold_seconds = time.perf_counter() - start
+
+        start = time.perf_counter()
+        warm_plan = PageFilter(max_workers=workers).plan(manifest, page_numbers)
+        warm_seconds = time.perf_counter() - start
+
+    table = Table(title=f"Page filter ({pages} pages, {page_filter.max_workers} workers)")
+    table.add_column("Stage", style="cyan")
+    table.add_column("Seconds", justify="right")
+    table.add_column("Pages/s", justify="right")
+    table.add_row("Content hashes (manifest)", f"{hash_seconds:.2f}", f"{pages / hash_seconds:.0f}")
+    table.add_row("Signatures (cold)", f"{signature_seconds:.2f}", f"{pages / signature_seconds:.0f}")
+    table.add_row("Plan incl. signatures (cold)", f"{cold_seconds:.2f}", f"{pages / cold_seconds:.0f}")
+    table.add_row("Plan (warm, signatures cached)", f"{warm_seconds:.2f}", f"{pages / warm_seconds:.0f}")
+    console.print(table)
+
+    console.print(
+        f"Blank: {len(plan.blank)}  Near-duplicates: {len(plan.duplicates)}  "
+        f"To analyze: {len(plan.to_analyze)}"
+        + ("" if warm_plan == plan else "  [red](warm plan differs!)[/red]")
+    )
+
+
+if __name__ == "__main__":
+    typer.run(main)
@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""Compare file-order and priority-scheduled page analysis.
+
+Starts ``mock_openai_server`` in-process and analyzes the pages in
+notebook-pages/ once in file order. That run stands in for the previous
+saved analysis: its scores and per-page rubric categories drive
+``plan_schedule``, and the pages are analyzed again in the planned order.
+``--weak`` lowers chosen criteria to 1, standing in for a progress
+snapshot where they were the weakest. For each order the benchmark reports
+when the running scores of EN1-EN4, and of the criteria the schedule
+favoured, stopped changing.
+
+The mock server answers each page identically every time, so the previous
+run predicts the new one exactly; with real notebooks, pages edited since
+the last run make the gain smaller.
+
+Usage:
+    python benchmarks/bench_page_schedule.py --latency-ms 300
+    python benchmarks/bench_page_schedule.py --weak ""
+"""
+
+import os
+import sys
+from pathlib import Path
+
+import typer
+from rich.console import Console
+from rich.table import Table
+
+sys.path.insert(0, str(Path(__file__).parent))
+sys.path.insert(0, str(Path(__file__).parent.parent))
+os.environ.setdefault("OPENAI_API_KEY", "mock")
+
+from mock_openai_server import MockOpenAIServer
+from src.analysis.page_scheduler import STABLE_CRITERIA, ScoreTimeline, plan_schedule
+from src.analysis.rubric_matcher import RubricMatcher
+from src.analysis.vision_analyzer import VisionAnalyzer
+from src.config import get_settings
+from src.models import NotebookPage
+
+console = Console()
+
+
+def main(
+    pages: int = typer.Option(110, help="Pages to analyze"),
+    latency_ms: float = typer.Option(300.0, help="Mock server latency (ms)"),
+    concurrency: int = typer.Option(10, help="Requests in flight"),
+    weak: str = typer.Option(
+        "EN4,EN6,EN7",
+        help="Criteria a progress snapshot scored 1, as if the team's last "
+        "snapshot showed them weakest ('' to use the previous run's scores)",
+    ),
+):
+    settings = get_settings()
+    page_files = sorted(settings.notebook_pages_dir.glob("page_*.png"))[:pages]
+    if not page_files:
+        console.print("[red]No page_*.png files found in notebook-pages/[/red]")
+        raise typer.Exit(1)
+    notebook_pages = [
+        NotebookPage(page_number=i, file_path=f) for i, f in enumerate(page_files, start=1)
+    ]
+
+    server = MockOpenAIServer(latency_ms=latency_ms, latency_distribution="fixed").start()
+    settings.openai_base_url = server.url
+    matcher = RubricMatcher()
+
+    def run(order):
+        analyzer = VisionAnalyzer(use_cache=False, pages_per_request=1)
+        watched = ScoreTimeline(matcher)
+        favoured = ScoreTimeline(matcher, criteria=focus)
+        by_number = {p.page_number: p for p in notebook_pages}
+
+        def on_result(analysis):
+            watched.record(analysis)
+            favoured.record(analysis)
+
+        analyzer.analyze_pages(
+            [by_number[n] for n in order],
+            max_concurrency=concurrency,
+            on_result=on_result,
+            collect_results=False,
+        )
+        return watched.time_to_stable(), favoured.time_to_stable()
+
+    try:
+        file_order = [p.page_number for p in notebook_pages]
+        previous = VisionAnalyzer(use_cache=False, pages_per_request=1).analyze_pages(
+            notebook_pages, max_concurrency=concurrency
+        )
+        scores = {code: s.score for code, s in matcher.score_notebook(previous).items()}
+        for code in filter(None, weak.split(",")):
+            scores[code] = 1
+        plan = plan_schedule(
+            file_order,
+            {a.page_number: a for a in previous},
+            scores,
+            matcher.score_margins(previous),
+        )
+        focus = tuple(code for code, weight in plan.weights.items() if weight > 1)
+        focus = focus or STABLE_CRITERIA
+
+        table = Table(
+            title=f"Time to stable scores ({len(notebook_pages)} pages, "
+            f"{concurrency} in flight, {latency_ms:.0f} ms latency)"
+        )
+        table.add_column("Order", style="cyan")
+        table.add_column(
+            f"{STABLE_CRITERIA[0]}-{STABLE_CRITERIA[-1]} stable", justify="right"
+        )
+        table.add_column(f"{', '.join(focus)} stable", justify="right")
+
+        for name, order in (("File order", file_order), ("Prioritized", plan.order)):
+            watched, favoured = run(order)
+            table.add_row(
+                name,
+                f"{watched[0]:.1f}s ({watched[1]} pages)",
+                f"{favoured[0]:.1f}s ({favoured[1]} pages)",
+            )
+    finally:
+        server.stop()
+
+    console.print(table)
+    console.print(
+        "Criterion weights: "
+        + ", ".join(f"{code} {weight:.0f}" for code, weight in plan.weights.items())
+        + f"; borderline: {', '.join(plan.borderline) or 'none'}"
+    )
+
+
+if __name__ == "__main__":
+    typer.run(main)
@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""Benchmark image preprocessing: bytes per page, encode time and request latency.
+
+Usage:
+    python benchmarks/bench_preprocess.py --pages 20
+    python benchmarks/bench_preprocess.py --pages 10 --live   # also time real requests
+"""
+
+import base64
+import io
+import statistics
+import sys
+import time
+from pathlib import Path
+
+import typer
+from PIL import Image
+from rich.console import Console
+from rich.table import Table
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.analysis import VisionAnalyzer
+from src.analysis.image_preprocessor import ImagePreprocessor, estimate_image_tokens
+from src.config import get_settings
+from src.models import NotebookPage
+
+console = Console()
+
+
+def run_variant(name, preprocessor, page_files, detail, live):
+    """Measure one preprocessing variant over the given pages."""
+    sizes, encode_times, tokens, latencies = [], [], [], []
+
+    for page_file in page_files:
+        raw = page_file.read_bytes()
+
+        start = time.perf_counter()
+        payload = preprocessor.process(raw) if preprocessor else raw
+        encoded = base64.b64encode(payload)
+        encode_times.append(time.perf_counter() - start)
+
+        sizes.append(len(encoded))
+        with Image.open(io.BytesIO(payload)) as image:
+            tokens.append(estimate_image_tokens(*image.size, detail=detail))
+
+    if live:
+        analyzer = VisionAnalyzer(
+            use_cache=False,
+            use_preprocessing=preprocessor is not None,
+            preprocessor=preprocessor,
+            detail=detail,
+        )
+        for i, page_file in enumerate(page_files, 1):
+            start = time.perf_counter()
+            analyzer.analyze_page(NotebookPage(page_number=i, file_path=page_file))
+            latencies.append(time.perf_counter() - start)
+
+    return {
+        "name": name,
+        "kb_per_page": statistics.mean(sizes) / 1024,
+        "encode_ms": statistics.mean(encode_times) * 1000,
+        "tokens": statistics.mean(tokens),
+        "latency_ms": statistics.median(latencies) * 1000 if latencies else None,
+    }
+
+
+def main(
+    pages: int = typer.Option(20, help="Number of pages to benchmark"),
+    detail: str = typer.Option("auto", help="Image detail level for token estimates"),
+    live: bool = typer.Option(
+        False, help="Also time end-to-end requests against the configured API"
+    ),
+):
+    settings = get_settings()
+    page_files = sorted(settings.notebook_pages_dir.glob("page_*.png"))[:pages]
+    if not page_files:
+        console.print("[red]No page_*.png files found[/red]")
+        raise typer.Exit(1)
+
+    variants = [
+        ("raw png (before)", None),
+        ("jpeg q80 1024px", ImagePreprocessor(image_format="jpeg", quality=80, max_long_edge=1024)),
+        ("webp q80 1024px", ImagePreprocessor(image_format="webp", quality=80, max_long_edge=1024)),
+        ("png 1024px", ImagePreprocessor(image_format="png", max_long_edge=1024)),
+        ("jpeg q70 768px", ImagePreprocessor(image_format="jpeg", quality=70, max_long_edge=768)),
+    ]
+
+    table = Table(title=f"Image preprocessing ({len(page_files)} pages, detail={detail})")
+    table.add_column("Variant", style="cyan")
+    table.add_column("Upload KB/page", justify="right")
+    table.add_column("Encode ms/page", justify="right")
+    table.add_column("Image tokens", justify="right")
+    table.add_column("p50 latency ms", justify="right")
+
+    for name, preprocessor in variants:
+        result = run_variant(name, preprocessor, page_files, detail, live)
+        table.add_row(
+            result["name"],
+            f"{result['kb_per_page']:.1f}",
+            f"{result['encode_ms']:.1f}",
+            f"{result['tokens']:.0f}",
+            f"{result['latency_ms']:.0f}" if result["latency_ms"] is not None else "-",
+        )
+
+    console.print(table)
+
+
+if __name__ == "__main__":
+    typer.run(main)
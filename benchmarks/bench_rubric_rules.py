@@ -0,0 +1,296 @@
+#!/usr/bin/env python3
+"""Check the compiled score rules against the hardcoded chain they replaced.
+
+``RubricMatcher`` scores criteria with rules compiled from
+``data/rubric/criteria.yaml``. This benchmark keeps the if/elif chain that
+used to live in ``RubricMatcher._calculate_score`` as a reference and:
+
+- checks that both give the same score, status, evidence and missing
+  elements for every criterion over random page counts (plus the edge
+  cases of no tagged pages and counts on each threshold)
+- measures scoring throughput of each (criterion scorings per second)
+
+Exits with status 1 if any output differs.
+
+Usage:
+    python benchmarks/bench_rubric_rules.py
+    python benchmarks/bench_rubric_rules.py --cases 50000
+"""
+
+import os
+import random
+import sys
+import time
+from pathlib import Path
+from typing import List
+
+import typer
+from rich.console import Console
+from rich.table import Table
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+os.environ.setdefault("OPENAI_API_KEY", "mock")
+
+from src.analysis.page_matrix import CriterionCounts
+from src.analysis.rubric_matcher import RubricMatcher
+from src.models import RubricStatus
+
+console = Console()
+
+KEY_ELEMENTS = [
+    "brainstorming",
+    "decision_matrix",
+    "cad_drawings",
+    "testing_data",
+    "failure_documentation",
+    "design_iteration",
+    "meeting_notes",
+    "dates_timestamps",
+]
+# Page counts that sit on or next to a threshold of the hardcoded rules
+EDGE_COUNTS = [0, 1, 2, 3, 4, 5, 7, 8, 9]
+
+
+def hardcoded_score(code: str, title: str, counts: CriterionCounts) -> tuple:
+    """Score a criterion with the if/elif chain the compiled rules replaced."""
+    evidence = []
+    missing = []
+    key_elements = counts.key_elements
+
+    # EN1: Identify the Challenge
+    if code == "EN1":
+        has_game_analysis = counts.content_types["game_analysis"] > 0
+        has_challenge_id = counts.pages > 0
+
+        if has_game_analysis and has_challenge_id:
+            score = 3
+            status = RubricStatus.FULLY_DEVELOPED
+            evidence = [f"Found {counts.pages} pages identifying challenges"]
+        elif has_challenge_id:
+            score = 2
+            status = RubricStatus.DEVELOPING
+            evidence = ["Some challenge identification present"]
+            missing = ["Need detailed game analysis with strategy breakdown"]
+        else:
+            score = 1
+            status = RubricStatus.PARTIAL
+            missing = ["Missing challenge identification pages"]
+
+    # EN4: Brainstorm Solutions (3+ options)
+    elif code == "EN4":
+        brainstorming_count = key_elements.get("brainstorming", 0)
+        decision_matrix_count = key_elements.get("decision_matrix", 0)
+
+        if brainstorming_count >= 3 and decision_matrix_count >= 1:
+            score = 3
+            status = RubricStatus.FULLY_DEVELOPED
+            evidence = [
+                f"Found {brainstorming_count} pages with multiple design options",
+                f"Found {decision_matrix_count} decision matrices",
+            ]
+        elif brainstorming_count >= 1:
+            score = 2
+            status = RubricStatus.DEVELOPING
+            evidence = [f"Found {brainstorming_count} brainstorming pages"]
+            missing = [
+                "Need 3+ design options per subsystem with diagrams",
+                "Need decision matrices to justify selections",
+            ]
+        else:
+            score = 1
+            status = RubricStatus.PARTIAL
+            missing = [
+                "Missing brainstorming pages",
+                "Need 3+ options per subsystem",
+                "Need decision matrices",
+            ]
+
+    # EN5: Build and Program Documentation
+    elif code == "EN5":
+        cad_count = key_elements.get("cad_drawings", 0)
+        build_pages = counts.content_types["build"]
+
+        if cad_count >= 3 and build_pages >= 5:
+            score = 3
+            status = RubricStatus.FULLY_DEVELOPED
+            evidence = [
+                f"Found {cad_count} pages with CAD drawings",
+                f"Found {build_pages} build documentation pages",
+            ]
+        elif cad_count >= 1 or build_pages >= 2:
+            score = 2
+            status = RubricStatus.DEVELOPING
+            evidence = ["Some build documentation present"]
+            missing = ["Need more detailed build steps", "Add more CAD/technical drawings"]
+        else:
+            score = 1
+            status = RubricStatus.PARTIAL
+            missing = ["Missing comprehensive build documentation"]
+
+    # EN6: Test and Record Results
+    elif code == "EN6":
+        testing_count = key_elements.get("testing_data", 0)
+        failure_docs = key_elements.get("failure_documentation", 0)
+
+        if testing_count >= 3 and failure_docs >= 1:
+            score = 3
+            status = RubricStatus.FULLY_DEVELOPED
+            evidence = [
+                f"Found {testing_count} pages with quantitative test data",
+                "Documented failures and successes",
+            ]
+        elif testing_count >= 1:
+            score = 2
+            status = RubricStatus.DEVELOPING
+            evidence = ["Some testing documentation present"]
+            missing = [
+                "Need more quantitative test data",
+                "Document both successes AND failures",
+            ]
+        else:
+            score = 1
+            status = RubricStatus.PARTIAL
+            missing = ["Missing testing documentation with quantitative data"]
+
+    # EN7: Design Iterations
+    elif code == "EN7":
+        iteration_count = key_elements.get("design_iteration", 0)
+
+        if iteration_count >= 3:
+            score = 3
+            status = RubricStatus.FULLY_DEVELOPED
+            evidence = [f"Found {iteration_count} clear design iterations"]
+        elif iteration_count >= 1:
+            score = 2
+            status = RubricStatus.DEVELOPING
+            evidence = ["Some design iterations present"]
+            missing = [
+                "Need more clearly labeled design cycles",
+                "Show progression and improvement over time",
+            ]
+        else:
+            score = 1
+            status = RubricStatus.PARTIAL
+            missing = ["Missing clear design iteration documentation"]
+
+    # EN8: Project Management
+    elif code == "EN8":
+        meeting_count = key_elements.get("meeting_notes", 0)
+
+        if meeting_count >= 5 and counts.pages >= 8:
+            score = 3
+            status = RubricStatus.FULLY_DEVELOPED
+            evidence = [
+                f"Found {meeting_count} meeting notes",
+                "Project management documentation present",
+            ]
+        elif meeting_count >= 2:
+            score = 2
+            status = RubricStatus.DEVELOPING
+            evidence = ["Some project management documentation"]
+            missing = [
+                "Need more regular meeting notes",
+                "Document team roles and responsibilities",
+            ]
+        else:
+            score = 1
+            status = RubricStatus.PARTIAL
+            missing = ["Missing project management documentation"]
+
+    # EN9: Sequential Documentation
+    elif code == "EN9":
+        dated_count = key_elements.get("dates_timestamps", 0)
+        total_pages = counts.pages or 1
+
+        dated_percentage = (dated_count / total_pages) * 100 if total_pages > 0 else 0
+
+        if dated_percentage >= 80:
+            score = 3
+            status = RubricStatus.FULLY_DEVELOPED
+            evidence = [f"{dated_percentage:.0f}% of pages have dates/timestamps"]
+        elif dated_percentage >= 50:
+            score = 2
+            status = RubricStatus.DEVELOPING
+            evidence = [f"{dated_percentage:.0f}% of pages have dates"]
+            missing = ["Add dates/timestamps to more entries"]
+        else:
+            score = 1
+            status = RubricStatus.PARTIAL
+            missing = ["Most pages missing dates/timestamps"]
+
+    # Default scoring for other criteria
+    else:
+        if counts.pages >= 5:
+            score = 3
+            status = RubricStatus.FULLY_DEVELOPED
+            evidence = [f"Found {counts.pages} relevant pages"]
+        elif counts.pages >= 2:
+            score = 2
+            status = RubricStatus.DEVELOPING
+            evidence = [f"Found {counts.pages} relevant pages"]
+        else:
+            score = 1
+            status = RubricStatus.PARTIAL
+            evidence = []
+            missing = [f"Need more content for {title}"]
+
+    return score, status, evidence, missing
+
+
+def random_counts(rng: random.Random, markers: List[str]) -> CriterionCounts:
+    """Counts over a random set of tagged pages."""
+    pages = rng.choice(EDGE_COUNTS) if rng.random() < 0.5 else rng.randint(0, 40)
+    return CriterionCounts(
+        pages=pages,
+        key_elements={
+            name: count
+            for name in KEY_ELEMENTS
+            if (count := rng.choice([0, rng.randint(0, pages)]))
+        },
+        content_types={marker: rng.randint(0, pages) for marker in markers},
+    )
+
+
+def main(
+    cases: int = typer.Option(20000, help="Random page counts scored per criterion"),
+    seed: int = typer.Option(0, help="Random seed"),
+):
+    matcher = RubricMatcher()
+    rng = random.Random(seed)
+    samples = [random_counts(rng, matcher.markers) for _ in range(cases)]
+    titles = {code: c.title for code, c in matcher.criteria.items()}
+
+    mismatches = 0
+    for code, rule in matcher.rules.items():
+        for counts in samples:
+            if rule.score(counts) != hardcoded_score(code, titles[code], counts):
+                mismatches += 1
+                if mismatches <= 5:
+                    console.print(f"[red]{code} differs for {counts}[/red]")
+
+    table = Table(title=f"Scoring throughput ({cases:,} counts x {len(matcher.rules)} criteria)")
+    table.add_column("Scorer", style="cyan")
+    table.add_column("Seconds", justify="right")
+    table.add_column("Scorings/s", justify="right")
+
+    for name, score in (
+        ("Hardcoded chain", lambda code, counts: hardcoded_score(code, titles[code], counts)),
+        ("Compiled rules", lambda code, counts: matcher.rules[code].score(counts)),
+    ):
+        started = time.perf_counter()
+        for code in matcher.rules:
+            for counts in samples:
+                score(code, counts)
+        elapsed = time.perf_counter() - started
+        total = cases * len(matcher.rules)
+        table.add_row(name, f"{elapsed:.3f}", f"{total / elapsed:,.0f}")
+
+    console.print(table)
+    if mismatches:
+        console.print(f"[red]{mismatches} scorings differ from the hardcoded chain[/red]")
+        raise typer.Exit(1)
+    console.print("[green]Compiled rules match the hardcoded chain on every case[/green]")
+
+
+if __name__ == "__main__":
+    typer.run(main)
@@ -0,0 +1,161 @@
+#!/usr/bin/env python3
+"""Compare per-criterion loop scoring with matrix scoring of a notebook.
+
+Builds synthetic notebooks of random page analyses (content types, rubric
+tags and key elements drawn at rates like those of real analyses) and
+scores EN1-EN10 two ways:
+
+- loop: for every criterion, filter the pages tagged with it and count
+  their key elements and content types in Python, as ``RubricMatcher``
+  did before ``PageMatrix``
+- matrix: encode the pages once into a ``PageMatrix``, then take every
+  criterion's counts from one matrix product
+
+Both feed the same rubric rules, and the benchmark checks that they give
+the same scores. Encoding is reported separately from the reductions:
+``estimate_scores`` and ``score_margins`` encode once and reduce many times.
+
+Usage:
+    python benchmarks/bench_rubric_scoring.py
+    python benchmarks/bench_rubric_scoring.py --sizes 100,10000
+"""
+
+import os
+import random
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List
+
+import typer
+from rich.console import Console
+from rich.table import Table
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+os.environ.setdefault("OPENAI_API_KEY", "mock")
+
+from src.analysis.page_matrix import CriterionCounts, PageMatrix
+from src.analysis.rubric_matcher import RubricMatcher
+from src.models import PageAnalysis
+
+console = Console()
+
+CONTENT_TYPES = [
+    "game_analysis",
+    "brainstorming",
+    "design",
+    "build_documentation",
+    "programming",
+    "testing",
+    "meeting_notes",
+    "appendix",
+]
+KEY_ELEMENTS = [
+    "brainstorming",
+    "decision_matrix",
+    "cad_drawings",
+    "testing_data",
+    "failure_documentation",
+    "design_iteration",
+    "meeting_notes",
+    "dates_timestamps",
+]
+# Distinct synthetic pages; larger notebooks reuse them so a million
+# analyses fit in memory
+TEMPLATES = 2000
+
+
+def synthetic_notebook(pages: int, seed: int) -> List[PageAnalysis]:
+    """Random page analyses, built from a pool of distinct templates."""
+    rng = random.Random(seed)
+    templates = [
+        PageAnalysis(
+            page_number=0,
+            content_type=rng.choice(CONTENT_TYPES),
+            summary="",
+            rubric_categories=rng.sample([f"EN{k}" for k in range(1, 11)], rng.randint(1, 3)),
+            key_elements={name: rng.random() < 0.3 for name in KEY_ELEMENTS},
+        )
+        for _ in range(min(pages, TEMPLATES))
+    ]
+    return [
+        PageAnalysis.model_construct(
+            **{**dict(templates[rng.randrange(len(templates))]), "page_number": number}
+        )
+        for number in range(1, pages + 1)
+    ]
+
+
+def loop_counts(
+    code: str, page_analyses: List[PageAnalysis], markers: List[str]
+) -> CriterionCounts:
+    """Count one criterion's pages in Python, page by page."""
+    relevant_pages = [p for p in page_analyses if code in p.rubric_categories]
+    elements: Dict[str, int] = {}
+    for page in relevant_pages:
+        for element, found in page.key_elements.items():
+            if found:
+                elements[element] = elements.get(element, 0) + 1
+    return CriterionCounts(
+        pages=len(relevant_pages),
+        key_elements=elements,
+        content_types={
+            marker: sum(marker in p.content_type.lower() for p in relevant_pages)
+            for marker in markers
+        },
+    )
+
+
+def main(
+    sizes: str = typer.Option("100,10000,1000000", help="Comma-separated page counts"),
+    seed: int = typer.Option(0, help="Random seed for the synthetic notebooks"),
+):
+    matcher = RubricMatcher()
+    table = Table(title="Scoring EN1-EN10: per-criterion loop vs. page matrix")
+    table.add_column("Pages", justify="right", style="cyan")
+    table.add_column("Loop s", justify="right")
+    table.add_column("Encode s", justify="right")
+    table.add_column("Reduce ms", justify="right")
+    table.add_column("Speedup", justify="right")
+    table.add_column("Rescore speedup", justify="right")
+    table.add_column("Same scores", justify="right")
+
+    for size in [int(s) for s in sizes.split(",") if s.strip()]:
+        notebook = synthetic_notebook(size, seed)
+
+        started = time.perf_counter()
+        loop_scores = {
+            code: rule.score(loop_counts(code, notebook, matcher.markers))[0]
+            for code, rule in matcher.rules.items()
+        }
+        loop = time.perf_counter() - started
+
+        started = time.perf_counter()
+        matrix = PageMatrix(notebook, matcher.criteria, matcher.markers)
+        encode = time.perf_counter() - started
+
+        started = time.perf_counter()
+        scores = matcher._score_counts(matrix, matrix.counts())
+        reduce = time.perf_counter() - started
+
+        matrix_scores = {code: s.score for code, s in scores.items()}
+        table.add_row(
+            f"{size:,}",
+            f"{loop:.3f}",
+            f"{encode:.3f}",
+            f"{reduce * 1000:.2f}",
+            f"{loop / (encode + reduce):.1f}x",
+            f"{loop / reduce:.0f}x",
+            "yes" if matrix_scores == loop_scores else "[red]no[/red]",
+        )
+        del notebook, matrix
+
+    console.print(table)
+    console.print(
+        "Speedup includes encoding; rescore speedup is the reductions alone, as "
+        "paid per replicate or hypothetical notebook once the pages are encoded."
+    )
+
+
+if __name__ == "__main__":
+    typer.run(main)
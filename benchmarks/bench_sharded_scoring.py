@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""Score notebooks split into shards from their merged aggregates.
+
+Splits synthetic notebooks (see ``bench_rubric_scoring.py``) into shards of
+consecutive pages, counts each shard into a ``ScoreAggregate`` as a
+separate worker would, round-trips the aggregates through JSON, and merges
+them in a random order and grouping. The benchmark compares scoring the
+merged aggregate with scoring all the pages in one process, and reports:
+
+- map: time to count the slowest shard, the wall time with one worker per
+  shard
+- reduce: time to merge every shard's aggregate and score the result
+- the size of the serialized aggregates next to that of the page analyses
+- whether scores and detected gaps match, and whether merging the shards
+  in another order and grouping gives the same aggregate
+
+Usage:
+    python benchmarks/bench_sharded_scoring.py
+    python benchmarks/bench_sharded_scoring.py --sizes 10000 --shards 4,64
+"""
+
+import json
+import os
+import random
+import sys
+import time
+from pathlib import Path
+
+import typer
+from rich.console import Console
+from rich.table import Table
+
+sys.path.insert(0, str(Path(__file__).parent))
+sys.path.insert(0, str(Path(__file__).parent.parent))
+os.environ.setdefault("OPENAI_API_KEY", "mock")
+
+from bench_rubric_scoring import synthetic_notebook
+from src.analysis.gap_detector import GapDetector
+from src.analysis.rubric_matcher import RubricMatcher
+from src.analysis.score_aggregate import ScoreAggregate
+
+console = Console()
+
+
+def grouped_merge(aggregates, rng: random.Random) -> ScoreAggregate:
+    """Merge aggregates pairwise in a random order and grouping."""
+    pending = list(aggregates)
+    rng.shuffle(pending)
+    while len(pending) > 1:
+        i = rng.randrange(len(pending) - 1)
+        pending[i : i + 2] = [pending[i].merge(pending[i + 1])]
+    return pending[0] if pending else ScoreAggregate()
+
+
+def main(
+    sizes: str = typer.Option("10000,100000", help="Comma-separated page counts"),
+    shards: str = typer.Option("4,16,64", help="Comma-separated shard counts"),
+    seed: int = typer.Option(0, help="Random seed"),
+):
+    matcher = RubricMatcher()
+    detector = GapDetector()
+    table = Table(title="Scoring EN1-EN10 from merged shard aggregates")
+    table.add_column("Pages", justify="right", style="cyan")
+    table.add_column("Shards", justify="right", style="cyan")
+    table.add_column("Single ms", justify="right")
+    table.add_column("Map ms", justify="right")
+    table.add_column("Reduce ms", justify="right")
+    table.add_column("Aggregate KB", justify="right")
+    table.add_column("Pages KB", justify="right")
+    table.add_column("Same scores", justify="right")
+    table.add_column("Order-free", justify="right")
+
+    for size in [int(s) for s in sizes.split(",") if s.strip()]:
+        notebook = synthetic_notebook(size, seed)
+        pages_kb = sum(len(p.model_dump_json()) for p in notebook) / 1024
+
+        started = time.perf_counter()
+        single = matcher.score_notebook(notebook)
+        single_time = time.perf_counter() - started
+        single_gaps = detector.detect_gaps(single, notebook)
+
+        for count in [int(s) for s in shards.split(",") if s.strip()]:
+            bounds = [round(size * k / count) for k in range(count + 1)]
+            serialized, slowest = [], 0.0
+            for first, last in zip(bounds, bounds[1:]):
+                started = time.perf_counter()
+                aggregate = matcher.aggregate(notebook[first:last])
+                slowest = max(slowest, time.perf_counter() - started)
+                serialized.append(json.dumps(aggregate.model_dump()))
+
+            started = time.perf_counter()
+            merged = ScoreAggregate.merge_all(
+                ScoreAggregate(**json.loads(data)) for data in serialized
+            )
+            scores = matcher.score_notebook(merged)
+            reduce = time.perf_counter() - started
+
+            same = {c: s.model_dump() for c, s in scores.items()} == {
+                c: s.model_dump() for c, s in single.items()
+            } and detector.detect_gaps(scores, merged) == single_gaps
+            regrouped = grouped_merge(
+                [ScoreAggregate(**json.loads(data)) for data in serialized],
+                random.Random(seed + count),
+            )
+            table.add_row(
+                f"{size:,}",
+                str(count),
+                f"{single_time * 1000:.1f}",
+                f"{slowest * 1000:.1f}",
+                f"{reduce * 1000:.1f}",
+                f"{sum(map(len, serialized)) / 1024:.1f}",
+                f"{pages_kb:,.0f}",
+                "yes" if same else "[red]no[/red]",
+                "yes" if regrouped == merged else "[red]no[/red]",
+            )
+
+    console.print(table)
+
+
+if __name__ == "__main__":
+    typer.run(main)
@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+"""Compare the text and structured (JSON schema) page analysis formats.
+
+Starts ``mock_openai_server`` in-process with a fraction of page analyses
+returned malformed (``--rate-malformed``), then analyzes the same pages in
+each format and reports:
+
+    - how many responses failed a clean first parse, and what became of
+      them (fields silently defaulted in text mode; repaired, retried or
+      failed in structured mode)
+    - pages whose stored analysis is incomplete (unknown type or missing
+      key elements) or an error
+    - completion tokens per page, as billed for the response text
+    - parser time per response
+
+Usage:
+    python benchmarks/bench_structured_output.py --pages 40 --rate-malformed 0.1
+"""
+
+import json
+import os
+import sys
+import time
+from pathlib import Path
+
+import typer
+from rich.console import Console
+from rich.table import Table
+
+sys.path.insert(0, str(Path(__file__).parent))
+sys.path.insert(0, str(Path(__file__).parent.parent))
+os.environ.setdefault("OPENAI_API_KEY", "mock")
+
+from mock_openai_server import MockOpenAIServer, page_analysis_fields, page_analysis_text
+from src.analysis.vision_analyzer import KEY_ELEMENT_PROMPTS, VisionAnalyzer
+from src.config import get_settings
+from src.llm import get_metrics_recorder
+from src.models import NotebookPage
+
+console = Console()
+
+
+def parse_microseconds(analyzer: VisionAnalyzer, response: str, repeat: int = 2000) -> float:
+    """Mean time to parse one well-formed response."""
+    start = time.perf_counter()
+    for _ in range(repeat):
+        analyzer._parse_page_response(1, response)
+    return (time.perf_counter() - start) / repeat * 1e6
+
+
+def main(
+    pages: int = typer.Option(40, help="Pages to analyze per format"),
+    rate_malformed: float = typer.Option(0.1, help="Fraction of malformed responses"),
+    latency_ms: float = typer.Option(50.0, help="Mock server latency (ms)"),
+    seed: int = typer.Option(0, help="Random seed for the mock server"),
+):
+    settings = get_settings()
+    page_files = sorted(settings.notebook_pages_dir.glob("page_*.png"))[:pages]
+    if not page_files:
+        console.print("[red]No page_*.png files found in notebook-pages/[/red]")
+        raise typer.Exit(1)
+    notebook_pages = [
+        NotebookPage(page_number=i, file_path=f) for i, f in enumerate(page_files, start=1)
+    ]
+
+    server = MockOpenAIServer(
+        latency_ms=latency_ms,
+        latency_distribution="fixed",
+        rate_malformed=rate_malformed,
+        seed=seed,
+    ).start()
+    settings.openai_base_url = server.url
+    recorder = get_metrics_recorder()
+
+    table = Table(
+        title=f"Page analysis formats ({len(notebook_pages)} pages, "
+        f"{rate_malformed:.0%} malformed responses)"
+    )
+    table.add_column("Format", style="cyan")
+    table.add_column("Malformed", justify="right")
+    table.add_column("Outcome")
+    table.add_column("Incomplete", justify="right")
+    table.add_column("Errors", justify="right")
+    table.add_column("Tokens/page", justify="right")
+    table.add_column("Parse µs", justify="right")
+
+    sample = page_analysis_fields(b"sample")
+    try:
+        for structured in (False, True):
+            analyzer = VisionAnalyzer(
+                use_cache=False, pages_per_request=1, structured_output=structured
+            )
+            seen = len(recorder.snapshot())
+            analyses = analyzer.analyze_pages(notebook_pages)
+            calls = [
+                m
+                for m in recorder.snapshot()[seen:]
+                if m.tag == "analyze_page" and m.status == "ok"
+            ]
+            stats = analyzer.parse_stats
+
+            incomplete = sum(
+                a.content_type == "unknown" or set(a.key_elements) != set(KEY_ELEMENT_PROMPTS)
+                for a in analyses
+                if a.content_type != "error"
+            )
+            errors = sum(a.content_type == "error" for a in analyses)
+            tokens = sum(m.completion_tokens or 0 for m in calls) / len(analyses)
+            outcome = (
+                f"{stats.repaired} repaired, {stats.retried} retried, {stats.failed} failed"
+                if structured
+                else "fields defaulted"
+            )
+
+            response = json.dumps(sample) if structured else page_analysis_text(b"sample")
+            table.add_row(
+                "JSON schema" if structured else "Text lines",
+                f"{stats.malformed}/{stats.parsed} ({stats.malformed_rate:.0%})",
+                outcome,
+                str(incomplete),
+                str(errors),
+                f"{tokens:.0f}",
+                f"{parse_microseconds(VisionAnalyzer(structured_output=structured), response):.1f}",
+            )
+    finally:
+        server.stop()
+
+    console.print(table)
+
+
+if __name__ == "__main__":
+    typer.run(main)
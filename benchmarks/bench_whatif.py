@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""Measure what-if score queries per second, simulated vs. rescored.
+
+Builds synthetic notebooks (see ``bench_rubric_scoring.py``) and answers
+random what-if queries, each adding a few hypothetical pages (some several
+times over) and removing a few analyzed ones. Every query is answered
+twice: by ``ScoreSimulator`` from the notebook's precomputed aggregate, and
+by editing the page list and running ``RubricMatcher.score_notebook`` on
+it, which is what answering the question by hand amounts to. The benchmark
+reports queries per second of each and checks that the scores, Fully
+Developed status and Excellence readiness agree.
+
+Usage:
+    python benchmarks/bench_whatif.py
+    python benchmarks/bench_whatif.py --sizes 1000 --queries 5000
+"""
+
+import os
+import random
+import sys
+import time
+from pathlib import Path
+
+import typer
+from rich.console import Console
+from rich.table import Table
+
+sys.path.insert(0, str(Path(__file__).parent))
+sys.path.insert(0, str(Path(__file__).parent.parent))
+os.environ.setdefault("OPENAI_API_KEY", "mock")
+
+from bench_rubric_scoring import CONTENT_TYPES, KEY_ELEMENTS
+from bench_rubric_scoring import synthetic_notebook
+from src.analysis.rubric_matcher import RubricMatcher
+from src.analysis.score_simulator import (
+    HypotheticalPage,
+    ScoreSimulator,
+    WhatIf,
+    notebook_status,
+)
+
+console = Console()
+
+
+def random_queries(notebook, count: int, seed: int):
+    """Random what-if queries over a notebook's pages."""
+    rng = random.Random(seed)
+    numbers = [p.page_number for p in notebook]
+    codes = [f"EN{k}" for k in range(1, 11)]
+    return [
+        WhatIf(
+            add=[
+                HypotheticalPage(
+                    content_type=rng.choice(CONTENT_TYPES),
+                    rubric_categories=rng.sample(codes, rng.randint(1, 2)),
+                    key_elements={e: True for e in KEY_ELEMENTS if rng.random() < 0.3},
+                    copies=rng.randint(1, 3),
+                )
+                for _ in range(rng.randint(0, 3))
+            ],
+            remove=rng.sample(numbers, min(len(numbers), rng.randint(0, 2))),
+        )
+        for _ in range(count)
+    ]
+
+
+def rescore(matcher: RubricMatcher, notebook, what_if: WhatIf):
+    """Answer a query by editing the page list and scoring it from scratch."""
+    removed = set(what_if.remove)
+    pages = [p for p in notebook if p.page_number not in removed]
+    for page in what_if.add:
+        pages.extend([page.to_analysis()] * page.copies)
+    scores = matcher.score_notebook(pages)
+    return scores, notebook_status(scores)
+
+
+def main(
+    sizes: str = typer.Option("100,1000,10000", help="Comma-separated page counts"),
+    queries: int = typer.Option(2000, help="What-if queries per notebook"),
+    seed: int = typer.Option(0, help="Random seed"),
+):
+    matcher = RubricMatcher()
+    table = Table(title=f"Answering {queries} what-if queries")
+    table.add_column("Pages", justify="right", style="cyan")
+    table.add_column("Precompute ms", justify="right")
+    table.add_column("Simulated q/s", justify="right")
+    table.add_column("Rescored q/s", justify="right")
+    table.add_column("Speedup", justify="right")
+    table.add_column("Same answers", justify="right")
+
+    for size in [int(s) for s in sizes.split(",") if s.strip()]:
+        notebook = synthetic_notebook(size, seed)
+        batch = random_queries(notebook, queries, seed)
+
+        started = time.perf_counter()
+        simulator = ScoreSimulator(matcher, notebook)
+        precompute = time.perf_counter() - started
+
+        started = time.perf_counter()
+        simulated = [simulator.simulate(what_if) for what_if in batch]
+        simulate_rate = queries / (time.perf_counter() - started)
+
+        # Rescoring is slow on large notebooks; time a sample of the queries
+        checked = batch[: max(1, min(queries, 200_000 // size))]
+        started = time.perf_counter()
+        rescored = [rescore(matcher, notebook, what_if) for what_if in checked]
+        rescore_rate = len(checked) / (time.perf_counter() - started)
+
+        same = all(
+            {c: s.model_dump() for c, s in result.scores.items()}
+            == {c: s.model_dump() for c, s in scores.items()}
+            and (result.fully_developed, result.average_score, result.excellence_ready)
+            == status
+            for result, (scores, status) in zip(simulated, rescored)
+        )
+        table.add_row(
+            f"{size:,}",
+            f"{precompute * 1000:.1f}",
+            f"{simulate_rate:,.0f}",
+            f"{rescore_rate:,.0f}",
+            f"{simulate_rate / rescore_rate:.0f}x",
+            "yes" if same else "[red]no[/red]",
+        )
+
+    console.print(table)
+
+
+if __name__ == "__main__":
+    typer.run(main)
@@ -0,0 +1,467 @@
+#!/usr/bin/env python3
+"""Local stand-in for the OpenAI chat completions API.
+
+Speaks enough of the ``/v1/chat/completions`` wire format for the OpenAI
+SDK: vision requests (and pages sent as text) get page analyses in the
+``CONTENT_TYPE:/SUMMARY:/...`` format (one ``=== PAGE k ===`` block per
+image for packed requests), or as JSON when the request has a
+``response_format``; other text requests get canned markdown. A fraction
+of page analyses can be returned malformed to exercise parsing.
+Latency is drawn from a configurable distribution, a fraction of
+requests can stall several times longer to exercise hedging, and a
+fraction can be failed with 429 or 5xx responses to exercise retries.
+
+Responses are derived from a hash of the request, so the same page always
+gets the same analysis.
+
+Usage:
+    python benchmarks/mock_openai_server.py --port 8765 --latency-ms 800
+    OPENAI_BASE_URL=http://127.0.0.1:8765/v1 python cli.py analyze
+"""
+
+import hashlib
+import json
+import math
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional
+
+import typer
+
+CONTENT_TYPES = [
+    "design",
+    "brainstorming",
+    "testing",
+    "meeting_notes",
+    "build_documentation",
+    "programming",
+    "game_analysis",
+    "competition",
+]
+
+RUBRIC_BY_TYPE = {
+    "design": ["EN4", "EN7"],
+    "brainstorming": ["EN4"],
+    "testing": ["EN6", "EN7"],
+    "meeting_notes": ["EN8", "EN9"],
+    "build_documentation": ["EN5"],
+    "programming": ["EN5", "EN6"],
+    "game_analysis": ["EN1"],
+    "competition": ["EN6", "EN9"],
+}
+
+KEY_ELEMENTS = [
+    "brainstorming",
+    "decision_matrix",
+    "cad_drawings",
+    "testing_data",
+    "meeting_notes",
+    "dates_timestamps",
+    "design_iteration",
+    "failure_documentation",
+]
+
+LATENCY_DISTRIBUTIONS = ("fixed", "uniform", "exponential", "lognormal")
+
+FILLER = (
+    "Our team reviewed the results from the last session and recorded what "
+    "worked, what failed and what we plan to change next. "
+)
+
+
+def page_analysis_fields(seed: bytes, with_confidence: bool = False) -> dict:
+    """Build a deterministic page analysis as a dict of response fields."""
+    digest = hashlib.sha256(seed).digest()
+    content_type = CONTENT_TYPES[digest[0] % len(CONTENT_TYPES)]
+    categories = list(RUBRIC_BY_TYPE[content_type])
+    if digest[1] % 2:
+        categories.append("EN9")
+    elements = {
+        name: bool(digest[2 + i] % 3 == 0) for i, name in enumerate(KEY_ELEMENTS)
+    }
+    elements["dates_timestamps"] = "EN9" in categories
+
+    fields = {
+        "content_type": content_type,
+        "summary": f"Mock analysis of a {content_type.replace('_', ' ')} page.",
+        "rubric_categories": sorted(set(categories)),
+        "key_elements": elements,
+        "notes": "Generated by the mock server.",
+    }
+    if with_confidence:
+        fields["confidence"] = round(0.5 + digest[12] / 510, 2)
+    return fields
+
+
+def page_analysis_text(
+    seed: bytes, with_confidence: bool = False, malformed: bool = False
+) -> str:
+    """
+    Build a deterministic page analysis in the vision prompt's format.
+
+    A malformed analysis wraps its summary and KEY_ELEMENTS over several
+    lines, the way models drift from the line-based format.
+    """
+    fields = page_analysis_fields(seed, with_confidence)
+    elements = json.dumps(fields["key_elements"], indent=2 if malformed else None)
+    summary = fields["summary"]
+    if malformed:
+        summary += "\nThe team's reasoning continues on the next line."
+    text = (
+        f"CONTENT_TYPE: {fields['content_type']}\n"
+        f"SUMMARY: {summary}\n"
+        f"RUBRIC_CATEGORIES: {', '.join(fields['rubric_categories'])}\n"
+        f"KEY_ELEMENTS: {elements}\n"
+        f"NOTES: {fields['notes']}"
+    )
+    if with_confidence:
+        text += f"\nCONFIDENCE: {fields['confidence']:.2f}"
+    return text
+
+
+def malformed_json(payload: dict, seed: bytes) -> str:
+    """
+    Serialize a JSON answer the way it goes wrong in practice.
+
+    Half the time the object is wrapped in a markdown code fence (which a
+    client can repair), otherwise it is cut off mid-object (which needs a
+    retry).
+    """
+    text = json.dumps(payload)
+    if hashlib.sha256(seed).digest()[13] % 2:
+        return f"```json\n{text}\n```"
+    return text[: len(text) // 2]
+
+
+def image_urls(messages: List[dict]) -> List[str]:
+    """Return the image URLs of a chat request, in order."""
+    urls = []
+    for message in messages:
+        content = message.get("content")
+        if isinstance(content, list):
+            for part in content:
+                if part.get("type") == "image_url":
+                    urls.append(part["image_url"]["url"])
+    return urls
+
+
+def structured_text(body: dict, malformed: bool = False) -> str:
+    """JSON response content for a request with a ``response_format``."""
+    images = image_urls(body.get("messages", []))
+    schema = body["response_format"].get("json_schema", {}).get("schema", {})
+    properties = schema.get("properties", {})
+    seed = images[0].encode() if len(images) == 1 else json.dumps(body["messages"]).encode()
+
+    if "pages" in properties:
+        payload = {"pages": [page_analysis_fields(url.encode()) for url in images]}
+    else:
+        payload = page_analysis_fields(seed, "confidence" in properties)
+        # Strict schemas leave out key elements that were settled locally
+        elements = properties.get("key_elements", {}).get("properties")
+        if elements is not None:
+            payload["key_elements"] = {
+                name: value
+                for name, value in payload["key_elements"].items()
+                if name in elements
+            }
+    return malformed_json(payload, seed) if malformed else json.dumps(payload)
+
+
+def completion_text(body: dict, malformed: bool = False) -> str:
+    """
+    Canned response content for a chat completion request.
+
+    Args:
+        body: Chat completion request body
+        malformed: Make a page analysis response malformed (see
+            ``page_analysis_text`` and ``malformed_json``)
+    """
+    if body.get("response_format", {}).get("type") in ("json_schema", "json_object"):
+        return structured_text(body, malformed)
+
+    images = image_urls(body.get("messages", []))
+    if len(images) == 1:
+        # Cascade first-pass prompts ask for a CONFIDENCE line
+        with_confidence = "CONFIDENCE:" in json.dumps(body.get("messages", []))
+        return page_analysis_text(images[0].encode(), with_confidence, malformed)
+    if not images and "CONTENT_TYPE:" in json.dumps(body.get("messages", [])):
+        # A PDF page sent as its text layer
+        return page_analysis_text(json.dumps(body["messages"]).encode(), malformed=malformed)
+    if images:
+        return "\n\n".join(
+            f"=== PAGE {k} ===\n{page_analysis_text(url.encode(), malformed=malformed)}"
+            for k, url in enumerate(images, 1)
+        )
+
+    # Text generation: markdown sized to roughly half the token allowance
+    length = min(body.get("max_tokens") or 1000, 4000) * 2
+    paragraphs = FILLER * (length // len(FILLER) + 1)
+    return f"# Mock Notebook Entry\n\n{paragraphs[:length]}\n"
+
+
+class MockOpenAIServer:
+    """
+    Threaded HTTP server emulating the chat completions endpoint.
+
+    Every request is recorded in ``records`` (arrival time, service time,
+    status, kind and a key identifying the payload) so benchmarks can
+    compute latency percentiles, including time spent in client retries.
+    ``connections`` counts the TCP connections clients opened.
+    """
+
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        latency_ms: float = 800.0,
+        latency_distribution: str = "lognormal",
+        rate_429: float = 0.0,
+        rate_5xx: float = 0.0,
+        retry_after_ms: int = 200,
+        seed: Optional[int] = None,
+        rate_malformed: float = 0.0,
+        rate_straggler: float = 0.0,
+        straggler_factor: float = 8.0,
+    ):
+        """
+        Initialize the server (call ``start`` to begin serving).
+
+        Args:
+            host: Interface to bind
+            port: Port to bind; 0 picks a free port
+            latency_ms: Mean response latency in milliseconds
+            latency_distribution: One of "fixed", "uniform", "exponential"
+                or "lognormal"
+            rate_429: Fraction of requests rejected with 429
+            rate_5xx: Fraction of requests failed with 500/503
+            retry_after_ms: ``retry-after-ms`` hint sent with 429s
+            seed: Random seed for latency and error injection
+            rate_malformed: Fraction of successful page analyses returned
+                malformed
+            rate_straggler: Fraction of requests that stall, as a slow
+                backend replica would
+            straggler_factor: How many times longer a stalled request takes
+        """
+        if latency_distribution not in LATENCY_DISTRIBUTIONS:
+            raise ValueError(f"Unknown latency distribution: {latency_distribution}")
+
+        self.latency = latency_ms / 1000.0
+        self.latency_distribution = latency_distribution
+        self.rate_429 = rate_429
+        self.rate_5xx = rate_5xx
+        self.retry_after_ms = retry_after_ms
+        self.rate_malformed = rate_malformed
+        self.rate_straggler = rate_straggler
+        self.straggler_factor = straggler_factor
+        self.random = random.Random(seed)
+        self.records: List[Dict] = []
+        self.connections = 0
+        self._lock = threading.Lock()
+
+        self.httpd = ThreadingHTTPServer((host, port), self._handler_class())
+        self.httpd.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        """Base URL to use as OPENAI_BASE_URL."""
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}/v1"
+
+    def start(self) -> "MockOpenAIServer":
+        """Serve requests on a background thread."""
+        self._thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        """Stop serving and release the port."""
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def reset(self) -> None:
+        """Forget recorded requests and connections."""
+        with self._lock:
+            self.records.clear()
+            self.connections = 0
+
+    def sample_latency(self) -> float:
+        """Draw one response latency in seconds."""
+        with self._lock:
+            if self.latency_distribution == "fixed":
+                latency = self.latency
+            elif self.latency_distribution == "uniform":
+                latency = self.random.uniform(0.5 * self.latency, 1.5 * self.latency)
+            elif self.latency_distribution == "exponential":
+                latency = (
+                    self.random.expovariate(1.0 / self.latency) if self.latency else 0.0
+                )
+            else:
+                # Lognormal with a long right tail, scaled to the requested mean
+                sigma = 0.6
+                mu = math.log(self.latency or 1e-6) - sigma**2 / 2
+                latency = self.random.lognormvariate(mu, sigma)
+            if self.random.random() < self.rate_straggler:
+                latency *= self.straggler_factor
+            return latency
+
+    def sample_status(self) -> int:
+        """Pick the status for one request according to the error rates."""
+        with self._lock:
+            roll = self.random.random()
+            if roll < self.rate_429:
+                return 429
+            if roll < self.rate_429 + self.rate_5xx:
+                return self.random.choice((500, 503))
+            return 200
+
+    def sample_malformed(self) -> bool:
+        """Decide whether one response is returned malformed."""
+        with self._lock:
+            return self.random.random() < self.rate_malformed
+
+    def count_connection(self) -> None:
+        """Count a TCP connection opened by a client."""
+        with self._lock:
+            self.connections += 1
+
+    def record(self, **fields) -> None:
+        with self._lock:
+            self.records.append(fields)
+
+    def _handler_class(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            # Headers and body go out in separate writes; with Nagle on,
+            # the body waits for the client's delayed ACK (~40 ms)
+            disable_nagle_algorithm = True
+
+            def log_message(self, format, *args):
+                pass
+
+            def setup(self):
+                super().setup()
+                server.count_connection()
+
+            def _send_json(self, status: int, payload: dict, headers: Dict[str, str]):
+                data = json.dumps(payload).encode()
+                self.send_response(status)
+                self.send_header("content-type", "application/json")
+                self.send_header("content-length", str(len(data)))
+                for name, value in headers.items():
+                    self.send_header(name, value)
+                self.end_headers()
+                try:
+                    self.wfile.write(data)
+                except (BrokenPipeError, ConnectionResetError):
+                    # The client gave up on the request (e.g. a hedged
+                    # duplicate answered first)
+                    self.close_connection = True
+
+            def do_POST(self):
+                arrived = time.monotonic()
+                raw = self.rfile.read(int(self.headers.get("content-length", 0)))
+                if not self.path.rstrip("/").endswith("chat/completions"):
+                    self._send_json(404, {"error": {"message": "Not found"}}, {})
+                    return
+
+                body = json.loads(raw or b"{}")
+                kind = "vision" if image_urls(body.get("messages", [])) else "text"
+                time.sleep(server.sample_latency())
+                status = server.sample_status()
+
+                if status == 200:
+                    content = completion_text(body, server.sample_malformed())
+                    # Count text at ~4 chars/token and images at a flat
+                    # high-detail rate, roughly as the real API bills them
+                    images = image_urls(body.get("messages", []))
+                    text_bytes = len(raw) - sum(len(url) for url in images)
+                    prompt_tokens = text_bytes // 4 + 765 * len(images)
+                    completion_tokens = len(content) // 4
+                    payload = {
+                        "id": f"chatcmpl-mock-{hashlib.sha1(raw).hexdigest()[:12]}",
+                        "object": "chat.completion",
+                        "created": int(time.time()),
+                        "model": body.get("model", "mock"),
+                        "choices": [
+                            {
+                                "index": 0,
+                                "message": {"role": "assistant", "content": content},
+                                "finish_reason": "stop",
+                            }
+                        ],
+                        "usage": {
+                            "prompt_tokens": prompt_tokens,
+                            "completion_tokens": completion_tokens,
+                            "total_tokens": prompt_tokens + completion_tokens,
+                        },
+                    }
+                    headers = {}
+                elif status == 429:
+                    payload = {
+                        "error": {
+                            "message": "Rate limit reached (mock)",
+                            "type": "requests",
+                            "code": "rate_limit_exceeded",
+                        }
+                    }
+                    headers = {"retry-after-ms": str(server.retry_after_ms)}
+                else:
+                    payload = {"error": {"message": "Server error (mock)", "type": "server_error"}}
+                    headers = {}
+
+                self._send_json(status, payload, headers)
+                server.record(
+                    key=hashlib.sha1(raw).hexdigest(),
+                    kind=kind,
+                    status=status,
+                    arrived=arrived,
+                    finished=time.monotonic(),
+                )
+
+        return Handler
+
+
+def main(
+    host: str = typer.Option("127.0.0.1", help="Interface to bind"),
+    port: int = typer.Option(8765, help="Port to listen on"),
+    latency_ms: float = typer.Option(800.0, help="Mean response latency (ms)"),
+    latency_distribution: str = typer.Option(
+        "lognormal", help="fixed, uniform, exponential or lognormal"
+    ),
+    rate_429: float = typer.Option(0.0, help="Fraction of requests answered with 429"),
+    rate_5xx: float = typer.Option(0.0, help="Fraction of requests answered with 500/503"),
+    rate_malformed: float = typer.Option(
+        0.0, help="Fraction of page analyses returned malformed"
+    ),
+    rate_straggler: float = typer.Option(
+        0.0, help="Fraction of requests that take straggler-factor times longer"
+    ),
+    straggler_factor: float = typer.Option(8.0, help="Slowdown of straggling requests"),
+    seed: Optional[int] = typer.Option(None, help="Random seed"),
+):
+    server = MockOpenAIServer(
+        host=host,
+        port=port,
+        latency_ms=latency_ms,
+        latency_distribution=latency_distribution,
+        rate_429=rate_429,
+        rate_5xx=rate_5xx,
+        seed=seed,
+        rate_malformed=rate_malformed,
+        rate_straggler=rate_straggler,
+        straggler_factor=straggler_factor,
+    )
+    print(f"Mock OpenAI server listening on {server.url}")
+    try:
+        server.httpd.serve_forever()
+    except KeyboardInterrupt:
+        server.stop()
+
+
+if __name__ == "__main__":
+    typer.run(main)
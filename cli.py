@@ -3,18 +3,30 @@
 
 import sys
 import random
+import time
 from pathlib import Path
-from typing import Optional
+from typing import List, Optional
 
 import typer
 from rich.console import Console
+from rich.console import Group
+from rich.live import Live
 from rich.progress import Progress, SpinnerColumn, TextColumn
 
 # Add src to path
 sys.path.insert(0, str(Path(__file__).parent))
 
 from src.config import get_settings
-from src.analysis import VisionAnalyzer, RubricMatcher, GapDetector, ReportGenerator
+from src.analysis import VisionAnalyzer, RubricMatcher, GapDetector, ReportGenerator, AnalysisCache, AnalysisJournal
+from src.llm import get_hedger, get_metrics_recorder
+from src.analysis.page_filter import PageFilter
+from src.analysis.page_ingest import PageIngester, load_ingest_manifest
+from src.analysis.pdf_source import PdfNotebook, pdf_manifest
+from src.analysis.page_manifest import build_manifest, diff_manifest, splice_analyses
+from src.analysis.page_sampler import ESTIMATE_INTERVAL, plan_sample
+from src.analysis.page_scheduler import ScoreTimeline, schedule_from_previous
+from src.analysis.score_aggregate import ScoreAggregate
+from src.analysis.score_simulator import HypotheticalPage, ScoreSimulator, WhatIf
 from src.progress import ProgressTracker, ActionItemManager
 from src.interview import QuestionBank, PracticeSession
 from src.models import NotebookAnalysis, NotebookPage
@@ -43,30 +55,128 @@ def analyze(
         "--verbose",
         help="Verbose output",
     ),
+    concurrency: Optional[int] = typer.Option(
+        None,
+        help="Maximum page requests in flight (default: MAX_CONCURRENT_REQUESTS)",
+    ),
+    cache: bool = typer.Option(
+        True,
+        help="Reuse cached results for unchanged pages",
+    ),
+    incremental: bool = typer.Option(
+        False,
+        help="Only analyze pages added or modified since the last saved analysis",
+    ),
+    preprocess: bool = typer.Option(
+        True,
+        help="Trim, downscale and re-encode page images before upload",
+    ),
+    detail: Optional[str] = typer.Option(
+        None,
+        help="Image detail level: 'low', 'high' or 'auto' (default: VISION_DETAIL)",
+    ),
+    pack_size: Optional[int] = typer.Option(
+        None,
+        help="Pages sent per vision request (default: PAGES_PER_REQUEST)",
+    ),
+    resume: bool = typer.Option(
+        False,
+        help="Resume an interrupted run, skipping pages it already analyzed",
+    ),
+    cascade: Optional[bool] = typer.Option(
+        None,
+        "--cascade/--no-cascade",
+        help="Triage pages with CASCADE_MODEL first and escalate only uncertain "
+        "or high-value pages (default: CASCADE_ENABLED)",
+    ),
+    filter_pages: Optional[bool] = typer.Option(
+        None,
+        "--filter/--no-filter",
+        help="Settle blank and near-duplicate pages locally instead of sending "
+        "them for analysis (default: PAGE_FILTER_ENABLED)",
+    ),
+    layout_hints: Optional[bool] = typer.Option(
+        None,
+        "--layout-hints/--no-layout-hints",
+        help="Detect tables, charts and pictures locally and leave confidently "
+        "detected key elements out of the prompt (default: LAYOUT_HINTS_ENABLED)",
+    ),
+    pdf: Optional[Path] = typer.Option(
+        None,
+        exists=True,
+        dir_okay=False,
+        help="Analyze an exported notebook PDF instead of notebook-pages/",
+    ),
+    structured: Optional[bool] = typer.Option(
+        None,
+        "--structured/--no-structured",
+        help="Request page analyses as schema-checked JSON instead of the "
+        "line-based text format (default: STRUCTURED_OUTPUT)",
+    ),
+    sample: Optional[int] = typer.Option(
+        None,
+        help="Analyze a stratified sample of this many pages first and show "
+        "estimated rubric scores, refined live until every page is done",
+    ),
+    prioritize: Optional[bool] = typer.Option(
+        None,
+        "--prioritize/--no-prioritize",
+        help="Analyze pages tied to weak or borderline criteria in the last "
+        "saved analysis first (default: PRIORITY_SCHEDULING)",
+    ),
+    hedge: Optional[bool] = typer.Option(
+        None,
+        "--hedge/--no-hedge",
+        help="Send a duplicate of any request slower than HEDGE_PERCENTILE of "
+        "recent calls and keep the first answer (default: HEDGE_REQUESTS)",
+    ),
+    aggregate: Optional[Path] = typer.Option(
+        None,
+        dir_okay=False,
+        help="Also save the rubric counts of the analyzed pages to this file, "
+        "to score shards analyzed separately together with 'merge'",
+    ),
 ):
     """Analyze notebook pages using GPT-4 Vision."""
     settings = get_settings()
     console.print("\n[bold blue]V5-Notebook-Helper: Notebook Analysis[/bold blue]\n")
 
+    if pdf is not None:
+        try:
+            pdf_notebook = PdfNotebook(pdf)
+        except Exception as e:
+            console.print(f"[red]Error opening {pdf}: {e}[/red]")
+            raise typer.Exit(1)
+
+        # Zero-based page indices stand in for page files; pages are
+        # rendered one at a time during analysis
+        page_files = list(range(len(pdf_notebook)))
+        console.print(f"Found {len(page_files)} pages in {pdf.name}")
+
     # Check if notebook directory exists
-    if not settings.notebook_pages_dir.exists():
+    elif not settings.notebook_pages_dir.exists():
         console.print(
             f"[red]Error: Notebook directory not found: {settings.notebook_pages_dir}[/red]"
         )
         console.print("Please ensure notebook-pages/ directory exists with PNG images.")
         raise typer.Exit(1)
 
-    # Find all pages
-    page_files = sorted(settings.notebook_pages_dir.glob("page_*.png"))
+    else:
+        # Find all pages
+        page_files = sorted(settings.notebook_pages_dir.glob("page_*.png"))
+
+        if not page_files:
+            console.print(
+                "[red]Error: No page_*.png files found in notebook-pages/[/red]"
+            )
+            raise typer.Exit(1)
+
+        console.print(f"Found {len(page_files)} pages in notebook-pages/")
 
     if not page_files:
-        console.print(
-            "[red]Error: No page_*.png files found in notebook-pages/[/red]"
-        )
+        console.print("[red]Error: The notebook has no pages[/red]")
         raise typer.Exit(1)
 
-    console.print(f"Found {len(page_files)} pages in notebook-pages/")
-
     # Parse page range
     if pages == "all":
         pages_to_analyze = page_files
@@ -81,46 +191,278 @@ def analyze(
             )
             raise typer.Exit(1)
 
-    console.print(f"Analyzing {len(pages_to_analyze)} pages...")
+    # Fingerprint pages so incremental runs can detect what changed
+    output_file = settings.results_dir / "latest_analysis.json"
+    previous_analysis = None
+    if incremental:
+        if output_file.exists():
+            previous_analysis = NotebookAnalysis.load_from_file(output_file)
+        else:
+            console.print(
+                "[yellow]No previous analysis found, running a full analysis.[/yellow]"
+            )
+
+    if pdf is not None:
+        manifest = pdf_manifest(
+            pdf_notebook,
+            pages_to_analyze,
+            previous_analysis.page_manifest if previous_analysis else None,
+        )
+        notebook_pages = pdf_notebook.pages([fp.page_number - 1 for fp in manifest])
+    else:
+        # Pages written by `ingest` were hashed then; the previous analysis
+        # wins where both know a page since it also carries the page-filter
+        # signature
+        known_pages = [r.page for r in load_ingest_manifest(settings.notebook_pages_dir)]
+        if previous_analysis:
+            known_pages += previous_analysis.page_manifest
+        manifest = build_manifest(pages_to_analyze, known_pages)
+
+        # Create NotebookPage objects
+        notebook_pages = [
+            NotebookPage(page_number=fp.page_number, file_path=fp.file_path)
+            for fp in manifest
+        ]
+
+    if previous_analysis:
+        diff = diff_manifest(
+            manifest,
+            previous_analysis.page_manifest,
+            reusable={
+                a.page_number
+                for a in previous_analysis.page_analyses
+                if a.content_type != "error"
+            },
+        )
+        changed = set(diff.to_analyze)
+        notebook_pages = [p for p in notebook_pages if p.page_number in changed]
+        console.print(
+            f"Incremental: {len(diff.to_analyze)} new or modified, "
+            f"{len(diff.reused)} unchanged, {len(diff.removed)} removed"
+        )
+
+    # Journal each result as it completes so an interrupted run can resume
+    run_pages = {p.page_number for p in notebook_pages}
+    hash_by_page = {fp.page_number: fp.content_hash for fp in manifest}
+    journal = AnalysisJournal()
+    if not resume:
+        journal.reset()
+
+    # Settle blank and near-duplicate pages locally, without a vision call
+    if filter_pages is None:
+        filter_pages = settings.page_filter_enabled and pdf is None
+    elif filter_pages and pdf is not None:
+        console.print(
+            "[yellow]The local page filter reads page image files and is "
+            "skipped for PDF notebooks.[/yellow]"
+        )
+        filter_pages = False
+    page_filter = PageFilter() if filter_pages else None
+    if page_filter is not None:
+        filter_plan = page_filter.plan(
+            manifest,
+            [p.page_number for p in notebook_pages],
+            known=list(diff.reused) if previous_analysis else None,
+        )
+        for analysis in page_filter.blank_analyses(filter_plan, manifest):
+            journal.append(analysis, hash_by_page[analysis.page_number])
+        keep = set(filter_plan.to_analyze)
+        notebook_pages = [p for p in notebook_pages if p.page_number in keep]
+        console.print(
+            f"Local filter: {len(filter_plan.blank)} blank and "
+            f"{len(filter_plan.duplicates)} near-duplicate pages skipped"
+        )
+
+    if resume:
+        completed = journal.completed_pages(manifest) & run_pages
+        notebook_pages = [p for p in notebook_pages if p.page_number not in completed]
+        console.print(f"Resuming: {len(completed)} pages already analyzed")
+
+    # Put pages that can move weak or borderline criteria at the front
+    matcher = RubricMatcher()
+    if prioritize is None:
+        prioritize = settings.priority_scheduling
+    schedule = None
+    if prioritize and not sample and notebook_pages and output_file.exists():
+        last_run = previous_analysis or NotebookAnalysis.load_from_file(output_file)
+        schedule = schedule_from_previous(
+            [p.page_number for p in notebook_pages],
+            manifest,
+            last_run,
+            matcher,
+            snapshot=ProgressTracker().get_latest_snapshot(),
+        )
+        by_number = {p.page_number: p for p in notebook_pages}
+        notebook_pages = [by_number[n] for n in schedule.order]
+        console.print(
+            "Prioritizing pages tied to the last run's weakest criteria"
+            + (
+                f" and borderline {', '.join(schedule.borderline)}"
+                if schedule.borderline
+                else ""
+            )
+        )
+
+    # Analyze a spread-out sample first so early results estimate the scores
+    sample_plan = None
+    if sample and notebook_pages:
+        section_starts = pdf_notebook.section_starts() if pdf is not None else []
+        sample_plan = plan_sample(
+            [fp.page_number for fp in manifest if fp.page_number in run_pages],
+            sample,
+            section_starts=section_starts,
+            eligible=[p.page_number for p in notebook_pages],
+        )
+        by_number = {p.page_number: p for p in notebook_pages}
+        notebook_pages = [by_number[n] for n in sample_plan.order]
+        console.print(
+            f"Sampling: {len(sample_plan.sample)} pages from {len(sample_plan.strata)} "
+            f"strata first"
+            + (f" ({len(section_starts)} PDF bookmarks)" if section_starts else "")
+            + "; Ctrl+C keeps the estimate and --resume finishes the run later"
+        )
+
+    console.print(f"Analyzing {len(notebook_pages)} pages...")
+
+    if hedge is not None:
+        get_hedger().enabled = hedge
 
     # Initialize analyzer
     try:
-        analyzer = VisionAnalyzer()
+        analyzer = VisionAnalyzer(
+            use_cache=cache,
+            use_preprocessing=preprocess,
+            detail=detail,
+            pages_per_request=pack_size,
+            cascade=cascade,
+            layout_hints=layout_hints,
+            structured_output=structured,
+        )
     except Exception as e:
         console.print(f"[red]Error initializing analyzer: {e}[/red]")
         console.print("\nMake sure OPENAI_API_KEY is set in .env file")
         raise typer.Exit(1)
 
-    # Create NotebookPage objects
-    notebook_pages = [
-        NotebookPage(page_number=i, file_path=f)
-        for i, f in enumerate(pages_to_analyze, 1)
-    ]
-
-    # Analyze pages with progress bar
-    page_analyses = []
-
-    with Progress(
+    report_gen = ReportGenerator()
+    estimate_file = settings.results_dir / "score_estimate.json"
+
+    # Pages scored without a call in this run, and pages that were sampled
+    def settled_analyses():
+        yield from (a for a in journal.load(manifest) if a.page_number in run_pages)
+        if previous_analysis:
+            yield from splice_analyses(diff, previous_analysis.page_analyses, [])
+
+    # Only the estimate needs the analyses themselves; the timeline keeps counts
+    known = {a.page_number: a for a in settled_analyses()} if sample_plan is not None else {}
+    donors = run_pages - set(filter_plan.blank) if page_filter is not None else run_pages
+    sample_started = time.perf_counter()
+    last_estimate = 0.0
+    timeline = ScoreTimeline(matcher, known.values() if known else settled_analyses())
+
+    # Analyze pages concurrently with progress bar
+    progress = Progress(
         SpinnerColumn(),
         TextColumn("[progress.description]{task.description}"),
         console=console,
-    ) as progress:
+    )
+    with Live(progress, console=console, refresh_per_second=8) as live:
         task = progress.add_task("Analyzing pages...", total=len(notebook_pages))
 
-        for page in notebook_pages:
+        def on_result(analysis):
+            nonlocal last_estimate
+            journal.append(analysis, hash_by_page[analysis.page_number])
             if verbose:
-                console.print(f"  Analyzing page {page.page_number}...")
-
-            analysis = analyzer.analyze_page(page)
-            page_analyses.append(analysis)
+                console.print(f"  Analyzed page {analysis.page_number}")
             progress.update(task, advance=1)
+            timeline.record(analysis)
+            if sample_plan is None:
+                return
+
+            known[analysis.page_number] = analysis
+            done = progress.tasks[0].completed
+            sample_done = done == len(sample_plan.sample)
+            if sample_done:
+                console.print(
+                    f"Sample of {done} pages analyzed in "
+                    f"{time.perf_counter() - sample_started:.1f}s"
+                )
+            if sample_done or time.monotonic() - last_estimate >= ESTIMATE_INTERVAL:
+                last_estimate = time.monotonic()
+                estimate = matcher.estimate_scores(
+                    list(known.values()), sample_plan.strata, donors=donors
+                )
+                if estimate is not None:
+                    estimate.save_to_file(estimate_file)
+                    live.update(Group(progress, report_gen.estimate_table(estimate)))
+
+        analyzer.analyze_pages(
+            notebook_pages,
+            max_concurrency=concurrency,
+            on_result=on_result,
+            collect_results=False,
+        )
+
+    if page_filter is not None and filter_plan.duplicates:
+        originals = {a.page_number: a for a in journal.load(manifest)}
+        if previous_analysis:
+            previous_by_page = {a.page_number: a for a in previous_analysis.page_analyses}
+            for page_number, previous_page in diff.reused.items():
+                if previous_page in previous_by_page:
+                    originals.setdefault(page_number, previous_by_page[previous_page])
+        copies = page_filter.duplicate_analyses(filter_plan, originals)
+        for analysis in copies:
+            journal.append(analysis, hash_by_page[analysis.page_number])
+
+        # Near-duplicates of pages that failed get their own request, unless
+        # a resumed run already analyzed them
+        settled = {a.page_number for a in copies} | {
+            n for n, a in originals.items() if a.content_type != "error"
+        }
+        uncopied = [
+            NotebookPage(page_number=fp.page_number, file_path=fp.file_path)
+            for fp in manifest
+            if fp.page_number in filter_plan.duplicates and fp.page_number not in settled
+        ]
+        if uncopied:
+            console.print(
+                f"Analyzing {len(uncopied)} near-duplicates of pages that failed..."
+            )
+            analyzer.analyze_pages(
+                uncopied,
+                max_concurrency=concurrency,
+                on_result=lambda a: journal.append(a, hash_by_page[a.page_number]),
+                collect_results=False,
+            )
+
+    page_analyses = [
+        a for a in journal.load(manifest) if a.page_number in run_pages
+    ]
 
     console.print(f"[green]✓ Analyzed {len(page_analyses)} pages[/green]")
 
+    failed_pages = [a.page_number for a in page_analyses if a.content_type == "error"]
+    if failed_pages:
+        console.print(
+            f"[yellow]Warning: {len(failed_pages)} pages failed after retries "
+            f"({', '.join(map(str, failed_pages))}) and contribute no evidence to "
+            f"the scores. Re-run with --incremental to retry only those pages.[/yellow]"
+        )
+
+    if previous_analysis:
+        page_analyses = splice_analyses(
+            diff, previous_analysis.page_analyses, page_analyses
+        )
+
     # Score against rubric
     console.print("\nScoring against rubric...")
-    matcher = RubricMatcher()
     rubric_scores = matcher.score_notebook(page_analyses)
+    if aggregate is not None:
+        matcher.aggregate(page_analyses).save_to_file(aggregate)
+        console.print(f"Saved rubric counts to {aggregate}")
+    if sample_plan is not None:
+        matcher.estimate_scores(page_analyses, sample_plan.strata).save_to_file(
+            estimate_file
+        )
 
     # Detect gaps
     console.print("Detecting gaps...")
@@ -136,22 +478,118 @@ def analyze(
         rubric_scores={code: score.model_dump() for code, score in rubric_scores.items()},
         gaps_identified=[g["title"] for g in gaps],
         recommendations=recommendations,
+        page_manifest=manifest,
     )
 
     # Save if requested
     if save:
-        output_file = settings.results_dir / "latest_analysis.json"
         notebook_analysis.save_to_file(output_file)
         console.print(f"\n[green]✓ Saved analysis to {output_file}[/green]")
 
     # Generate terminal report
     console.print("\n" + "=" * 60 + "\n")
-    report_gen = ReportGenerator()
     report_gen.generate_terminal_report(rubric_scores, gaps, recommendations)
 
+    # Latency, token and cost breakdown of this run's model calls
+    recorder = get_metrics_recorder()
+    report_gen.generate_metrics_report(recorder.snapshot())
+    report_gen.generate_pipeline_report(analyzer.pipeline_stats)
+    report_gen.generate_parse_report(recorder.snapshot(), analyzer.parse_stats)
+    report_gen.generate_schedule_report(timeline, schedule)
+    if analyzer.cascade:
+        report_gen.generate_cascade_report(
+            recorder.snapshot(),
+            analyzer.cascade_stats,
+            analyzer.cascade_model,
+            analyzer.model,
+        )
+    if recorder.enabled:
+        console.print(f"[dim]Call metrics appended to {recorder.metrics_file}[/dim]")
+
     console.print(f"\n[green]✓ Analysis complete![/green]")
 
 
+@app.command()
+def ingest(
+    source: Path = typer.Argument(
+        ...,
+        exists=True,
+        file_okay=False,
+        help="Folder of raw page scans or photos",
+    ),
+    output: Optional[Path] = typer.Option(
+        None,
+        help="Folder to write page_NNN.png files to (default: notebook-pages/)",
+    ),
+    workers: Optional[int] = typer.Option(
+        None,
+        help="Worker processes (default: CPU count)",
+    ),
+    deskew: Optional[bool] = typer.Option(
+        None,
+        "--deskew/--no-deskew",
+        help="Straighten rotated scans (default: INGEST_DESKEW)",
+    ),
+    trim: Optional[bool] = typer.Option(
+        None,
+        "--trim/--no-trim",
+        help="Crop to the page content (default: INGEST_TRIM_MARGINS)",
+    ),
+    force: bool = typer.Option(
+        False,
+        help="Re-normalize sources that are unchanged since the last ingest, and "
+        "replace page_NNN.png files in the output folder that ingest did not write",
+    ),
+):
+    """Normalize raw scans into numbered pages ready for analysis."""
+    settings = get_settings()
+    output = output or settings.notebook_pages_dir
+    console.print("\n[bold blue]V5-Notebook-Helper: Scan Ingestion[/bold blue]\n")
+
+    ingester = PageIngester(deskew=deskew, trim_margins=trim, max_workers=workers)
+    with Progress(
+        SpinnerColumn(),
+        TextColumn("[progress.description]{task.description}"),
+        console=console,
+    ) as progress:
+        task = progress.add_task("Normalizing images...", total=None)
+        try:
+            result = ingester.ingest(
+                source,
+                output,
+                force=force,
+                on_progress=lambda: progress.update(task, advance=1),
+            )
+        except FileExistsError as e:
+            progress.stop()
+            console.print(f"[red]Error: {e}[/red]")
+            console.print(
+                "Use --output to ingest into another folder, or --force to replace them."
+            )
+            raise typer.Exit(1)
+
+    if not result.records and not result.failed:
+        console.print(f"[red]Error: No images found in {source}[/red]")
+        raise typer.Exit(1)
+
+    console.print(
+        f"[green]✓ Wrote {result.written} pages to {output}[/green]"
+        + (f" ({result.reused} unchanged, skipped)" if result.reused else "")
+    )
+    if result.written:
+        console.print(
+            f"{result.images_per_second:.1f} images/s "
+            f"({result.seconds:.1f}s, {result.workers} workers)"
+        )
+    deskewed = [r for r in result.records if r.skew_degrees]
+    if deskewed:
+        console.print(f"Deskewed {len(deskewed)} pages")
+    if result.removed:
+        console.print(f"Removed {len(result.removed)} old pages this ingest replaced")
+    for failed_source, error in result.failed.items():
+        console.print(f"[yellow]Warning: could not read {failed_source}: {error}[/yellow]")
+
+
 @app.command()
 def gaps():
     """View identified gaps in the notebook."""
@@ -172,6 +610,141 @@ def gaps():
     console.print(f"\n[bold]Total gaps: {len(notebook_analysis.gaps_identified)}[/bold]")
 
 
+@app.command()
+def merge(
+    aggregates: List[Path] = typer.Argument(
+        ...,
+        exists=True,
+        dir_okay=False,
+        help="Rubric count files saved by 'analyze --aggregate' for each shard",
+    ),
+    output: Optional[Path] = typer.Option(
+        None,
+        dir_okay=False,
+        help="Save the merged counts to this file",
+    ),
+):
+    """Score shards of a notebook analyzed separately as one notebook."""
+    console.print("\n[bold blue]V5-Notebook-Helper: Merged Scores[/bold blue]\n")
+
+    try:
+        merged = ScoreAggregate.merge_all(
+            ScoreAggregate.load_from_file(path) for path in aggregates
+        )
+        rubric_scores = RubricMatcher().score_notebook(merged)
+    except ValueError as e:
+        console.print(f"[red]Error: {e}[/red]")
+        raise typer.Exit(1)
+
+    console.print(f"Merged {len(aggregates)} shards covering {merged.pages} pages")
+    if output is not None:
+        merged.save_to_file(output)
+        console.print(f"[green]✓ Saved merged counts to {output}[/green]")
+
+    detector = GapDetector()
+    gaps = detector.detect_gaps(rubric_scores, merged)
+    recommendations = detector.get_recommendations(rubric_scores, gaps)
+    console.print("\n" + "=" * 60 + "\n")
+    ReportGenerator().generate_terminal_report(rubric_scores, gaps, recommendations)
+
+
+@app.command()
+def whatif(
+    add: Optional[List[str]] = typer.Option(
+        None,
+        help="Page to add, as content_type[:categories[:elements]][*copies], "
+        "e.g. 'testing:EN6:testing_data*2'. Repeat for more pages.",
+    ),
+    remove: Optional[List[int]] = typer.Option(
+        None,
+        help="Number of an analyzed page to remove. Repeat for more pages.",
+    ),
+    aggregate: Optional[Path] = typer.Option(
+        None,
+        exists=True,
+        dir_okay=False,
+        help="Simulate over merged rubric counts (see 'merge') instead of the "
+        "latest analysis",
+    ),
+):
+    """Show the scores the notebook would get with pages added or removed."""
+    settings = get_settings()
+
+    matcher = RubricMatcher()
+    if aggregate is not None:
+        baseline = ScoreAggregate.load_from_file(aggregate)
+    else:
+        analysis_file = settings.results_dir / "latest_analysis.json"
+        if not analysis_file.exists():
+            console.print("[yellow]No analysis found. Run 'analyze' first.[/yellow]")
+            raise typer.Exit(1)
+        baseline = NotebookAnalysis.load_from_file(analysis_file).page_analyses
+
+    try:
+        simulator = ScoreSimulator(matcher, baseline)
+        what_if = WhatIf(
+            add=[HypotheticalPage.parse(spec) for spec in add or []],
+            remove=remove or [],
+        )
+        result = simulator.simulate(what_if)
+    except ValueError as e:
+        console.print(f"[red]Error: {e}[/red]")
+        raise typer.Exit(1)
+
+    ReportGenerator().generate_simulation_report(simulator.scores, result)
+
+
+@app.command()
+def cache(
+    action: str = typer.Argument(
+        "info",
+        help="Action: 'info', 'clear' or 'invalidate'",
+    ),
+    pages: str = typer.Option(
+        "all",
+        help="Pages to invalidate: 'all' or range like '1-10'",
+    ),
+):
+    """Inspect or invalidate cached page analyses."""
+    settings = get_settings()
+    analysis_cache = AnalysisCache()
+
+    if action == "info":
+        console.print(f"Cache file: {analysis_cache.cache_file}")
+        console.print(
+            f"Entries: {len(analysis_cache)} / {analysis_cache.max_entries}"
+        )
+    elif action == "clear":
+        removed = analysis_cache.clear()
+        console.print(f"[green]✓ Removed {removed} cached analyses[/green]")
+    elif action == "invalidate":
+        page_files = sorted(settings.notebook_pages_dir.glob("page_*.png"))
+        if pages != "all":
+            try:
+                start, end = map(int, pages.split("-"))
+                page_files = page_files[start - 1 : end]
+            except ValueError:
+                console.print(
+                    "[red]Error: Invalid page range. Use 'all' or 'start-end' (e.g., '1-10')[/red]"
+                )
+                raise typer.Exit(1)
+
+        removed = sum(
+            analysis_cache.invalidate_image(
+                AnalysisCache.hash_image(page_file.read_bytes())
+            )
+            for page_file in page_files
+        )
+        console.print(
+            f"[green]✓ Invalidated {removed} cached analyses for {len(page_files)} pages[/green]"
+        )
+    else:
+        console.print(
+            f"[red]Unknown action: {action}. Use 'info', 'clear' or 'invalidate'[/red]"
+        )
+        raise typer.Exit(1)
+
+
 @app.command()
 def progress():
     """View progress tracking data."""
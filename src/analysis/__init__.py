@@ -4,5 +4,14 @@ from .vision_analyzer import VisionAnalyzer
 from .rubric_matcher import RubricMatcher
 from .gap_detector import GapDetector
 from .report_generator import ReportGenerator
+from .analysis_cache import AnalysisCache
+from .analysis_journal import AnalysisJournal
 
-__all__ = ["VisionAnalyzer", "RubricMatcher", "GapDetector", "ReportGenerator"]
+__all__ = [
+    "VisionAnalyzer",
+    "RubricMatcher",
+    "GapDetector",
+    "ReportGenerator",
+    "AnalysisCache",
+    "AnalysisJournal",
+]
@@ -0,0 +1,176 @@
+"""Persistent content-addressed cache for per-page vision results."""
+
+import hashlib
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Optional
+
+from ..config import get_settings
+from ..models import PageAnalysis
+
+
+class AnalysisCache:
+    """
+    SQLite-backed LRU cache of PageAnalysis results.
+
+    Entries are keyed by a hash of the page image bytes, the prompt text and
+    the model name, so any change to one of them is a cache miss. The image
+    hash is also stored on its own so every entry for a page image can be
+    invalidated at once.
+    """
+
+    def __init__(
+        self, cache_file: Optional[Path] = None, max_entries: Optional[int] = None
+    ):
+        """
+        Initialize the analysis cache.
+
+        Args:
+            cache_file: Path to the SQLite cache file. If None, uses config default.
+            max_entries: Maximum entries kept before LRU eviction. If None,
+                uses config default.
+        """
+        settings = get_settings()
+        self.cache_file = cache_file or settings.analysis_cache_file
+        self.max_entries = max_entries or settings.analysis_cache_max_entries
+        self._lock = threading.Lock()
+
+        self.cache_file.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(self.cache_file), check_same_thread=False)
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS page_analyses (
+                key TEXT PRIMARY KEY,
+                image_hash TEXT NOT NULL,
+                model TEXT NOT NULL,
+                data TEXT NOT NULL,
+                last_used REAL NOT NULL
+            )
+            """
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_image_hash ON page_analyses (image_hash)"
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_last_used ON page_analyses (last_used)"
+        )
+        self._conn.commit()
+
+    @staticmethod
+    def hash_image(image_bytes: bytes) -> str:
+        """Return the content hash used to identify a page image."""
+        return hashlib.sha256(image_bytes).hexdigest()
+
+    @staticmethod
+    def make_key(image_hash: str, prompt: str, model: str, *extra: str) -> str:
+        """
+        Build a cache key from the inputs that determine a page analysis.
+
+        Args:
+            image_hash: Hash of the page image bytes (see ``hash_image``)
+            prompt: Prompt text sent with the image
+            model: Model name
+            *extra: Any other request settings that change the result
+
+        Returns:
+            Hex digest cache key
+        """
+        digest = hashlib.sha256()
+        for part in (image_hash, model, prompt, *extra):
+            digest.update(part.encode("utf-8"))
+            digest.update(b"\0")
+        return digest.hexdigest()
+
+    def get(self, key: str, page_number: int) -> Optional[PageAnalysis]:
+        """
+        Look up a cached analysis and mark it as recently used.
+
+        Args:
+            key: Cache key from ``make_key``
+            page_number: Page number to stamp on the returned analysis, since
+                the same image may have moved within the notebook
+
+        Returns:
+            Cached PageAnalysis, or None on a miss
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT data FROM page_analyses WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+
+            self._conn.execute(
+                "UPDATE page_analyses SET last_used = ? WHERE key = ?",
+                (time.time(), key),
+            )
+            self._conn.commit()
+
+        analysis = PageAnalysis.model_validate_json(row[0])
+        analysis.page_number = page_number
+        return analysis
+
+    def put(
+        self, key: str, image_hash: str, model: str, analysis: PageAnalysis
+    ) -> None:
+        """
+        Store an analysis, evicting least recently used entries over the limit.
+
+        Args:
+            key: Cache key from ``make_key``
+            image_hash: Hash of the page image bytes
+            model: Model name that produced the analysis
+            analysis: PageAnalysis to store
+        """
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO page_analyses VALUES (?, ?, ?, ?, ?)",
+                (key, image_hash, model, analysis.model_dump_json(), time.time()),
+            )
+            self._conn.execute(
+                """
+                DELETE FROM page_analyses WHERE key IN (
+                    SELECT key FROM page_analyses
+                    ORDER BY last_used DESC LIMIT -1 OFFSET ?
+                )
+                """,
+                (self.max_entries,),
+            )
+            self._conn.commit()
+
+    def invalidate_image(self, image_hash: str) -> int:
+        """
+        Remove every cached analysis of a page image.
+
+        Args:
+            image_hash: Hash of the page image bytes
+
+        Returns:
+            Number of entries removed
+        """
+        with self._lock:
+            cursor = self._conn.execute(
+                "DELETE FROM page_analyses WHERE image_hash = ?", (image_hash,)
+            )
+            self._conn.commit()
+            return cursor.rowcount
+
+    def clear(self) -> int:
+        """
+        Remove every cached analysis.
+
+        Returns:
+            Number of entries removed
+        """
+        with self._lock:
+            cursor = self._conn.execute("DELETE FROM page_analyses")
+            self._conn.commit()
+            return cursor.rowcount
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute(
+                "SELECT COUNT(*) FROM page_analyses"
+            ).fetchone()[0]
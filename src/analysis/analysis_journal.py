@@ -0,0 +1,106 @@
+"""Append-only on-disk journal of page analyses for crash-safe runs."""
+
+import json
+import os
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Set, Tuple
+
+from ..config import get_settings
+from ..models import PageAnalysis, PageFingerprint
+
+
+class AnalysisJournal:
+    """
+    JSONL journal with one line per completed page analysis.
+
+    Each line records the page's content hash alongside its analysis, so a
+    resumed run only trusts entries for pages whose image is unchanged.
+    Lines are flushed and fsynced as they are written; a line truncated by
+    a crash is ignored when the journal is read back.
+    """
+
+    def __init__(self, journal_file: Optional[Path] = None):
+        """
+        Initialize the journal.
+
+        Args:
+            journal_file: Path to the JSONL journal. If None, uses config default.
+        """
+        settings = get_settings()
+        self.journal_file = journal_file or settings.analysis_journal_file
+
+    def reset(self) -> None:
+        """Start a fresh journal, discarding any previous entries."""
+        self.journal_file.parent.mkdir(parents=True, exist_ok=True)
+        self.journal_file.write_text("")
+
+    def append(self, analysis: PageAnalysis, content_hash: str) -> None:
+        """
+        Durably record a completed page analysis.
+
+        Args:
+            analysis: PageAnalysis to record
+            content_hash: Hash of the analyzed page image
+        """
+        line = json.dumps(
+            {
+                "content_hash": content_hash,
+                "analysis": analysis.model_dump(mode="json"),
+            }
+        )
+        with open(self.journal_file, "a") as f:
+            f.write(line + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+
+    def entries(self) -> Iterator[Tuple[str, PageAnalysis]]:
+        """Yield (content hash, analysis) for every intact journal line."""
+        if not self.journal_file.exists():
+            return
+
+        with open(self.journal_file, "r") as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                    yield entry["content_hash"], PageAnalysis(**entry["analysis"])
+                except (json.JSONDecodeError, KeyError, ValueError):
+                    # Partial line from an interrupted write
+                    continue
+
+    def _latest(self, manifest: List[PageFingerprint]) -> Dict[int, PageAnalysis]:
+        """Latest journaled analysis per page whose image still matches."""
+        hashes = {fp.page_number: fp.content_hash for fp in manifest}
+        latest = {}
+        for content_hash, analysis in self.entries():
+            if hashes.get(analysis.page_number) == content_hash:
+                latest[analysis.page_number] = analysis
+        return latest
+
+    def completed_pages(self, manifest: List[PageFingerprint]) -> Set[int]:
+        """
+        Page numbers with a successful journal entry for their current image.
+
+        Args:
+            manifest: Fingerprints of the pages in this run
+
+        Returns:
+            Set of page numbers that can be skipped on resume
+        """
+        return {
+            page_number
+            for page_number, analysis in self._latest(manifest).items()
+            if analysis.content_type != "error"
+        }
+
+    def load(self, manifest: List[PageFingerprint]) -> List[PageAnalysis]:
+        """
+        Read back the journaled analyses for the pages in a manifest.
+
+        Args:
+            manifest: Fingerprints of the pages in this run
+
+        Returns:
+            Latest analysis per page, sorted by page number
+        """
+        latest = self._latest(manifest)
+        return [latest[page_number] for page_number in sorted(latest)]
@@ -1,23 +1,27 @@
 """Detect gaps and missing elements in engineering notebook."""
 
-from typing import Dict, List, Tuple
+from typing import Dict, List, Tuple, Union
 
 from ..models import PageAnalysis, RubricScore, RubricStatus
 from ..models.progress import Priority
+from .score_aggregate import ScoreAggregate
 
 
 class GapDetector:
     """Identifies missing elements and gaps in notebook documentation."""
 
     def detect_gaps(
-        self, rubric_scores: Dict[str, RubricScore], page_analyses: List[PageAnalysis]
+        self,
+        rubric_scores: Dict[str, RubricScore],
+        page_analyses: Union[List[PageAnalysis], ScoreAggregate],
     ) -> List[Dict]:
         """
         Detect gaps in the notebook.
 
         Args:
             rubric_scores: Dict of criterion codes to RubricScores
-            page_analyses: List of all PageAnalysis
+            page_analyses: List of all PageAnalysis, or their merged
+                ScoreAggregate
 
         Returns:
             List of gap dictionaries with title, description, priority, criterion
@@ -99,20 +103,36 @@ class GapDetector:
         base_description = descriptions.get(criterion_code, "Address this gap in your notebook.")
         return f"{base_description} Specifically: {missing}"
 
+    def _element_pages(
+        self, page_analyses: Union[List[PageAnalysis], ScoreAggregate]
+    ) -> Dict[str, int]:
+        """Count the pages showing each key element."""
+        if isinstance(page_analyses, ScoreAggregate):
+            return page_analyses.key_elements
+        counts: Dict[str, int] = {}
+        for page in page_analyses:
+            for element, found in page.key_elements.items():
+                if found:
+                    counts[element] = counts.get(element, 0) + 1
+        return counts
+
     def _check_critical_gaps(
-        self, rubric_scores: Dict[str, RubricScore], page_analyses: List[PageAnalysis]
+        self,
+        rubric_scores: Dict[str, RubricScore],
+        page_analyses: Union[List[PageAnalysis], ScoreAggregate],
     ) -> List[Dict]:
         """
         Check for critical gaps that might not be captured by rubric scoring.
 
         Args:
             rubric_scores: Current rubric scores
-            page_analyses: All page analyses
+            page_analyses: All page analyses, or their merged ScoreAggregate
 
         Returns:
             List of critical gap dictionaries
         """
         critical_gaps = []
+        element_pages = self._element_pages(page_analyses)
 
         # Check for Fully Developed status
         en1_4_scores = [rubric_scores.get(f"EN{i}", RubricScore(
@@ -146,9 +166,7 @@ class GapDetector:
             )
 
         # Check for missing decision matrices
-        has_decision_matrix = any(
-            p.key_elements.get("decision_matrix", False) for p in page_analyses
-        )
+        has_decision_matrix = element_pages.get("decision_matrix", 0) > 0
         if not has_decision_matrix:
             critical_gaps.append(
                 {
@@ -161,9 +179,7 @@ class GapDetector:
             )
 
         # Check for missing testing data
-        testing_pages = sum(
-            1 for p in page_analyses if p.key_elements.get("testing_data", False)
-        )
+        testing_pages = element_pages.get("testing_data", 0)
         if testing_pages < 2:
             critical_gaps.append(
                 {
@@ -178,9 +194,7 @@ class GapDetector:
             )
 
         # Check for design iteration labeling
-        iteration_pages = sum(
-            1 for p in page_analyses if p.key_elements.get("design_iteration", False)
-        )
+        iteration_pages = element_pages.get("design_iteration", 0)
         if iteration_pages < 2:
             critical_gaps.append(
                 {
@@ -0,0 +1,175 @@
+"""Shrink page images before they are uploaded to the vision model."""
+
+import io
+import math
+from typing import Optional
+
+from PIL import Image, ImageChops, ImageOps, ImageStat
+
+from ..config import get_settings
+
+MIME_TYPES = {"jpeg": "image/jpeg", "webp": "image/webp", "png": "image/png"}
+
+
+def estimate_image_tokens(width: int, height: int, detail: str = "auto") -> int:
+    """
+    Estimate the prompt tokens the vision model charges for an image.
+
+    Follows OpenAI's published tiling rule: low detail is a flat 85 tokens;
+    otherwise the image is fit within 2048x2048, its short side scaled to
+    768, and each 512px tile costs 170 tokens on top of the 85 base.
+
+    Args:
+        width: Image width in pixels
+        height: Image height in pixels
+        detail: OpenAI detail level ("low", "high" or "auto")
+
+    Returns:
+        Estimated image token count
+    """
+    if detail == "low":
+        return 85
+
+    scale = min(1.0, 2048 / max(width, height))
+    width, height = width * scale, height * scale
+    scale = min(1.0, 768 / min(width, height))
+    width, height = width * scale, height * scale
+
+    tiles = math.ceil(width / 512) * math.ceil(height / 512)
+    return 85 + 170 * tiles
+
+
+class ImagePreprocessor:
+    """Trims, downscales and re-encodes page images to reduce upload size."""
+
+    def __init__(
+        self,
+        max_long_edge: Optional[int] = None,
+        image_format: Optional[str] = None,
+        quality: Optional[int] = None,
+        trim_margins: Optional[bool] = None,
+    ):
+        """
+        Initialize the preprocessor.
+
+        Args:
+            max_long_edge: Longest output edge in pixels. If None, uses config.
+            image_format: Output format: "jpeg", "webp" or "png". If None,
+                uses config.
+            quality: JPEG/WebP quality (1-100). If None, uses config.
+            trim_margins: Whether to crop white margins. If None, uses config.
+        """
+        settings = get_settings()
+        self.max_long_edge = max_long_edge or settings.image_max_long_edge
+        self.image_format = (image_format or settings.image_format).lower()
+        self.quality = quality or settings.image_quality
+        self.trim_margins = (
+            settings.image_trim_margins if trim_margins is None else trim_margins
+        )
+
+        if self.image_format not in MIME_TYPES:
+            raise ValueError(
+                f"Unsupported image format: {self.image_format}. "
+                f"Use one of: {', '.join(MIME_TYPES)}"
+            )
+
+    @property
+    def mime_type(self) -> str:
+        """MIME type of the images this preprocessor produces."""
+        return MIME_TYPES[self.image_format]
+
+    @property
+    def cache_tag(self) -> str:
+        """Identifier of the output settings, for use in cache keys."""
+        return (
+            f"{self.image_format}:{self.max_long_edge}:{self.quality}:"
+            f"{int(self.trim_margins)}"
+        )
+
+    def process(self, image_bytes: bytes) -> bytes:
+        """
+        Preprocess an encoded image.
+
+        Args:
+            image_bytes: Original image file bytes
+
+        Returns:
+            Re-encoded image bytes in ``self.image_format``
+        """
+        image = Image.open(io.BytesIO(image_bytes))
+        return self.encode(self.prepare(image))
+
+    def prepare(self, image: Image.Image) -> Image.Image:
+        """
+        Trim, downscale and reduce the color mode of a decoded image.
+
+        Args:
+            image: Decoded page image
+
+        Returns:
+            Processed image, ready for ``encode``
+        """
+        image = image.convert("RGB")
+
+        if self.trim_margins:
+            image = self._trim(image)
+
+        if max(image.size) > self.max_long_edge:
+            image.thumbnail(
+                (self.max_long_edge, self.max_long_edge), Image.Resampling.LANCZOS
+            )
+
+        return self._reduce_mode(image)
+
+    def encode(self, image: Image.Image) -> bytes:
+        """Encode a prepared image in the configured output format."""
+        buffer = io.BytesIO()
+        if self.image_format == "png":
+            image.save(buffer, format="PNG", optimize=True)
+        else:
+            if image.mode == "P":
+                image = image.convert("RGB")
+            image.save(buffer, format=self.image_format.upper(), quality=self.quality)
+        return buffer.getvalue()
+
+    def _trim(self, image: Image.Image, threshold: int = 16, padding: int = 8) -> Image.Image:
+        """Crop near-white margins, leaving a small border around the content."""
+        gray = ImageOps.invert(image.convert("L"))
+        mask = gray.point(lambda p: 255 if p > threshold else 0)
+        bbox = mask.getbbox()
+
+        # Blank page: nothing to trim to
+        if bbox is None:
+            return image
+
+        left, top, right, bottom = bbox
+        return image.crop(
+            (
+                max(0, left - padding),
+                max(0, top - padding),
+                min(image.width, right + padding),
+                min(image.height, bottom + padding),
+            )
+        )
+
+    def _reduce_mode(self, image: Image.Image, tolerance: float = 2.0) -> Image.Image:
+        """
+        Convert to grayscale or palette mode when it loses (almost) nothing.
+
+        Grayscale is used when the mean per-channel difference from the
+        grayscale version is within ``tolerance``. For PNG output, images
+        with at most 256 distinct colors are stored as an exact palette.
+        """
+        gray = image.convert("L")
+        difference = ImageChops.difference(image, gray.convert("RGB"))
+        if max(ImageStat.Stat(difference).mean) <= tolerance:
+            return gray
+
+        colors = image.getcolors(256) if self.image_format == "png" else None
+        if colors is not None:
+            # Quantizing against the exact color set without dithering is lossless
+            palette = Image.new("P", (1, 1))
+            palette.putpalette([c for _, rgb in colors for c in rgb])
+            return image.quantize(palette=palette, dither=Image.Dither.NONE)
+
+        return image
@@ -0,0 +1,364 @@
+"""CPU-only layout feature detection used to prefill page key elements."""
+
+from io import BytesIO
+from typing import Dict, List, Tuple
+
+import numpy as np
+from PIL import Image
+from pydantic import BaseModel, Field
+
+# Long edge of the working image
+WORK_SIZE = 800
+# Page body as fractions (left, top, right, bottom); notebook templates keep
+# header/footer fields and section tabs outside it
+BODY_BOX = (0.05, 0.05, 0.95, 0.93)
+# Gray-level step across a pixel boundary that counts as an edge
+EDGE_STEP = 40
+# Straight edges shorter than these fractions of the body are ignored
+MIN_H_LINE = 0.10
+MIN_V_LINE = 0.04
+# Thicker edge bands are blobs (photos, fills), not rules
+MAX_LINE_THICKNESS = 4
+# Colour distance from the page background that counts as a fill, and the
+# erosion box that strips text strokes and thin rules from fills
+FILL_STEP = 16
+FILL_ERODE = 5
+# Table cells: flat fills at least MIN_CELL wide, separated by gutters of
+# at most MAX_GUTTER (fractions of the body width)
+MIN_CELL = 0.03
+MAX_GUTTER = 0.025
+# Tile size for picture detection, and distinct colours (at 3 bits per
+# channel) a tile needs to count as photo/render rather than text or fills
+TILE = 16
+PICTURE_COLORS = 12
+# Saturated fill hues are counted in this many bins
+HUE_BINS = 12
+
+
+class LayoutFeatures(BaseModel):
+    """Layout measurements of one page body."""
+
+    ink_coverage: float = 0.0
+    h_lines: int = 0
+    v_lines: int = 0
+    grid_crossings: int = 0
+    table_rows: int = 0  # Horizontal rules crossed by 2+ vertical rules
+    cell_bands: int = 0  # Rows of 2+ side-by-side filled cells
+    fill_hues: int = 0  # Distinct saturated hues inside table areas
+    plot_axes: int = 0  # L-shaped axis pairs outside tables
+    picture_fraction: float = 0.0  # Body area covered by photos/renders
+
+
+class LayoutHints(BaseModel):
+    """Candidate key element flags detected locally, with confidences."""
+
+    features: LayoutFeatures
+    flags: Dict[str, bool] = Field(default_factory=dict)
+    confidences: Dict[str, float] = Field(default_factory=dict)
+
+    def settled(self, min_confidence: float) -> Dict[str, bool]:
+        """
+        Flags confident enough to be used without asking the model.
+
+        Args:
+            min_confidence: Minimum confidence for a flag to be settled
+
+        Returns:
+            Dict of key element name -> value
+        """
+        return {
+            name: value
+            for name, value in self.flags.items()
+            if self.confidences.get(name, 0.0) >= min_confidence
+        }
+
+
+def _runs(mask: np.ndarray, min_length: int) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Row, start and end (exclusive) of every run of True at least ``min_length`` long."""
+    padded = np.pad(mask, ((0, 0), (1, 1))).astype(np.int8)
+    steps = np.diff(padded, axis=1)
+    rows, starts = np.nonzero(steps == 1)
+    _, ends = np.nonzero(steps == -1)
+    keep = ends - starts >= min_length
+    return rows[keep], starts[keep], ends[keep]
+
+
+def _segments(edges: np.ndarray, min_length: int) -> np.ndarray:
+    """
+    Find thin straight segments in an edge mask, along rows.
+
+    Runs of edge pixels at least ``min_length`` long are merged with runs
+    on adjacent rows that cover about the same span.
+
+    Args:
+        edges: Boolean edge mask
+        min_length: Minimum run length in pixels
+
+    Returns:
+        Array of (first row, last row, start, end) per segment
+    """
+    runs = sorted(zip(*_runs(edges, min_length)), key=lambda r: (r[1], r[0]))
+
+    segments: List[List[int]] = []
+    open_segments: Dict[Tuple[int, int], int] = {}
+    for row, start, end in runs:
+        key = None
+        for dx0 in (-2, -1, 0, 1, 2):
+            for dx1 in (-2, -1, 0, 1, 2):
+                index = open_segments.get((start + dx0, end + dx1))
+                if index is not None and segments[index][1] == row - 1:
+                    key = index
+                    break
+            if key is not None:
+                break
+        if key is None:
+            segments.append([row, row, start, end])
+            key = len(segments) - 1
+        else:
+            segments[key][1] = row
+        open_segments[(start, end)] = key
+
+    result = np.array(segments, dtype=np.int32).reshape(-1, 4)
+    thin = result[:, 1] - result[:, 0] < MAX_LINE_THICKNESS
+    return result[thin]
+
+
+def _channel_max(values: np.ndarray) -> np.ndarray:
+    """Per-pixel maximum over RGB (much faster than ``max(axis=-1)`` on 3 channels)."""
+    return np.maximum(np.maximum(values[..., 0], values[..., 1]), values[..., 2])
+
+
+def _erode(mask: np.ndarray, size: int) -> np.ndarray:
+    """Keep pixels whose whole ``size`` x ``size`` neighbourhood is set."""
+    integral = np.pad(mask.astype(np.int32), ((1, 0), (1, 0))).cumsum(0).cumsum(1)
+    window = (
+        integral[size:, size:]
+        - integral[:-size, size:]
+        - integral[size:, :-size]
+        + integral[:-size, :-size]
+    )
+    eroded = np.zeros_like(mask)
+    offset = size // 2
+    eroded[offset : offset + window.shape[0], offset : offset + window.shape[1]] = (
+        window == size * size
+    )
+    return eroded
+
+
+def _cell_rows(pixels: np.ndarray) -> np.ndarray:
+    """
+    Mark pixel rows that cross two or more adjacent filled table cells.
+
+    Tables drawn as pale cell fills separated by white gutters have no
+    dark rules to find, so they are detected from the fills themselves:
+    flat runs of colour, separated by narrow gaps, on the same row.
+
+    Args:
+        pixels: RGB body image as int16
+
+    Returns:
+        Boolean array with one entry per pixel row
+    """
+    height, width = pixels.shape[:2]
+    background = np.median(pixels[::4, ::4].reshape(-1, 3), axis=0)
+    fill = _erode(_channel_max(np.abs(pixels - background)) > FILL_STEP, FILL_ERODE)
+    rows, starts, ends = _runs(fill, int(width * MIN_CELL))
+
+    # A run is flat when most of its pixels match their left neighbour;
+    # text and photo texture break that up
+    smooth = _channel_max(np.abs(np.diff(pixels, axis=1))) < 8
+    smooth = np.pad(smooth.cumsum(axis=1), ((0, 0), (1, 0)))
+    flat = (smooth[rows, ends - 1] - smooth[rows, starts]) / (ends - starts) >= 0.6
+
+    # Two flat runs on the same row with only a gutter between them
+    adjacent = (
+        (rows[1:] == rows[:-1])
+        & flat[1:]
+        & flat[:-1]
+        & (starts[1:] - ends[:-1] <= int(width * MAX_GUTTER))
+    )
+    cell_rows = np.zeros(height, dtype=bool)
+    cell_rows[rows[1:][adjacent]] = True
+    return cell_rows
+
+
+def _bands(rows: np.ndarray, min_height: int = 4) -> List[Tuple[int, int]]:
+    """Group consecutive marked rows into (first, end) bands at least ``min_height`` tall."""
+    steps = np.diff(np.pad(rows, 1).astype(np.int8))
+    starts, ends = np.nonzero(steps == 1)[0], np.nonzero(steps == -1)[0]
+    return [(s, e) for s, e in zip(starts, ends) if e - s >= min_height]
+
+
+def _crossings(h: np.ndarray, v: np.ndarray, slack: int = 2) -> np.ndarray:
+    """Boolean matrix [h, v] of horizontal/vertical segments that touch."""
+    if not len(h) or not len(v):
+        return np.zeros((len(h), len(v)), dtype=bool)
+    hy = (h[:, 0] + h[:, 1])[:, None] / 2
+    vx = (v[:, 0] + v[:, 1])[None, :] / 2
+    return (
+        (vx >= h[:, 2:3] - slack)
+        & (vx <= h[:, 3:4] + slack)
+        & (hy >= v[None, :, 2] - slack)
+        & (hy <= v[None, :, 3] + slack)
+    )
+
+
+def _plot_axes(h: np.ndarray, v: np.ndarray, crosses: np.ndarray, slack: int = 3) -> int:
+    """Count vertical segments whose bottom end meets a horizontal segment's left end."""
+    # A table rule is crossed by several verticals; an x axis is not
+    axes = h[crosses.sum(axis=1) <= 2] if len(v) else h
+    count = 0
+    for x0, x1, _, bottom in v:
+        x = (x0 + x1) / 2
+        y = (axes[:, 0] + axes[:, 1]) / 2
+        if ((np.abs(y - bottom) <= slack) & (np.abs(x - axes[:, 2]) <= slack)).any():
+            count += 1
+    return count
+
+
+def measure_layout(image: Image.Image) -> LayoutFeatures:
+    """
+    Measure layout features of a page image.
+
+    Args:
+        image: Page image
+
+    Returns:
+        LayoutFeatures of the page body
+    """
+    image.draft("RGB", (WORK_SIZE, WORK_SIZE))  # Lets JPEG decode at reduced scale
+    image = image.convert("RGB")
+    factor = max(image.size) // WORK_SIZE
+    if factor > 1:
+        image = image.reduce(factor)
+
+    width, height = image.size
+    left, top, right, bottom = BODY_BOX
+    body = image.crop(
+        (int(width * left), int(height * top), int(width * right), int(height * bottom))
+    )
+    pixels = np.asarray(body, dtype=np.int16)
+    gray = (pixels[..., 0] + pixels[..., 1] + pixels[..., 2]) / 3
+    height, width = gray.shape
+
+    background = np.percentile(gray, 90)
+    ink_coverage = float((gray < background - 60).mean())
+
+    # Straight rules and fill boundaries, as edges between pixel rows/columns
+    h_edges = np.abs(np.diff(gray, axis=0)) > EDGE_STEP
+    v_edges = np.abs(np.diff(gray, axis=1)) > EDGE_STEP
+    h = _segments(h_edges, int(width * MIN_H_LINE))
+    v = _segments(v_edges.T, int(height * MIN_V_LINE))
+    crosses = _crossings(h, v)
+    table_rows = crosses.sum(axis=1) >= 2
+
+    # Tables drawn with fills instead of rules
+    cell_rows = _cell_rows(pixels)
+    bands = _bands(cell_rows)
+
+    # Saturated hues inside table areas
+    in_table = cell_rows.copy()
+    for y0, y1, _, _ in h[table_rows]:
+        in_table[y0 : y1 + 1] = True
+    fill_hues = 0
+    if in_table.any():
+        area = pixels[in_table].astype(np.uint8)
+        hsv = np.asarray(Image.fromarray(area).convert("HSV"), dtype=np.int16).reshape(-1, 3)
+        saturated = hsv[(hsv[:, 1] > 60) & (hsv[:, 2] > 100)]
+        if len(saturated):
+            counts = np.bincount(saturated[:, 0] * HUE_BINS // 256, minlength=HUE_BINS)
+            fill_hues = int((counts > 0.01 * len(hsv)).sum())
+
+    # Photos and renders: tiles that are mostly non-white with many colours
+    rows, cols = height // TILE, width // TILE
+    tiles = (
+        pixels[: rows * TILE, : cols * TILE]
+        .reshape(rows, TILE, cols, TILE, 3)
+        .transpose(0, 2, 1, 3, 4)
+        .reshape(rows, cols, TILE * TILE, 3)
+    )
+    quantized = tiles // 32
+    codes = np.sort(quantized[..., 0] * 64 + quantized[..., 1] * 8 + quantized[..., 2], axis=2)
+    colors = (np.diff(codes, axis=2) != 0).sum(axis=2) + 1
+    filled = (tiles.sum(axis=3) < 600).mean(axis=2)
+    picture = (colors >= PICTURE_COLORS) & (filled > 0.5)
+
+    return LayoutFeatures(
+        ink_coverage=ink_coverage,
+        h_lines=len(h),
+        v_lines=len(v),
+        grid_crossings=int(crosses.sum()),
+        table_rows=int(table_rows.sum()),
+        cell_bands=len(bands),
+        fill_hues=fill_hues,
+        plot_axes=_plot_axes(h, v, crosses),
+        picture_fraction=float(picture.mean()) if picture.size else 0.0,
+    )
+
+
+def hints_from_features(features: LayoutFeatures) -> LayoutHints:
+    """
+    Turn layout features into candidate key element flags.
+
+    The confidences are hand-set heuristic defaults, not probabilities
+    calibrated against labelled pages. They are deliberately asymmetric: a
+    page with no table, chart or picture almost never has a decision
+    matrix, testing data or CAD drawing, while a table alone does not say
+    what it holds (task lists and scoring tables look like test results).
+    With the default ``layout_min_confidence`` of 0.9 only these negative
+    flags are settled locally; ``benchmarks/bench_layout_hints.py`` reports
+    how often they agree with a saved analysis before the threshold is
+    lowered. Settled flags only shorten the page prompt: every page is still
+    sent to the model, and ``dates_timestamps`` is never settled, since
+    reading a dated header needs OCR.
+
+    Args:
+        features: Measured LayoutFeatures
+
+    Returns:
+        LayoutHints for ``decision_matrix``, ``testing_data`` and
+        ``cad_drawings``
+    """
+    hints = LayoutHints(features=features)
+    has_table = features.table_rows + features.cell_bands >= 2
+
+    def flag(name: str, value: bool, confidence: float) -> None:
+        hints.flags[name] = value
+        hints.confidences[name] = confidence
+
+    if not has_table:
+        flag("decision_matrix", False, 0.95)
+    elif features.fill_hues >= 3:
+        flag("decision_matrix", True, 0.75)
+    else:
+        flag("decision_matrix", False, 0.6)
+
+    if features.plot_axes:
+        flag("testing_data", True, 0.7)
+    elif has_table:
+        flag("testing_data", True, 0.55)
+    else:
+        flag("testing_data", False, 0.9)
+
+    if features.picture_fraction >= 0.04:
+        flag("cad_drawings", True, 0.6)
+    elif features.picture_fraction < 0.005 and features.v_lines < 10:
+        flag("cad_drawings", False, 0.9)
+    else:
+        flag("cad_drawings", False, 0.6)
+
+    return hints
+
+
+def detect_layout(image_bytes: bytes) -> LayoutHints:
+    """
+    Detect candidate key elements of a page image.
+
+    Args:
+        image_bytes: Encoded page image
+
+    Returns:
+        LayoutHints with flags and confidences
+    """
+    with Image.open(BytesIO(image_bytes)) as image:
+        return hints_from_features(measure_layout(image))
@@ -0,0 +1,331 @@
+"""Local blank and near-duplicate page detection, run before vision calls."""
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+from PIL import Image
+from pydantic import BaseModel, Field
+
+from ..config import get_settings
+from ..models import PageAnalysis, PageFingerprint
+
+# Long edge of the grayscale working image used for ink coverage
+WORK_SIZE = 512
+# dHash grid (HASH_SIZE x HASH_SIZE bits)
+HASH_SIZE = 16
+# Long edge of the thumbnails compared to confirm a duplicate
+VERIFY_SIZE = 256
+# Gray levels a thumbnail pixel may differ by before it counts as changed
+VERIFY_TOLERANCE = 96
+# Below this many pages, signatures are computed in-process
+MIN_PARALLEL_PAGES = 16
+
+
+def _grayscale(file_path: Path, size: int) -> Image.Image:
+    """Load an image as grayscale, reduced so its long edge is about ``size``."""
+    image = Image.open(file_path)
+    image.draft("L", (size, size))  # Lets JPEG decode at reduced scale
+    image = image.convert("L")
+    factor = max(image.size) // size
+    return image.reduce(factor) if factor > 1 else image
+
+
+def compute_signature(file_path: Path) -> Tuple[float, str]:
+    """
+    Compute the ink coverage and perceptual hash of a page image.
+
+    Ink is any pixel well below the page's background brightness (90th
+    percentile), ignoring a 3% border where scan shadows collect. The hash
+    is a 16x16 difference hash (dHash) of the whole page.
+
+    Args:
+        file_path: Path to the page image
+
+    Returns:
+        Tuple of (ink coverage fraction, perceptual hash as hex)
+    """
+    image = _grayscale(file_path, WORK_SIZE)
+    pixels = np.asarray(image, dtype=np.int16)
+
+    height, width = pixels.shape
+    margin = int(min(height, width) * 0.03)
+    core = pixels[margin : height - margin, margin : width - margin]
+    background = np.percentile(core, 90)
+    ink_coverage = float((core < background - 60).mean())
+
+    grid = np.asarray(
+        image.resize((HASH_SIZE + 1, HASH_SIZE), Image.BOX), dtype=np.int16
+    )
+    bits = grid[:, 1:] > grid[:, :-1]
+    return ink_coverage, np.packbits(bits).tobytes().hex()
+
+
+def _thumbnail(file_path: Path) -> np.ndarray:
+    image = _grayscale(file_path, VERIFY_SIZE * 2)
+    image.thumbnail((VERIFY_SIZE, VERIFY_SIZE), Image.BOX)
+    return np.asarray(image, dtype=np.int16)
+
+
+def _unmatched_fraction(a: np.ndarray, b: np.ndarray, shift: int) -> float:
+    """Fraction of pixels of ``a`` with no close match within ``shift`` in ``b``."""
+    height, width = a.shape
+    inner = a[shift : height - shift, shift : width - shift]
+    best = None
+    for dy in range(-shift, shift + 1):
+        for dx in range(-shift, shift + 1):
+            moved = b[shift + dy : height - shift + dy, shift + dx : width - shift + dx]
+            diff = np.abs(inner - moved)
+            best = diff if best is None else np.minimum(best, diff)
+    return float((best > VERIFY_TOLERANCE).mean())
+
+
+def changed_fraction(a: np.ndarray, b: np.ndarray, shift: int = 1) -> float:
+    """
+    Fraction of thumbnail pixels that differ, tolerating small misalignment.
+
+    A pixel only counts as changed if it differs from every pixel within
+    ``shift`` of the same position in the other image. Both directions are
+    checked and the larger fraction is returned.
+
+    Args:
+        a: Grayscale thumbnail
+        b: Grayscale thumbnail of the same shape
+        shift: Misalignment tolerance in pixels
+
+    Returns:
+        Changed fraction in [0, 1] (1.0 if the shapes differ)
+    """
+    if a.shape != b.shape:
+        return 1.0
+    return max(_unmatched_fraction(a, b, shift), _unmatched_fraction(b, a, shift))
+
+
+def hamming_matrix(hashes: List[str]) -> np.ndarray:
+    """
+    Pairwise Hamming distances between hex perceptual hashes.
+
+    Args:
+        hashes: Equal-length hex hashes
+
+    Returns:
+        Square int matrix of bit distances
+    """
+    if not hashes:
+        return np.zeros((0, 0), dtype=np.int32)
+    packed = np.frombuffer(b"".join(bytes.fromhex(h) for h in hashes), dtype=np.uint8)
+    bits = np.unpackbits(packed.reshape(len(hashes), -1), axis=1).astype(np.float32)
+    # For 0/1 vectors, differing bits = a.(1-b) + (1-a).b
+    distances = bits @ (1 - bits).T + (1 - bits) @ bits.T
+    return distances.round().astype(np.int32)
+
+
+class FilterPlan(BaseModel):
+    """Which pages of a run need a vision call and which are settled locally."""
+
+    to_analyze: List[int] = Field(
+        default_factory=list, description="Page numbers to send to the vision model"
+    )
+    blank: List[int] = Field(
+        default_factory=list, description="Page numbers detected as blank"
+    )
+    duplicates: Dict[int, int] = Field(
+        default_factory=dict,
+        description="Page number -> page number whose analysis it reuses",
+    )
+
+
+class PageFilter:
+    """
+    Settles blank and near-duplicate pages without calling the vision model.
+
+    Candidates for duplicates are found by perceptual hash distance, then
+    confirmed by comparing thumbnails pixel by pixel: pages built from the
+    same template (e.g. section dividers that differ only in their title)
+    hash almost identically, and must not share an analysis.
+    """
+
+    def __init__(
+        self,
+        blank_threshold: Optional[float] = None,
+        hash_distance: Optional[int] = None,
+        max_pixel_diff: Optional[float] = None,
+        max_workers: Optional[int] = None,
+    ):
+        """
+        Initialize the page filter.
+
+        Args:
+            blank_threshold: Ink coverage below which a page is blank.
+                If None, uses config settings.
+            hash_distance: Maximum perceptual hash distance (of 256 bits)
+                for two pages to be compared as possible duplicates. If
+                None, uses config settings.
+            max_pixel_diff: Maximum changed pixel fraction for a candidate
+                to be confirmed as a duplicate. If None, uses config settings.
+            max_workers: Processes used to compute signatures. If None,
+                uses the CPU count.
+        """
+        settings = get_settings()
+        self.blank_threshold = (
+            settings.blank_ink_threshold if blank_threshold is None else blank_threshold
+        )
+        self.hash_distance = (
+            settings.duplicate_hash_distance if hash_distance is None else hash_distance
+        )
+        self.max_pixel_diff = (
+            settings.duplicate_max_pixel_diff if max_pixel_diff is None else max_pixel_diff
+        )
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self._thumbnails: Dict[Path, np.ndarray] = {}
+
+    def ensure_signatures(self, fingerprints: List[PageFingerprint]) -> None:
+        """
+        Fill in ink coverage and perceptual hash on fingerprints missing them.
+
+        Signatures are stored on the fingerprints, so pages carried over in
+        the saved manifest are not decoded again on later runs.
+
+        Args:
+            fingerprints: Page fingerprints to update in place
+        """
+        missing = [fp for fp in fingerprints if fp.perceptual_hash is None]
+        if not missing:
+            return
+
+        paths = [fp.file_path for fp in missing]
+        if len(missing) < MIN_PARALLEL_PAGES or self.max_workers == 1:
+            signatures = [compute_signature(path) for path in paths]
+        else:
+            with ProcessPoolExecutor(max_workers=self.max_workers) as pool:
+                signatures = list(pool.map(compute_signature, paths, chunksize=8))
+
+        for fp, (ink_coverage, perceptual_hash) in zip(missing, signatures):
+            fp.ink_coverage = ink_coverage
+            fp.perceptual_hash = perceptual_hash
+
+    def _is_duplicate(self, page: PageFingerprint, original: PageFingerprint) -> bool:
+        """Confirm a hash candidate by comparing thumbnails."""
+        if page.content_hash and page.content_hash == original.content_hash:
+            return True  # Byte-identical files need no decode
+        for fp in (page, original):
+            if fp.file_path not in self._thumbnails:
+                self._thumbnails[fp.file_path] = _thumbnail(fp.file_path)
+        return (
+            changed_fraction(
+                self._thumbnails[page.file_path], self._thumbnails[original.file_path]
+            )
+            <= self.max_pixel_diff
+        )
+
+    def plan(
+        self,
+        manifest: List[PageFingerprint],
+        pages: List[int],
+        known: Optional[List[int]] = None,
+    ) -> FilterPlan:
+        """
+        Decide which pages need a vision call.
+
+        Args:
+            manifest: Fingerprints of all current pages (signatures are
+                filled in as needed)
+            pages: Page numbers this run would analyze, in order
+            known: Page numbers that already have an analysis and may be
+                reused by duplicates
+
+        Returns:
+            FilterPlan for ``pages``
+        """
+        by_page = {fp.page_number: fp for fp in manifest}
+        known = [p for p in known or [] if p in by_page]
+        candidates = [by_page[p] for p in known + list(pages)]
+        self.ensure_signatures(candidates)
+
+        distances = hamming_matrix([fp.perceptual_hash for fp in candidates])
+        index = {fp.page_number: i for i, fp in enumerate(candidates)}
+
+        plan = FilterPlan()
+        originals = [index[p] for p in known]
+        for page_number in pages:
+            fp = by_page[page_number]
+            if fp.ink_coverage < self.blank_threshold:
+                plan.blank.append(page_number)
+                continue
+
+            i = index[page_number]
+            nearby = sorted(
+                (j for j in originals if distances[i, j] <= self.hash_distance),
+                key=lambda j: distances[i, j],
+            )
+            match = next(
+                (j for j in nearby if self._is_duplicate(fp, candidates[j])), None
+            )
+            if match is None:
+                plan.to_analyze.append(page_number)
+                originals.append(i)
+            else:
+                plan.duplicates[page_number] = candidates[match].page_number
+
+        return plan
+
+    def blank_analyses(
+        self, plan: FilterPlan, manifest: List[PageFingerprint]
+    ) -> List[PageAnalysis]:
+        """
+        Build the analyses of the pages a plan marked blank.
+
+        Args:
+            plan: FilterPlan from ``plan``
+            manifest: Fingerprints of the current pages
+
+        Returns:
+            One PageAnalysis per blank page
+        """
+        coverage = {fp.page_number: fp.ink_coverage for fp in manifest}
+        return [
+            PageAnalysis(
+                page_number=page_number,
+                content_type="blank",
+                summary="Blank page (detected locally, not sent for analysis)",
+                notes=f"Ink coverage {coverage[page_number]:.2%}",
+                analyzed_by="local",
+            )
+            for page_number in plan.blank
+        ]
+
+    def duplicate_analyses(
+        self, plan: FilterPlan, analyses: Dict[int, PageAnalysis]
+    ) -> List[PageAnalysis]:
+        """
+        Copy analyses onto the pages a plan marked as near-duplicates.
+
+        A failed analysis (content type "error") is not copied, so one
+        failed call does not turn into several error pages; duplicates of
+        a failed page are left to be analyzed on their own.
+
+        Args:
+            plan: FilterPlan from ``plan``
+            analyses: Available analyses by page number
+
+        Returns:
+            One PageAnalysis per duplicate whose original was analyzed
+            successfully
+        """
+        copies = []
+        for page_number, original in plan.duplicates.items():
+            analysis = analyses.get(original)
+            if analysis is None or analysis.content_type == "error":
+                continue
+            note = f"Reused analysis of near-duplicate page {original}."
+            copies.append(
+                analysis.model_copy(
+                    update={
+                        "page_number": page_number,
+                        "notes": f"{analysis.notes} {note}".strip(),
+                    }
+                )
+            )
+        return copies
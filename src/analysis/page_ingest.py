@@ -0,0 +1,478 @@
+"""Normalize a folder of raw page scans or photos into page_NNN.png files."""
+
+import hashlib
+import io
+import json
+import os
+import re
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+import numpy as np
+from PIL import Image, ImageOps
+from pydantic import BaseModel, Field
+
+from ..config import get_settings
+from ..models import PageFingerprint
+
+# File extensions picked up from the source folder
+SOURCE_EXTENSIONS = {".png", ".jpg", ".jpeg", ".tif", ".tiff", ".bmp", ".webp"}
+# Name of the manifest written next to the normalized pages
+INGEST_MANIFEST = "ingest_manifest.json"
+# Long edge of the grayscale working image used to find skew and margins
+WORK_SIZE = 800
+# Step between candidate skew angles, in degrees
+SKEW_STEP = 0.1
+# Skew below this many degrees is left alone (rotating blurs the page)
+MIN_SKEW = 0.15
+# Gray levels below the page background for a pixel to count as ink
+INK_CONTRAST = 60
+# Fraction of a row or column that must be ink for it to bound the content
+MIN_EDGE_INK = 0.002
+# Border kept around the content when cropping, as a fraction of the long edge
+CROP_PADDING = 0.02
+# zlib level for output pages; above 3 costs much more time than it saves bytes
+PNG_COMPRESS_LEVEL = 3
+# Fewest digits in output page numbers (page_001.png)
+MIN_PAGE_DIGITS = 3
+# Output page file names, with the page number as the only group
+PAGE_NAME = re.compile(r"^page_(\d+)\.png$")
+
+
+class NormalizeOptions(BaseModel):
+    """Settings passed to each normalization worker."""
+
+    max_long_edge: int
+    deskew: bool = True
+    max_skew: float = 5.0
+    trim_margins: bool = True
+
+
+class IngestRecord(BaseModel):
+    """One normalized page and the source file it came from."""
+
+    source_path: Path
+    source_size: int
+    source_mtime: float
+    skew_degrees: float = Field(default=0.0, description="Rotation applied to deskew")
+    page: PageFingerprint
+
+
+class IngestResult(BaseModel):
+    """Outcome of normalizing a source folder."""
+
+    records: List[IngestRecord] = Field(default_factory=list)
+    written: int = 0
+    reused: int = 0
+    removed: List[Path] = Field(
+        default_factory=list, description="Stale pages from a previous ingest"
+    )
+    failed: Dict[str, str] = Field(
+        default_factory=dict, description="Source path -> error message"
+    )
+    workers: int = 1
+    seconds: float = 0.0
+
+    @property
+    def images_per_second(self) -> float:
+        """Throughput over the images actually normalized this run."""
+        return self.written / self.seconds if self.seconds else 0.0
+
+
+def _natural_key(path: Path):
+    """Sort key that orders ``scan2`` before ``scan10``."""
+    return [int(part) if part.isdigit() else part.lower() for part in re.split(r"(\d+)", path.name)]
+
+
+def find_sources(source_dir: Path) -> List[Path]:
+    """
+    List the image files of a source folder in natural name order.
+
+    Args:
+        source_dir: Folder of raw scans or photos
+
+    Returns:
+        Image paths, ``scan2.jpg`` sorted before ``scan10.jpg``
+    """
+    files = [
+        path
+        for path in source_dir.iterdir()
+        if path.is_file() and path.suffix.lower() in SOURCE_EXTENSIONS
+    ]
+    return sorted(files, key=_natural_key)
+
+
+def _ink_mask(gray: np.ndarray) -> np.ndarray:
+    """Pixels well below the page's background brightness (90th percentile)."""
+    background = np.percentile(gray, 90)
+    return gray < background - INK_CONTRAST
+
+
+def estimate_skew(gray: np.ndarray, max_skew: float) -> float:
+    """
+    Estimate page skew by projection profile.
+
+    Ink pixels are sheared by each candidate angle and binned into rows;
+    text lines and ruled lines line up into sharp peaks at the true angle,
+    which maximizes the variance of the row profile.
+
+    Args:
+        gray: Grayscale page as a 2-D array
+        max_skew: Largest angle to try, in degrees either way
+
+    Returns:
+        Counter-clockwise rotation in degrees that straightens the page
+    """
+    ys, xs = np.nonzero(_ink_mask(gray))
+    if len(ys) < 100:
+        return 0.0
+
+    height = gray.shape[0]
+    xs = xs - gray.shape[1] / 2
+    best_angle, best_score = 0.0, -1.0
+    for angle in np.arange(-max_skew, max_skew + SKEW_STEP / 2, SKEW_STEP):
+        rows = np.round(ys + xs * np.tan(np.radians(angle))).astype(np.int64)
+        rows = rows[(rows >= 0) & (rows < height)]
+        score = float(np.bincount(rows, minlength=height).astype(np.float64).var())
+        if score > best_score:
+            best_angle, best_score = float(angle), score
+
+    # Lines flattened by y + x*tan(a) rise to the right: the page was turned
+    # counter-clockwise by a, so turning it back is clockwise
+    return round(-best_angle, 2) + 0.0
+
+
+def content_box(gray: np.ndarray) -> Optional[tuple]:
+    """
+    Bounding box of the page content, ignoring specks.
+
+    Args:
+        gray: Grayscale page as a 2-D array
+
+    Returns:
+        (left, top, right, bottom) in array coordinates, or None if blank
+    """
+    ink = _ink_mask(gray)
+    rows = np.flatnonzero(ink.mean(axis=1) > MIN_EDGE_INK)
+    cols = np.flatnonzero(ink.mean(axis=0) > MIN_EDGE_INK)
+    if len(rows) == 0 or len(cols) == 0:
+        return None
+    return int(cols[0]), int(rows[0]), int(cols[-1]) + 1, int(rows[-1]) + 1
+
+
+def _working_gray(image: Image.Image) -> tuple:
+    """Grayscale copy reduced to about WORK_SIZE, and its scale to full size."""
+    gray = image.convert("L")
+    factor = max(1, max(gray.size) // WORK_SIZE)
+    if factor > 1:
+        gray = gray.reduce(factor)
+    return np.asarray(gray, dtype=np.int16), image.width / gray.width
+
+
+def _write_atomic(data: bytes, destination: Path) -> None:
+    """Write a file via a temporary sibling, so readers never see a partial file."""
+    fd, temp_path = tempfile.mkstemp(
+        dir=destination.parent, prefix=f".{destination.name}.", suffix=".tmp"
+    )
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.replace(temp_path, destination)
+    except BaseException:
+        Path(temp_path).unlink(missing_ok=True)
+        raise
+
+
+def normalize_image(
+    source: Path, destination: Path, page_number: int, options: NormalizeOptions
+) -> IngestRecord:
+    """
+    Rotate, deskew, crop and resize one scan, and write it as PNG.
+
+    Runs in a worker process, so it takes and returns only picklable values.
+
+    Args:
+        source: Raw scan or photo
+        destination: Output ``page_NNN.png`` path
+        page_number: Page number the output is written as
+        options: Normalization settings
+
+    Returns:
+        IngestRecord with the fingerprint of the written page
+    """
+    stat = source.stat()
+    with Image.open(source) as opened:
+        image = ImageOps.exif_transpose(opened).convert("RGB")
+
+    skew = 0.0
+    if options.deskew:
+        gray, _ = _working_gray(image)
+        skew = estimate_skew(gray, options.max_skew)
+        if abs(skew) >= MIN_SKEW:
+            image = image.rotate(
+                skew,
+                resample=Image.Resampling.BICUBIC,
+                expand=True,
+                fillcolor=(255, 255, 255),
+            )
+        else:
+            skew = 0.0
+
+    if options.trim_margins:
+        gray, scale = _working_gray(image)
+        box = content_box(gray)
+        if box is not None:
+            padding = int(max(image.size) * CROP_PADDING)
+            left, top, right, bottom = (int(v * scale) for v in box)
+            image = image.crop(
+                (
+                    max(0, left - padding),
+                    max(0, top - padding),
+                    min(image.width, right + padding),
+                    min(image.height, bottom + padding),
+                )
+            )
+
+    if max(image.size) > options.max_long_edge:
+        image.thumbnail(
+            (options.max_long_edge, options.max_long_edge), Image.Resampling.LANCZOS
+        )
+
+    buffer = io.BytesIO()
+    image.save(buffer, format="PNG", compress_level=PNG_COMPRESS_LEVEL)
+    data = buffer.getvalue()
+    _write_atomic(data, destination)
+
+    written = destination.stat()
+    return IngestRecord(
+        source_path=source,
+        source_size=stat.st_size,
+        source_mtime=stat.st_mtime,
+        skew_degrees=skew,
+        page=PageFingerprint(
+            page_number=page_number,
+            file_path=destination,
+            size=written.st_size,
+            mtime=written.st_mtime,
+            content_hash=hashlib.sha256(data).hexdigest(),
+        ),
+    )
+
+
+def load_ingest_manifest(directory: Path) -> List[IngestRecord]:
+    """
+    Load the manifest a previous ingest wrote into a page directory.
+
+    Page paths are re-rooted onto ``directory``, so the manifest stays valid
+    when the folder is moved.
+
+    Args:
+        directory: Folder of normalized pages
+
+    Returns:
+        Recorded pages, or an empty list if there is no readable manifest
+    """
+    manifest_file = directory / INGEST_MANIFEST
+    if not manifest_file.exists():
+        return []
+    try:
+        raw = json.loads(manifest_file.read_text())
+        records = [IngestRecord.model_validate(item) for item in raw]
+    except (OSError, ValueError):
+        return []
+    for record in records:
+        record.page.file_path = directory / record.page.file_path.name
+    return records
+
+
+def _page_digits(records: List[IngestRecord], sources: int) -> int:
+    """
+    Zero-padding width of the output page numbers.
+
+    A width recorded by the previous ingest is kept, so existing pages keep
+    their names. It only widens when there are more sources than it can
+    number, which renames (and rewrites) every page so that names still
+    sort in page order.
+    """
+    needed = max(MIN_PAGE_DIGITS, len(str(sources)))
+    recorded = [
+        len(match.group(1))
+        for match in (PAGE_NAME.match(r.page.file_path.name) for r in records)
+        if match
+    ]
+    return max([needed, *recorded])
+
+
+def _unchanged(
+    record: IngestRecord, source: Path, page_number: int, destination: Path
+) -> bool:
+    """Whether a recorded page is still current for this source and number."""
+    page = record.page.file_path
+    if record.page.page_number != page_number or page.name != destination.name:
+        return False
+    if not page.exists():
+        return False
+    stat, written = source.stat(), page.stat()
+    return (
+        (stat.st_size, stat.st_mtime) == (record.source_size, record.source_mtime)
+        and (written.st_size, written.st_mtime) == (record.page.size, record.page.mtime)
+    )
+
+
+class PageIngester:
+    """
+    Normalizes raw scans into the ``page_NNN.png`` files analysis expects.
+
+    Images are processed in parallel worker processes, each written
+    atomically. A manifest of the written pages' content hashes is saved
+    alongside them: re-running ingest skips sources that have not changed,
+    and ``analyze`` reuses the hashes instead of reading every page again.
+    """
+
+    def __init__(
+        self,
+        max_long_edge: Optional[int] = None,
+        deskew: Optional[bool] = None,
+        max_skew: Optional[float] = None,
+        trim_margins: Optional[bool] = None,
+        max_workers: Optional[int] = None,
+    ):
+        """
+        Initialize the ingester.
+
+        Args:
+            max_long_edge: Longest side of the output pages in pixels.
+                If None, uses config settings.
+            deskew: Straighten rotated scans. If None, uses config settings.
+            max_skew: Largest skew corrected, in degrees. If None, uses
+                config settings.
+            trim_margins: Crop to the page content. If None, uses config
+                settings.
+            max_workers: Worker processes. If None, uses the CPU count.
+        """
+        settings = get_settings()
+        self.options = NormalizeOptions(
+            max_long_edge=max_long_edge or settings.ingest_max_long_edge,
+            deskew=settings.ingest_deskew if deskew is None else deskew,
+            max_skew=settings.ingest_max_skew_degrees if max_skew is None else max_skew,
+            trim_margins=(
+                settings.ingest_trim_margins if trim_margins is None else trim_margins
+            ),
+        )
+        self.max_workers = max_workers or os.cpu_count() or 1
+
+    def ingest(
+        self,
+        source_dir: Path,
+        output_dir: Path,
+        force: bool = False,
+        on_progress: Optional[Callable[[], None]] = None,
+    ) -> IngestResult:
+        """
+        Normalize every image in a folder into numbered pages.
+
+        Sources are numbered in natural name order. Pages left over from a
+        previous ingest into the same folder that are no longer produced
+        are removed. ``page_NNN.png`` files the previous ingest did not
+        write (e.g. hand-exported pages) would mix with the new ones, so
+        the folder is refused unless ``force`` is set, in which case they
+        are replaced too. Other files in the folder are never touched.
+
+        Args:
+            source_dir: Folder of raw scans or photos
+            output_dir: Folder to write ``page_NNN.png`` files into
+            force: Re-normalize sources even if they are unchanged, and
+                replace page files the previous ingest did not write
+            on_progress: Called once per source as it finishes
+
+        Returns:
+            IngestResult with the manifest records and timing
+
+        Raises:
+            FileExistsError: If ``output_dir`` holds page files the
+                previous ingest did not write and ``force`` is not set
+        """
+        sources = find_sources(source_dir.resolve())
+        output_dir.mkdir(parents=True, exist_ok=True)
+        manifest = load_ingest_manifest(output_dir)
+        previous = {str(r.source_path): r for r in manifest}
+        recorded = {r.page.file_path.name for r in manifest}
+        foreign = sorted(
+            path
+            for path in output_dir.iterdir()
+            if PAGE_NAME.match(path.name) and path.name not in recorded
+        )
+        if foreign and not force:
+            raise FileExistsError(
+                f"{output_dir} already holds {len(foreign)} page files that were not "
+                f"written by ingest (e.g. {foreign[0].name})"
+            )
+        digits = _page_digits(manifest, len(sources))
+
+        result = IngestResult(workers=self.max_workers)
+        records: Dict[int, IngestRecord] = {}
+        jobs = []
+        for page_number, source in enumerate(sources, start=1):
+            record = previous.get(str(source))
+            destination = output_dir / f"page_{page_number:0{digits}d}.png"
+            if not force and record and _unchanged(record, source, page_number, destination):
+                records[page_number] = record
+                result.reused += 1
+                if on_progress:
+                    on_progress()
+                continue
+            jobs.append((source, destination, page_number))
+
+        start = time.perf_counter()
+        if len(jobs) <= 1 or self.max_workers == 1:
+            for source, destination, page_number in jobs:
+                try:
+                    records[page_number] = normalize_image(
+                        source, destination, page_number, self.options
+                    )
+                except Exception as e:
+                    result.failed[str(source)] = str(e)
+                if on_progress:
+                    on_progress()
+        else:
+            with ProcessPoolExecutor(max_workers=self.max_workers) as pool:
+                futures = {
+                    pool.submit(
+                        normalize_image, source, destination, page_number, self.options
+                    ): (source, page_number)
+                    for source, destination, page_number in jobs
+                }
+                for future in as_completed(futures):
+                    source, page_number = futures[future]
+                    try:
+                        records[page_number] = future.result()
+                    except Exception as e:
+                        result.failed[str(source)] = str(e)
+                    if on_progress:
+                        on_progress()
+        result.seconds = time.perf_counter() - start
+        result.written = len(jobs) - len(result.failed)
+        result.records = [records[n] for n in sorted(records)]
+
+        # A source that failed this time keeps the page it was last written as
+        current = {r.page.file_path.name for r in result.records} | {
+            previous[source].page.file_path.name
+            for source in result.failed
+            if source in previous
+        }
+        leftovers = [record.page.file_path for record in previous.values()] + foreign
+        for stale in leftovers:
+            if stale.name not in current and stale.exists():
+                stale.unlink()
+                result.removed.append(stale)
+
+        _write_atomic(
+            json.dumps(
+                [r.model_dump(mode="json") for r in result.records], indent=2
+            ).encode(),
+            output_dir / INGEST_MANIFEST,
+        )
+        return result
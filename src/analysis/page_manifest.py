@@ -0,0 +1,141 @@
+"""Page manifests for incremental re-analysis of a notebook."""
+
+import hashlib
+from pathlib import Path
+from typing import Dict, List, Optional, Set
+
+from pydantic import BaseModel, Field
+
+from ..models import PageAnalysis, PageFingerprint
+
+
+class ManifestDiff(BaseModel):
+    """Differences between the current page set and a previous manifest."""
+
+    reused: Dict[int, int] = Field(
+        default_factory=dict,
+        description="Current page number -> previous page number with identical content",
+    )
+    to_analyze: List[int] = Field(
+        default_factory=list, description="Current page numbers that are new or modified"
+    )
+    removed: List[int] = Field(
+        default_factory=list, description="Previous page numbers no longer present"
+    )
+
+
+def hash_file(file_path: Path) -> str:
+    """Return the SHA-256 hex digest of a file's contents."""
+    digest = hashlib.sha256()
+    with open(file_path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def build_manifest(
+    page_files: List[Path], previous: Optional[List[PageFingerprint]] = None
+) -> List[PageFingerprint]:
+    """
+    Fingerprint page images, numbering them from 1 in the given order.
+
+    A file whose path, size and mtime all match the previous manifest keeps
+    its recorded hash (and local page-filter signature) instead of being
+    read and hashed again.
+
+    Args:
+        page_files: Page image paths in notebook order
+        previous: Manifest from the previous run, if any
+
+    Returns:
+        List of PageFingerprint for the current pages
+    """
+    known = {(str(fp.file_path), fp.size, fp.mtime): fp for fp in previous or []}
+
+    manifest = []
+    for page_number, page_file in enumerate(page_files, start=1):
+        stat = page_file.stat()
+        match = known.get((str(page_file), stat.st_size, stat.st_mtime))
+        manifest.append(
+            PageFingerprint(
+                page_number=page_number,
+                file_path=page_file,
+                size=stat.st_size,
+                mtime=stat.st_mtime,
+                content_hash=match.content_hash if match else hash_file(page_file),
+                ink_coverage=match.ink_coverage if match else None,
+                perceptual_hash=match.perceptual_hash if match else None,
+            )
+        )
+
+    return manifest
+
+
+def diff_manifest(
+    current: List[PageFingerprint],
+    previous: List[PageFingerprint],
+    reusable: Optional[Set[int]] = None,
+) -> ManifestDiff:
+    """
+    Compare the current pages against a previous manifest by content hash.
+
+    Pages are matched on content rather than file name, so renumbered or
+    moved pages are still reused.
+
+    Args:
+        current: Manifest of the current pages
+        previous: Manifest recorded with the previous analysis
+        reusable: Previous page numbers whose analyses may be reused (e.g.
+            excluding pages that failed). If None, all previous pages are.
+
+    Returns:
+        ManifestDiff describing which pages need analysis
+    """
+    previous_by_hash = {
+        fp.content_hash: fp.page_number
+        for fp in previous
+        if reusable is None or fp.page_number in reusable
+    }
+
+    diff = ManifestDiff()
+    for fp in current:
+        previous_page = previous_by_hash.get(fp.content_hash)
+        if previous_page is None:
+            diff.to_analyze.append(fp.page_number)
+        else:
+            diff.reused[fp.page_number] = previous_page
+
+    still_present = set(diff.reused.values())
+    diff.removed = [
+        fp.page_number for fp in previous if fp.page_number not in still_present
+    ]
+    return diff
+
+
+def splice_analyses(
+    diff: ManifestDiff,
+    previous_analyses: List[PageAnalysis],
+    new_analyses: List[PageAnalysis],
+) -> List[PageAnalysis]:
+    """
+    Merge reused and freshly analyzed pages into one list in page order.
+
+    Args:
+        diff: ManifestDiff from ``diff_manifest``
+        previous_analyses: Page analyses from the previous run
+        new_analyses: Analyses of the pages listed in ``diff.to_analyze``
+
+    Returns:
+        PageAnalysis list covering every current page, sorted by page number
+    """
+    previous_by_page = {a.page_number: a for a in previous_analyses}
+
+    spliced = {a.page_number: a for a in new_analyses}
+    for page_number, previous_page in diff.reused.items():
+        analysis = previous_by_page.get(previous_page)
+        if analysis is not None:
+            spliced[page_number] = analysis.model_copy(
+                update={"page_number": page_number}
+            )
+
+    return [spliced[page_number] for page_number in sorted(spliced)]
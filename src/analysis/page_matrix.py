@@ -0,0 +1,139 @@
+"""Page analyses encoded as arrays, so rubric counts come from matrix products."""
+
+from typing import Dict, Iterable, List, Optional
+
+import numpy as np
+from pydantic import BaseModel, Field
+
+from ..models import PageAnalysis
+
+# Content-type substrings counted when the rubric file declares none
+CONTENT_TYPE_MARKERS = ("game_analysis", "build")
+
+
+class CriterionCounts(BaseModel):
+    """What the pages tagged with one criterion add up to."""
+
+    pages: int = Field(default=0, description="Pages tagged with the criterion")
+    key_elements: Dict[str, int] = Field(
+        default_factory=dict, description="Tagged pages showing each key element"
+    )
+    content_types: Dict[str, int] = Field(
+        default_factory=dict,
+        description="Tagged pages whose content type contains each marker",
+    )
+
+
+class PageMatrix:
+    """
+    Page analyses encoded once for counting every criterion together.
+
+    Rows are pages. ``membership`` marks the criteria each page is tagged
+    with, ``flags`` the key elements it shows and ``type_codes`` indexes its
+    content type in ``content_types``. ``features`` puts the element flags,
+    the content-type markers and a column of ones side by side, so
+    ``membership.T @ features`` holds, for every criterion, the tagged pages
+    showing each element, matching each marker, and in total.
+    """
+
+    def __init__(
+        self,
+        page_analyses: List[PageAnalysis],
+        codes: Iterable[str],
+        markers: Iterable[str] = CONTENT_TYPE_MARKERS,
+    ):
+        """
+        Encode page analyses.
+
+        Args:
+            page_analyses: Pages to encode
+            codes: Criterion codes, in column order of ``membership``
+            markers: Content-type substrings to count pages by
+        """
+        self.codes = list(codes)
+        self.markers = list(markers)
+        code_index = {code: i for i, code in enumerate(self.codes)}
+        # Every element name seen counts, even if no page shows it, so
+        # hypothetical pages can be built over the same columns
+        element_index: Dict[str, int] = {}
+        type_index: Dict[str, int] = {}
+
+        member_rows, member_cols, flag_rows, flag_cols = [], [], [], []
+        type_codes = np.empty(len(page_analyses), dtype=np.intp)
+        for row, page in enumerate(page_analyses):
+            for code in page.rubric_categories:
+                col = code_index.get(code)
+                if col is not None:
+                    member_rows.append(row)
+                    member_cols.append(col)
+            for name, found in page.key_elements.items():
+                col = element_index.setdefault(name, len(element_index))
+                if found:
+                    flag_rows.append(row)
+                    flag_cols.append(col)
+            type_codes[row] = type_index.setdefault(page.content_type, len(type_index))
+
+        self.elements = list(element_index)
+        self.content_types = list(type_index)
+        self.type_codes = type_codes
+        self.membership = np.zeros((len(page_analyses), len(self.codes)), dtype=bool)
+        self.membership[
+            np.array(member_rows, dtype=np.intp), np.array(member_cols, dtype=np.intp)
+        ] = True
+        self.flags = np.zeros((len(page_analyses), len(self.elements)), dtype=bool)
+        self.flags[
+            np.array(flag_rows, dtype=np.intp), np.array(flag_cols, dtype=np.intp)
+        ] = True
+
+        markers = np.array(
+            [[m in t.lower() for m in self.markers] for t in self.content_types],
+            dtype=bool,
+        ).reshape(len(self.content_types), len(self.markers))
+        self.features = np.hstack(
+            [
+                self.flags,
+                markers[type_codes],
+                np.ones((len(page_analyses), 1), dtype=bool),
+            ]
+        ).astype(np.float64)
+
+    def __len__(self) -> int:
+        return len(self.type_codes)
+
+    def counts(self, weights: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        Count, per criterion, the tagged pages behind every feature column.
+
+        Args:
+            weights: How many times each page counts (e.g. bootstrap
+                multiplicities). If None, once each.
+
+        Returns:
+            Array of criteria by feature columns
+        """
+        features = self.features if weights is None else self.features * weights[:, None]
+        return self.membership.T.astype(np.float64) @ features
+
+    def ideal_features(self) -> np.ndarray:
+        """Feature row of a page showing every element and matching every marker."""
+        return np.ones(self.features.shape[1])
+
+    def unpack(self, row: np.ndarray) -> CriterionCounts:
+        """
+        Read one criterion's row of ``counts`` back into named counts.
+
+        Args:
+            row: One row of ``counts``, possibly adjusted by feature rows
+
+        Returns:
+            CriterionCounts for the criterion
+        """
+        values = np.rint(row).astype(np.int64).tolist()
+        n = len(self.elements)
+        return CriterionCounts(
+            pages=values[-1],
+            key_elements={
+                name: count for name, count in zip(self.elements, values[:n]) if count
+            },
+            content_types=dict(zip(self.markers, values[n:-1])),
+        )
@@ -0,0 +1,161 @@
+"""Stratified page sampling so a run can report rubric estimates early."""
+
+import random
+from typing import Iterable, List, Optional
+
+from pydantic import BaseModel, Field
+
+# Sampled pages aimed for per stratum, so variation within a stratum shows
+# up in the confidence bounds
+PAGES_PER_STRATUM = 2
+# Seconds between refreshes of the live estimate during a sampled run
+ESTIMATE_INTERVAL = 1.0
+
+
+class SamplePlan(BaseModel):
+    """Order in which to analyze pages so any prefix is a spread-out sample."""
+
+    strata: List[List[int]] = Field(
+        default_factory=list,
+        description="Contiguous runs of page numbers that are sampled separately",
+    )
+    sample: List[int] = Field(
+        default_factory=list, description="Page numbers analyzed first"
+    )
+    order: List[int] = Field(
+        default_factory=list,
+        description="Every page to analyze, sample first, then the remainder",
+    )
+
+
+def _split_sections(pages: List[int], section_starts: Iterable[int]) -> List[List[int]]:
+    """Split pages in notebook order at the pages that begin a section."""
+    starts = set(section_starts)
+    sections: List[List[int]] = []
+    for page in pages:
+        if not sections or page in starts:
+            sections.append([])
+        sections[-1].append(page)
+    return sections
+
+
+def _make_strata(sections: List[List[int]], count: int) -> List[List[int]]:
+    """
+    Cut sections into ``count`` contiguous strata of similar size.
+
+    Sections are never joined unless there are more of them than strata,
+    in which case the smallest neighbouring pair is merged until they fit.
+    """
+    sections = [list(s) for s in sections]
+    while len(sections) > count:
+        i = min(
+            range(len(sections) - 1),
+            key=lambda i: len(sections[i]) + len(sections[i + 1]),
+        )
+        sections[i : i + 2] = [sections[i] + sections[i + 1]]
+
+    # Give each extra stratum to the section whose strata are largest
+    chunks = [1] * len(sections)
+    for _ in range(count - len(sections)):
+        i = max(range(len(sections)), key=lambda i: len(sections[i]) / chunks[i])
+        if len(sections[i]) <= chunks[i]:
+            break
+        chunks[i] += 1
+
+    strata = []
+    for section, parts in zip(sections, chunks):
+        bounds = [round(len(section) * k / parts) for k in range(parts + 1)]
+        strata.extend(section[bounds[k] : bounds[k + 1]] for k in range(parts))
+    return strata
+
+
+def _allocate(sizes: List[int], total: int) -> List[int]:
+    """Split ``total`` across strata in proportion to size (largest remainder)."""
+    weight = sum(sizes)
+    if not weight:
+        return [0] * len(sizes)
+    shares = [total * size / weight for size in sizes]
+    counts = [
+        min(size, max(1, int(share))) if size else 0
+        for size, share in zip(sizes, shares)
+    ]
+    by_remainder = sorted(
+        range(len(sizes)), key=lambda i: shares[i] - int(shares[i]), reverse=True
+    )
+    while sum(counts) < total:
+        open_strata = [i for i in by_remainder if counts[i] < sizes[i]]
+        if not open_strata:
+            break
+        counts[open_strata[0]] += 1
+        by_remainder.remove(open_strata[0])
+        by_remainder.append(open_strata[0])
+    while sum(counts) > total:
+        i = max(range(len(sizes)), key=lambda i: counts[i] - shares[i])
+        counts[i] -= 1
+    return counts
+
+
+def _interleave(groups: List[List[int]]) -> List[int]:
+    """Merge groups so every prefix draws from each in proportion to its size."""
+    keyed = [
+        ((j + 0.5) / len(group), i, page)
+        for i, group in enumerate(groups)
+        for j, page in enumerate(group)
+    ]
+    return [page for _, _, page in sorted(keyed)]
+
+
+def plan_sample(
+    page_numbers: List[int],
+    sample_size: int,
+    section_starts: Optional[Iterable[int]] = None,
+    eligible: Optional[Iterable[int]] = None,
+    seed: Optional[int] = None,
+) -> SamplePlan:
+    """
+    Plan a stratified sample of pages to analyze ahead of the rest.
+
+    Pages are cut into contiguous strata that respect known section
+    boundaries, the sample is allocated to strata in proportion to their
+    size, and pages within a stratum are picked at even spacing from a
+    random offset. The remaining pages follow in an order that keeps every
+    stratum proportionally covered, so the estimate can be refined from any
+    point of the run.
+
+    Args:
+        page_numbers: Every page of the run, including pages already settled
+            (blank, resumed), which count towards their stratum's size
+        sample_size: Pages to analyze first
+        section_starts: Page numbers that begin a notebook section, e.g.
+            from PDF bookmarks
+        eligible: Pages that still need analysis. If None, every page.
+        seed: Random seed for the picks within each stratum
+
+    Returns:
+        SamplePlan with the strata, the sample and the full analysis order
+    """
+    pages = sorted(page_numbers)
+    eligible = set(pages if eligible is None else eligible)
+    rng = random.Random(seed)
+
+    size = min(max(1, sample_size), len(eligible))
+    sections = _split_sections(pages, section_starts or [])
+    strata = _make_strata(sections, max(1, size // PAGES_PER_STRATUM)) if pages else []
+
+    candidates = [[p for p in stratum if p in eligible] for stratum in strata]
+    counts = _allocate([len(c) for c in candidates], size)
+
+    picked, remainder = [], []
+    for stratum_pages, count in zip(candidates, counts):
+        chosen = []
+        if count:
+            step = len(stratum_pages) / count
+            offset = rng.random() * step
+            chosen = [stratum_pages[int(offset + k * step)] for k in range(count)]
+        rest = [p for p in stratum_pages if p not in chosen]
+        rng.shuffle(rest)
+        picked.append(chosen)
+        remainder.append(rest)
+
+    sample = _interleave(picked)
+    return SamplePlan(strata=strata, sample=sample, order=sample + _interleave(remainder))
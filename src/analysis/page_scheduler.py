@@ -0,0 +1,223 @@
+"""Order pages so the ones deciding borderline rubric criteria finish first."""
+
+import time
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from pydantic import BaseModel, Field
+
+from ..models import (
+    NotebookAnalysis,
+    PageAnalysis,
+    PageFingerprint,
+    ProgressSnapshot,
+)
+from .rubric_matcher import RubricMatcher
+from .scoring_state import ScoringState
+
+# Criteria whose running scores are watched for the time-to-stable metric
+STABLE_CRITERIA = ("EN1", "EN2", "EN3", "EN4")
+# A criterion this many pages or fewer from a score change is borderline
+THRESHOLD_MARGIN = 2
+# Weight a borderline criterion gets on top of its missing points
+BORDERLINE_WEIGHT = 2.0
+# Criteria a previous content type points to, for pages the previous run
+# did not tag with them
+CONTENT_TYPE_CRITERIA = {
+    "game_analysis": ["EN1"],
+    "brainstorming": ["EN4"],
+    "design": ["EN4", "EN7"],
+    "build_documentation": ["EN5"],
+    "programming": ["EN5"],
+    "testing": ["EN6"],
+    "meeting_notes": ["EN8"],
+    "appendix": ["EN10"],
+}
+
+
+class SchedulePlan(BaseModel):
+    """Priority order of a run's pages, from the previous run's analyses."""
+
+    weights: Dict[str, float] = Field(
+        default_factory=dict, description="Priority weight of each criterion"
+    )
+    borderline: List[str] = Field(
+        default_factory=list,
+        description=f"Criteria within {THRESHOLD_MARGIN} pages of a score change",
+    )
+    priorities: Dict[int, float] = Field(
+        default_factory=dict, description="Priority of each page number"
+    )
+    order: List[int] = Field(
+        default_factory=list, description="Page numbers, highest priority first"
+    )
+
+
+def page_criteria(analysis: PageAnalysis) -> List[str]:
+    """Criteria a previous analysis ties a page to, by tag or content type."""
+    criteria = set(analysis.rubric_categories)
+    criteria.update(CONTENT_TYPE_CRITERIA.get(analysis.content_type, []))
+    return sorted(criteria)
+
+
+def plan_schedule(
+    page_numbers: List[int],
+    previous: Dict[int, PageAnalysis],
+    scores: Dict[str, int],
+    margins: Dict[str, int],
+) -> SchedulePlan:
+    """
+    Rank pages by how much their results can move the weakest criteria.
+
+    A criterion weighs its missing points (3 minus its score), plus
+    ``BORDERLINE_WEIGHT`` when it is within ``THRESHOLD_MARGIN`` pages of a
+    score change. A page's priority is the total weight of the criteria its
+    previous analysis ties it to, and ties go to the page that showed more
+    key elements. Pages without a usable previous analysis
+    (new pages, or pages that failed last time) get the mean priority, so
+    they are neither starved nor put ahead of known-relevant pages.
+
+    Args:
+        page_numbers: Pages to analyze in this run
+        previous: Previous analysis of each page, by current page number
+        scores: Last known 0-3 score of each criterion
+        margins: Pages away from a score change, from
+            ``RubricMatcher.score_margins``
+
+    Returns:
+        SchedulePlan with the run's pages in priority order
+    """
+    borderline = sorted(
+        (code for code, margin in margins.items() if margin <= THRESHOLD_MARGIN),
+        key=lambda code: int(code[2:]),
+    )
+    weights = {
+        code: 3 - score + (BORDERLINE_WEIGHT if code in borderline else 0.0)
+        for code, score in scores.items()
+    }
+
+    priorities = {}
+    evidence = {}
+    for page_number in page_numbers:
+        analysis = previous.get(page_number)
+        if analysis is not None and analysis.content_type != "error":
+            priorities[page_number] = sum(
+                weights.get(code, 0.0) for code in page_criteria(analysis)
+            )
+            evidence[page_number] = sum(map(bool, analysis.key_elements.values()))
+
+    known = list(priorities.values())
+    fallback = sum(known) / len(known) if known else 0.0
+    for page_number in page_numbers:
+        priorities.setdefault(page_number, fallback)
+
+    # Among equal priorities, pages showing more key elements go first
+    order = sorted(
+        page_numbers,
+        key=lambda page: (-priorities[page], -evidence.get(page, 0), page),
+    )
+    return SchedulePlan(
+        weights=weights, borderline=borderline, priorities=priorities, order=order
+    )
+
+
+class ScoreTimeline:
+    """
+    Running scores of a few criteria as a run's pages finish.
+
+    Used to measure how soon the watched criteria reach the scores the run
+    ends with, counting only pages analyzed or settled so far. Only the
+    running counts and the points where the watched scores changed are
+    kept, so memory stays flat however many pages finish.
+    """
+
+    def __init__(
+        self,
+        matcher: RubricMatcher,
+        known: Iterable[PageAnalysis] = (),
+        criteria: Tuple[str, ...] = STABLE_CRITERIA,
+    ):
+        """
+        Start a timeline.
+
+        Args:
+            matcher: Matcher that scores the criteria
+            known: Analyses settled before the run's first request
+                (reused, resumed or blank pages)
+            criteria: Criterion codes to watch
+        """
+        self.matcher = matcher
+        self.criteria = criteria
+        self.state = ScoringState(matcher, known)
+        self.started = time.perf_counter()
+        self.finished = 0
+        # (seconds, pages finished, watched scores) where the scores changed
+        self.changes: List[Tuple[float, int, Tuple[int, ...]]] = []
+
+    def record(self, analysis: PageAnalysis) -> None:
+        """Add a finished page and note the watched criteria's scores if they moved."""
+        self.state.add_page(analysis)
+        self.finished += 1
+        scores = self.state.scores(self.criteria)
+        watched = tuple(scores[code].score for code in self.criteria)
+        if not self.changes or self.changes[-1][2] != watched:
+            self.changes.append((time.perf_counter() - self.started, self.finished, watched))
+
+    def time_to_stable(self) -> Optional[Tuple[float, int]]:
+        """
+        When the watched scores last changed.
+
+        Returns:
+            Tuple of (seconds, pages finished) at the first point from which
+            the scores never changed again, or None if no page finished
+        """
+        if not self.changes:
+            return None
+        seconds, pages, _ = self.changes[-1]
+        return seconds, pages
+
+
+def schedule_from_previous(
+    page_numbers: List[int],
+    manifest: List[PageFingerprint],
+    last_run: NotebookAnalysis,
+    matcher: RubricMatcher,
+    snapshot: Optional[ProgressSnapshot] = None,
+) -> SchedulePlan:
+    """
+    Plan a run's page order from the last saved analysis.
+
+    Pages are matched to their previous analysis by content hash, falling
+    back to the same page number for modified pages. Criterion scores come
+    from the latest progress snapshot when it is newer than the analysis.
+
+    Args:
+        page_numbers: Pages to analyze in this run
+        manifest: Fingerprints of the current pages
+        last_run: Last saved notebook analysis
+        matcher: Matcher used to find borderline criteria
+        snapshot: Latest ProgressTracker snapshot, if any
+
+    Returns:
+        SchedulePlan with the run's pages in priority order
+    """
+    previous_by_page = {a.page_number: a for a in last_run.page_analyses}
+    previous_by_hash = {
+        fp.content_hash: previous_by_page[fp.page_number]
+        for fp in last_run.page_manifest
+        if fp.page_number in previous_by_page
+    }
+    previous = {}
+    for fp in manifest:
+        analysis = previous_by_hash.get(fp.content_hash) or previous_by_page.get(
+            fp.page_number
+        )
+        if analysis is not None:
+            previous[fp.page_number] = analysis
+
+    if snapshot is not None and snapshot.timestamp > last_run.analysis_date:
+        scores = dict(snapshot.rubric_scores)
+    else:
+        scores = {code: s["score"] for code, s in last_run.rubric_scores.items()}
+
+    margins = matcher.score_margins(last_run.page_analyses, limit=THRESHOLD_MARGIN)
+    return plan_schedule(page_numbers, previous, scores, margins)
@@ -0,0 +1,258 @@
+"""Read notebook pages straight from an exported PDF, one page at a time."""
+
+import hashlib
+import threading
+from pathlib import Path
+from typing import List, Optional
+
+from PIL import Image
+
+from ..config import get_settings
+from ..models import NotebookPage, PageFingerprint
+
+# Pages whose pictures cover more than this fraction are sent as images
+MAX_PICTURE_FRACTION = 0.02
+# Pages with more vector paths than this (CAD exports, charts) are sent as images
+MAX_VECTOR_PATHS = 200
+# Points per inch in PDF user space
+POINTS_PER_INCH = 72
+# Long edge, in pixels, of the grayscale render a page's fingerprint hashes
+FINGERPRINT_LONG_EDGE = 256
+
+# PDFium is not thread-safe, not even across separate documents
+_PDFIUM_LOCK = threading.Lock()
+
+
+def _pdfium():
+    """Import pypdfium2 on first use, so image-only installs don't need it."""
+    try:
+        import pypdfium2
+    except ImportError as e:
+        raise ImportError(
+            "Reading PDF notebooks requires pypdfium2 (pip install pypdfium2)"
+        ) from e
+    return pypdfium2
+
+
+class PdfNotebook:
+    """
+    An exported notebook PDF whose pages are rasterized on demand.
+
+    Only the page being rendered is held in memory: the document is read
+    from disk by PDFium as pages are loaded, and each page is closed as
+    soon as its image or text has been taken.
+    """
+
+    def __init__(self, pdf_path: Path, min_text_chars: Optional[int] = None):
+        """
+        Open a PDF notebook.
+
+        Args:
+            pdf_path: Path to the PDF file
+            min_text_chars: Non-whitespace characters a page's text layer
+                needs to be used instead of its image. If None, uses config
+                settings.
+        """
+        settings = get_settings()
+        self.pdf_path = pdf_path
+        self.min_text_chars = (
+            settings.pdf_min_text_chars if min_text_chars is None else min_text_chars
+        )
+        pdfium = _pdfium()
+        with _PDFIUM_LOCK:
+            self._document = pdfium.PdfDocument(str(pdf_path))
+            self.page_count = len(self._document)
+
+    def __len__(self) -> int:
+        return self.page_count
+
+    def pages(self, indices: Optional[List[int]] = None) -> List[NotebookPage]:
+        """
+        Build NotebookPages for the given pages without rendering them.
+
+        Args:
+            indices: Zero-based page indices. If None, every page.
+
+        Returns:
+            NotebookPages numbered by their page in the PDF
+        """
+        if indices is None:
+            indices = range(self.page_count)
+        return [
+            NotebookPage(page_number=i + 1, file_path=self.pdf_path, pdf_page_index=i)
+            for i in indices
+        ]
+
+    def render(self, index: int, max_long_edge: int) -> Image.Image:
+        """
+        Rasterize one page so its long edge is ``max_long_edge`` pixels.
+
+        Args:
+            index: Zero-based page index
+            max_long_edge: Long edge of the rendered image in pixels
+
+        Returns:
+            RGB image of the page
+        """
+        with _PDFIUM_LOCK:
+            page = self._document[index]
+            try:
+                width, height = page.get_size()
+                scale = max_long_edge / max(width, height)
+                bitmap = page.render(scale=scale)
+                # Copy out of PDFium's buffer before the bitmap is freed
+                image = bitmap.to_pil().convert("RGB")
+                bitmap.close()
+            finally:
+                page.close()
+        return image
+
+    def fingerprint(self, index: int) -> str:
+        """
+        Hash what a page shows, independent of the rest of the file.
+
+        The page's text layer and a small grayscale render are hashed
+        together, so re-exporting the notebook with one page edited only
+        changes that page's fingerprint.
+
+        Args:
+            index: Zero-based page index
+
+        Returns:
+            Hex SHA-256 of the page's text and rendered pixels
+        """
+        with _PDFIUM_LOCK:
+            page = self._document[index]
+            try:
+                textpage = page.get_textpage()
+                try:
+                    text = textpage.get_text_range()
+                finally:
+                    textpage.close()
+                width, height = page.get_size()
+                bitmap = page.render(
+                    scale=FINGERPRINT_LONG_EDGE / max(width, height), grayscale=True
+                )
+                pixels = bitmap.to_pil().convert("L").tobytes()
+                bitmap.close()
+            finally:
+                page.close()
+
+        digest = hashlib.sha256(text.encode())
+        digest.update(pixels)
+        return digest.hexdigest()
+
+    def text_layer(self, index: int) -> Optional[str]:
+        """
+        Extract a page's text if it can stand in for the page image.
+
+        A page qualifies when it has at least ``min_text_chars`` characters
+        of real text and little else: scanned pages (text from OCR over a
+        full-page picture), photos and vector drawings are left to the
+        vision model.
+
+        Args:
+            index: Zero-based page index
+
+        Returns:
+            The page text, or None if the page should be sent as an image
+        """
+        pdfium = _pdfium()
+        with _PDFIUM_LOCK:
+            page = self._document[index]
+            try:
+                textpage = page.get_textpage()
+                try:
+                    text = textpage.get_text_range()
+                finally:
+                    textpage.close()
+                if len("".join(text.split())) < self.min_text_chars:
+                    return None
+
+                width, height = page.get_size()
+                picture_area = 0.0
+                paths = 0
+                for obj in page.get_objects(
+                    filter=[pdfium.raw.FPDF_PAGEOBJ_IMAGE, pdfium.raw.FPDF_PAGEOBJ_PATH]
+                ):
+                    if obj.type == pdfium.raw.FPDF_PAGEOBJ_PATH:
+                        paths += 1
+                    else:
+                        left, bottom, right, top = obj.get_pos()
+                        picture_area += max(0.0, right - left) * max(0.0, top - bottom)
+            finally:
+                page.close()
+
+        if picture_area / (width * height) > MAX_PICTURE_FRACTION:
+            return None
+        if paths > MAX_VECTOR_PATHS:
+            return None
+        return text.strip()
+
+    def section_starts(self) -> List[int]:
+        """
+        Find where the notebook's sections begin from the PDF bookmarks.
+
+        Returns:
+            Sorted page numbers that a bookmark points to (empty when the
+            PDF has no outline)
+        """
+        starts = set()
+        with _PDFIUM_LOCK:
+            for bookmark in self._document.get_toc():
+                dest = bookmark.get_dest()
+                index = dest.get_index() if dest is not None else None
+                if index is not None:
+                    starts.add(index + 1)
+        return sorted(starts)
+
+    def close(self) -> None:
+        """Release the document."""
+        with _PDFIUM_LOCK:
+            self._document.close()
+
+
+def pdf_manifest(
+    notebook: PdfNotebook,
+    indices: List[int],
+    previous: Optional[List[PageFingerprint]] = None,
+) -> List[PageFingerprint]:
+    """
+    Fingerprint pages of a PDF notebook.
+
+    Each page is hashed from its own text and a small render (see
+    ``PdfNotebook.fingerprint``), so re-exporting the notebook with one
+    page edited only marks that page as modified. Pages are fingerprinted
+    again only when the file's size or mtime changed since the previous
+    manifest.
+
+    Args:
+        notebook: Open PDF notebook
+        indices: Zero-based page indices to fingerprint
+        previous: Manifest from the previous run, if any
+
+    Returns:
+        List of PageFingerprint, numbered by page in the PDF
+    """
+    pdf_path = notebook.pdf_path
+    stat = pdf_path.stat()
+    known = {
+        (str(fp.file_path), fp.size, fp.mtime, fp.page_number): fp
+        for fp in previous or []
+    }
+
+    manifest = []
+    for index in indices:
+        page_number = index + 1
+        match = known.get((str(pdf_path), stat.st_size, stat.st_mtime, page_number))
+        content_hash = match.content_hash if match else notebook.fingerprint(index)
+        manifest.append(
+            PageFingerprint(
+                page_number=page_number,
+                file_path=pdf_path,
+                size=stat.st_size,
+                mtime=stat.st_mtime,
+                content_hash=content_hash,
+            )
+        )
+    return manifest
@@ -2,14 +2,24 @@
 
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, List
+from typing import Dict, List, Optional
 
 from rich.console import Console
 from rich.table import Table
 from rich.panel import Panel
 from rich.text import Text
 
-from ..models import NotebookAnalysis, PageAnalysis, RubricScore, RubricStatus
+from ..llm.metrics import CallMetric, summarize
+from ..models import (
+    NotebookAnalysis,
+    NotebookEstimate,
+    PageAnalysis,
+    RubricScore,
+    RubricStatus,
+)
+from .page_scheduler import SchedulePlan, ScoreTimeline
+from .score_simulator import SimulationResult, notebook_status
+from .vision_analyzer import CascadeStats, ParseStats, PipelineStats
 
 
 class ReportGenerator:
@@ -93,16 +103,8 @@ class ReportGenerator:
 
     def _print_overall_status(self, rubric_scores: Dict[str, RubricScore]) -> None:
         """Print overall notebook status."""
-        # Check Fully Developed status
-        en1_4_scores = [
-            rubric_scores.get(f"EN{i}").score for i in range(1, 5)
-            if f"EN{i}" in rubric_scores
-        ]
-        fully_developed = all(score >= 2 for score in en1_4_scores)
-
-        # Calculate average score
-        scores = [s.score for s in rubric_scores.values()]
-        avg_score = sum(scores) / len(scores) if scores else 0
+        # Check Fully Developed status and the average score
+        fully_developed, avg_score, excellence_ready = notebook_status(rubric_scores)
 
         # Determine color
         status_color = "green" if fully_developed else "red"
@@ -118,8 +120,8 @@ class ReportGenerator:
             style="bold",
         )
         status_text.append(
-            f"  Excellence Award Ready: {fully_developed and avg_score >= 2.5}\n",
-            style=f"bold {'green' if (fully_developed and avg_score >= 2.5) else 'red'}",
+            f"  Excellence Award Ready: {excellence_ready}\n",
+            style=f"bold {'green' if excellence_ready else 'red'}",
         )
 
         self.console.print(status_text)
@@ -165,6 +167,314 @@ class ReportGenerator:
         for i, rec in enumerate(recommendations, 1):
             self.console.print(f"  {i}. {rec}")
 
+    def generate_metrics_report(self, metrics: List[CallMetric], top_n: int = 5) -> None:
+        """
+        Print latency, token and cost totals for model calls.
+
+        Args:
+            metrics: Call metrics to report
+            top_n: Number of slowest and most expensive calls to list
+        """
+        if not metrics:
+            return
+
+        groups: Dict[str, List[CallMetric]] = {}
+        for metric in metrics:
+            groups.setdefault(metric.tag, []).append(metric)
+
+        table = Table(title="\nModel Calls", show_header=True)
+        table.add_column("Call", style="cyan")
+        table.add_column("Calls", justify="right")
+        table.add_column("Errors", justify="right")
+        table.add_column("Retries", justify="right")
+        table.add_column("p50 s", justify="right")
+        table.add_column("p95 s", justify="right")
+        table.add_column("Avg queue s", justify="right")
+        table.add_column("Upload MB", justify="right")
+        table.add_column("Tokens in/out", justify="right")
+        table.add_column("Cost", justify="right")
+
+        for tag, group in sorted(groups.items()) + [("total", metrics)]:
+            summary = summarize(group)
+            table.add_row(
+                f"[bold]{tag}[/bold]" if tag == "total" else tag,
+                str(summary.calls),
+                str(summary.errors),
+                str(summary.attempts - summary.calls),
+                f"{summary.wall_p50:.1f}",
+                f"{summary.wall_p95:.1f}",
+                f"{summary.mean_queue_seconds:.1f}",
+                f"{summary.request_bytes / 1e6:.1f}",
+                f"{summary.prompt_tokens:,}/{summary.completion_tokens:,}",
+                f"${summary.cost_usd:.2f}",
+            )
+
+        self.console.print(table)
+
+        total = summarize(metrics)
+        if total.hedged:
+            self.console.print(
+                f"\n[bold]Hedging:[/bold] {total.hedged} of {total.calls} calls hedged "
+                f"({total.hedged / total.calls:.1%}), duplicate answered first in "
+                f"{total.hedge_won}; p99 {total.wall_p99:.1f}s vs "
+                f"~{total.unhedged_p99:.1f}s estimated without hedging; "
+                f"{total.hedge_tokens:,} extra tokens reserved"
+            )
+
+        def describe(metric: CallMetric) -> str:
+            if not metric.pages:
+                return metric.tag
+            label = "page" if len(metric.pages) == 1 else "pages"
+            return f"{label} {', '.join(map(str, metric.pages))}"
+
+        slowest = sorted(metrics, key=lambda m: m.wall_seconds, reverse=True)[:top_n]
+        self.console.print(
+            "\n[bold]Slowest calls:[/bold] "
+            + "; ".join(f"{describe(m)} ({m.wall_seconds:.1f}s)" for m in slowest)
+        )
+
+        priced = [m for m in metrics if m.cost_usd is not None]
+        if priced:
+            costliest = sorted(priced, key=lambda m: m.cost_usd, reverse=True)[:top_n]
+            self.console.print(
+                "[bold]Most expensive calls:[/bold] "
+                + "; ".join(f"{describe(m)} (${m.cost_usd:.3f})" for m in costliest)
+            )
+
+    def generate_pipeline_report(self, stats: PipelineStats) -> None:
+        """
+        Print how busy each analysis pipeline stage was.
+
+        Args:
+            stats: Stage timings of the run
+        """
+        if not stats.wall_seconds:
+            return
+
+        self.console.print(
+            f"\n[bold]Pipeline:[/bold] {stats.reader_workers} reader threads "
+            f"{stats.reader_utilization:.0%} busy, {stats.reader_blocked:.0%} waiting for "
+            f"queue space; {stats.network_workers} network workers "
+            f"{stats.network_utilization:.0%} busy, {stats.network_starved:.0%} waiting "
+            f"for pages"
+        )
+        self.console.print(
+            f"Queue depth: mean {stats.mean_queue_depth:.1f}, max {stats.depth_max} "
+            f"of {stats.queue_size}; bottleneck: {stats.bottleneck}"
+        )
+
+    def generate_parse_report(self, metrics: List[CallMetric], stats: ParseStats) -> None:
+        """
+        Print how many page responses failed to parse and their token cost.
+
+        Args:
+            metrics: Call metrics of the run
+            stats: Parse counts of the run
+        """
+        if not stats.parsed:
+            return
+
+        if stats.structured:
+            outcome = (
+                f"{stats.repaired} repaired, {stats.retried} retried, "
+                f"{stats.failed} failed"
+            )
+        else:
+            outcome = "fields defaulted"
+        line = (
+            f"\n[bold]Parsing:[/bold] {stats.malformed} of {stats.parsed} page responses "
+            f"malformed ({stats.malformed_rate:.1%}; {outcome})"
+        )
+
+        calls = [
+            m
+            for m in metrics
+            if m.tag in ("analyze_page", "analyze_pack", "cascade_triage")
+            and m.status == "ok"
+            and m.completion_tokens is not None
+        ]
+        pages = sum(len(m.pages) or 1 for m in calls)
+        if pages:
+            tokens = sum(m.completion_tokens for m in calls)
+            format_name = "JSON" if stats.structured else "text"
+            line += f"; {tokens / pages:.0f} completion tokens per page ({format_name} format)"
+        self.console.print(line)
+
+    def generate_schedule_report(
+        self, timeline: ScoreTimeline, plan: Optional[SchedulePlan] = None
+    ) -> None:
+        """
+        Print when the watched criteria settled on their final scores.
+
+        Args:
+            timeline: Running scores recorded as pages finished
+            plan: Priority order the run used, if any
+        """
+        stable = timeline.time_to_stable()
+        if stable is None:
+            return
+
+        seconds, pages = stable
+        criteria = f"{timeline.criteria[0]}-{timeline.criteria[-1]}"
+        line = (
+            f"\n[bold]Scheduling:[/bold] {criteria} stable after {seconds:.1f}s "
+            f"({pages} of {timeline.finished} pages)"
+        )
+        if plan is not None:
+            borderline = ", ".join(plan.borderline) or "none"
+            line += f"; prioritized by previous run, borderline criteria: {borderline}"
+        self.console.print(line)
+
+    def generate_simulation_report(
+        self, current: Dict[str, RubricScore], result: SimulationResult
+    ) -> None:
+        """
+        Print the scores a what-if simulation predicts next to the current ones.
+
+        Args:
+            current: Scores of the notebook as analyzed
+            result: Scores after the hypothetical changes
+        """
+        table = Table(title="What-If Rubric Scores", show_header=True)
+
+        table.add_column("Criterion", style="cyan")
+        table.add_column("Now", justify="center")
+        table.add_column("What-if", justify="center")
+        table.add_column("Change", justify="center")
+
+        for code in sorted(result.scores.keys()):
+            score = result.scores[code]
+            change = result.changes.get(code, 0)
+            if change > 0:
+                change_text = f"[green]+{change}[/green]"
+            elif change < 0:
+                change_text = f"[red]{change}[/red]"
+            else:
+                change_text = "[dim]-[/dim]"
+
+            table.add_row(
+                code,
+                f"{current[code].score}/3" if code in current else "-",
+                f"{score.score}/3",
+                change_text,
+            )
+
+        self.console.print("\n", table)
+
+        fully_developed, avg_score, excellence_ready = notebook_status(current)
+        status_text = Text()
+        status_text.append("\nOverall Status (now -> what-if):\n", style="bold")
+        status_text.append(
+            f"  Fully Developed: {fully_developed} -> {result.fully_developed}\n",
+            style=f"bold {'green' if result.fully_developed else 'red'}",
+        )
+        status_text.append(
+            f"  Average Score: {avg_score:.2f} -> {result.average_score:.2f}/3.0\n",
+            style="bold",
+        )
+        status_text.append(
+            f"  Excellence Award Ready: {excellence_ready} -> {result.excellence_ready}\n",
+            style=f"bold {'green' if result.excellence_ready else 'red'}",
+        )
+        self.console.print(status_text)
+
+    def estimate_table(self, estimate: NotebookEstimate) -> Table:
+        """
+        Build the table of estimated scores shown live during a sampled run.
+
+        Args:
+            estimate: Estimate from the pages analyzed so far
+
+        Returns:
+            Rich table with each criterion's likely score and bounds
+        """
+        if estimate.complete:
+            title = f"Rubric Scores ({estimate.pages_analyzed} pages, exact)"
+        else:
+            title = (
+                f"Estimated Rubric Scores ({estimate.pages_analyzed}/"
+                f"{estimate.total_pages} pages, {estimate.confidence:.0%} bounds)"
+            )
+        table = Table(title=title, show_header=True)
+
+        table.add_column("Criterion", style="cyan")
+        table.add_column("Estimate", justify="center")
+        table.add_column("Range", justify="center")
+        table.add_column("Expected", justify="center")
+
+        for code in sorted(estimate.scores.keys()):
+            score = estimate.scores[code]
+            if score.score >= 3:
+                score_color = "green"
+            elif score.score >= 2:
+                score_color = "yellow"
+            else:
+                score_color = "red"
+            bounds = str(score.low) if score.is_settled else f"{score.low}-{score.high}"
+
+            table.add_row(
+                code,
+                f"[{score_color}]{score.score}/3[/{score_color}]",
+                bounds if score.is_settled else f"[dim]{bounds}[/dim]",
+                f"{score.mean:.1f}",
+            )
+
+        return table
+
+    def generate_cascade_report(
+        self,
+        metrics: List[CallMetric],
+        stats: CascadeStats,
+        cascade_model: str,
+        model: str,
+    ) -> None:
+        """
+        Print the cascade escalation rate and estimated savings.
+
+        Savings compare this run against sending every triaged page to the
+        expensive model, priced at the average cost and call time of the
+        escalated pages.
+
+        Args:
+            metrics: Call metrics of the run
+            stats: Cascade escalation counts
+            cascade_model: Model used for the first pass
+            model: Model escalated pages were sent to
+        """
+        if not stats.triaged:
+            return
+
+        reasons = ", ".join(
+            f"{count} {reason.replace('_', ' ')}"
+            for reason, count in sorted(stats.reasons.items(), key=lambda r: -r[1])
+        )
+        self.console.print(
+            f"\n[bold]Cascade:[/bold] {stats.triaged} pages triaged with {cascade_model}, "
+            f"{stats.escalated} escalated to {model} "
+            f"({stats.escalated / stats.triaged:.0%}{': ' + reasons if reasons else ''})"
+        )
+
+        triage = [m for m in metrics if m.tag == "cascade_triage"]
+        full = [m for m in metrics if m.tag == "analyze_page" and m.model == model]
+        if not full:
+            self.console.print("[dim]No pages escalated; savings not estimated.[/dim]")
+            return
+
+        actual_cost = sum(m.cost_usd or 0.0 for m in triage + full)
+        actual_time = sum(m.wall_seconds for m in triage + full)
+        baseline_cost = stats.triaged * sum(m.cost_usd or 0.0 for m in full) / len(full)
+        baseline_time = stats.triaged * sum(m.wall_seconds for m in full) / len(full)
+
+        savings = []
+        if baseline_cost:
+            saved = baseline_cost - actual_cost
+            savings.append(f"${saved:.2f} ({saved / baseline_cost:.0%})")
+        if baseline_time:
+            saved = baseline_time - actual_time
+            savings.append(f"{saved:.0f} call-seconds ({saved / baseline_time:.0%})")
+        if savings:
+            self.console.print(f"Estimated savings vs. {model} only: {', '.join(savings)}")
+
     def generate_markdown_report(
         self,
         rubric_scores: Dict[str, RubricScore],
@@ -202,18 +512,13 @@ class ReportGenerator:
             )
 
         # Overall Status
-        en1_4_scores = [
-            rubric_scores.get(f"EN{i}").score for i in range(1, 5)
-            if f"EN{i}" in rubric_scores
-        ]
-        fully_developed = all(score >= 2 for score in en1_4_scores)
-        avg_score = sum(s.score for s in rubric_scores.values()) / len(rubric_scores)
+        fully_developed, avg_score, excellence_ready = notebook_status(rubric_scores)
 
         lines.append("\n## Overall Status\n\n")
         lines.append(f"- **Fully Developed:** {fully_developed}\n")
         lines.append(f"- **Average Score:** {avg_score:.2f}/3.0\n")
         lines.append(
-            f"- **Excellence Award Ready:** {fully_developed and avg_score >= 2.5}\n\n"
+            f"- **Excellence Award Ready:** {excellence_ready}\n\n"
         )
 
         # Gaps
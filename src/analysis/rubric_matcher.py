@@ -1,12 +1,24 @@
 """Match page analyses to rubric criteria and generate scores."""
 
+import math
+import random
 from pathlib import Path
-from typing import Dict, List
+from typing import Dict, Iterable, List, Optional, Union
 
+import numpy as np
 import yaml
 
 from ..config import get_settings
-from ..models import PageAnalysis, RubricCriterion, RubricScore, RubricStatus
+from ..models import (
+    NotebookEstimate,
+    PageAnalysis,
+    RubricCriterion,
+    RubricScore,
+    ScoreEstimate,
+)
+from .page_matrix import CriterionCounts, PageMatrix
+from .rubric_rules import compile_rules
+from .score_aggregate import ScoreAggregate
 
 
 class RubricMatcher:
@@ -24,7 +36,7 @@ class RubricMatcher:
         self.criteria = self._load_criteria()
 
     def _load_criteria(self) -> Dict[str, RubricCriterion]:
-        """Load rubric criteria from YAML file."""
+        """Load rubric criteria from YAML file and compile their score rules."""
         with open(self.rubric_file, "r") as f:
             data = yaml.safe_load(f)
 
@@ -32,289 +44,261 @@ class RubricMatcher:
         for code, criterion_data in data["rubric_criteria"].items():
             criteria[code] = RubricCriterion(**criterion_data)
 
+        self.rules, self.markers = compile_rules(
+            data, {code: c.title for code, c in criteria.items()}
+        )
         return criteria
 
+    def aggregate(self, page_analyses: List[PageAnalysis]) -> ScoreAggregate:
+        """
+        Count a shard of pages into a mergeable aggregate.
+
+        Args:
+            page_analyses: Pages of the shard
+
+        Returns:
+            ScoreAggregate that ``score_notebook`` accepts once merged
+        """
+        return ScoreAggregate.from_pages(page_analyses, self.criteria, self.markers)
+
     def score_notebook(
-        self, page_analyses: List[PageAnalysis]
+        self,
+        page_analyses: Union[List[PageAnalysis], ScoreAggregate],
+        codes: Optional[Iterable[str]] = None,
     ) -> Dict[str, RubricScore]:
         """
         Score the entire notebook against all rubric criteria.
 
         Args:
-            page_analyses: List of PageAnalysis from all pages
+            page_analyses: List of PageAnalysis from all pages, or the
+                merged ScoreAggregate of all of them
+            codes: Criteria to score. If None, all criteria.
 
         Returns:
             Dict mapping criterion code to RubricScore
         """
-        scores = {}
+        if isinstance(page_analyses, ScoreAggregate):
+            if page_analyses.markers != self.markers:
+                raise ValueError(
+                    f"Aggregate was counted by markers {page_analyses.markers}, "
+                    f"but the rubric uses {self.markers}"
+                )
+            codes = self.criteria.keys() if codes is None else codes
+            return {
+                code: self.score_criterion(code, page_analyses.criterion(code))
+                for code in codes
+            }
+
+        matrix = PageMatrix(page_analyses, self.criteria, self.markers)
+        return self._score_counts(matrix, matrix.counts(), codes)
+
+    def score_margins(
+        self, page_analyses: List[PageAnalysis], limit: int = 3
+    ) -> Dict[str, int]:
+        """
+        Count how many pages away each criterion is from a different score.
 
-        # Score each criterion
-        for code, criterion in self.criteria.items():
-            score = self._score_criterion(code, criterion, page_analyses)
-            scores[code] = score
+        A criterion's score drops when its strongest relevant pages are
+        removed one at a time, and rises when copies of one of its relevant
+        pages (or of a page showing every key element) are added. The margin
+        is the fewest pages that change the score either way, so criteria
+        sitting just above or just below a threshold have small margins.
 
-        return scores
+        Args:
+            page_analyses: Page analyses of a complete run
+            limit: Most pages to add or remove per criterion
 
-    def _score_criterion(
+        Returns:
+            Dict mapping criterion code to its margin (``limit + 1`` when no
+            change of up to ``limit`` pages moves the score)
+        """
+        matrix = PageMatrix(page_analyses, self.criteria, self.markers)
+        counts = matrix.counts()
+        evidence = matrix.flags.sum(axis=1)
+        margins = {}
+
+        for i, code in enumerate(self.criteria):
+            rule = self.rules[code]
+            base = rule.score(matrix.unpack(counts[i]))[0]
+            relevant = np.flatnonzero(matrix.membership[:, i])
+            margin = limit + 1
+
+            def moves(row: np.ndarray) -> bool:
+                return rule.score(matrix.unpack(row))[0] != base
+
+            # Remove the pages with the most evidence first
+            strongest = relevant[np.argsort(-evidence[relevant], kind="stable")]
+            removed = np.cumsum(matrix.features[strongest[:limit]], axis=0)
+            for k, features in enumerate(removed, start=1):
+                if moves(counts[i] - features):
+                    margin = k
+                    break
+
+            # Add copies of each kind of relevant page, plus an ideal page
+            # that shows every element and matches every content-type rule
+            kinds = np.unique(matrix.features[relevant], axis=0)
+            for features in [*kinds, matrix.ideal_features()]:
+                for k in range(1, margin):
+                    if moves(counts[i] + k * features):
+                        margin = k
+                        break
+
+            margins[code] = margin
+
+        return margins
+
+    def estimate_scores(
         self,
-        code: str,
-        criterion: RubricCriterion,
         page_analyses: List[PageAnalysis],
-    ) -> RubricScore:
+        strata: List[List[int]],
+        donors: Optional[Iterable[int]] = None,
+        replicates: Optional[int] = None,
+        confidence: Optional[float] = None,
+        seed: int = 0,
+    ) -> Optional[NotebookEstimate]:
         """
-        Score a single rubric criterion based on page analyses.
+        Estimate notebook scores before every page has been analyzed.
+
+        Each replicate fills the pages still pending in a stratum with
+        analyses drawn at random from the pages already analyzed in that
+        stratum, then scores the completed notebook. The spread of the
+        replicate scores gives the confidence bounds, which narrow as pages
+        finish and collapse onto the exact score once none are pending.
 
         Args:
-            code: Criterion code (EN1, EN2, etc.)
-            criterion: RubricCriterion object
-            page_analyses: All page analyses
+            page_analyses: Analyses available so far, in any order
+            strata: Page numbers grouped into the strata that were sampled
+                (see ``plan_sample``); pages outside every stratum must be
+                analyzed already
+            donors: Pages whose analyses may stand in for pending pages. If
+                None, any analyzed page in the stratum. Pass the sampled
+                pages to keep pages settled without the model (blank or
+                reused pages) from standing in for pages that needed it.
+            replicates: Resampled notebooks to score. If None, uses config
+                settings.
+            confidence: Coverage of the reported bounds. If None, uses config
+                settings.
+            seed: Random seed for the resampling
 
         Returns:
-            RubricScore for this criterion
+            NotebookEstimate, or None if pages are pending and no analyzed
+            page can stand in for them yet
         """
-        # Find pages relevant to this criterion
-        relevant_pages = [
-            p for p in page_analyses if code in p.rubric_categories
-        ]
+        settings = get_settings()
+        replicates = replicates or settings.sample_replicates
+        confidence = confidence or settings.sample_confidence
+
+        known = {a.page_number: a for a in page_analyses}
+        donor_pages = set(known) if donors is None else set(donors)
+        # Analyses are encoded once; replicates only reweight their rows
+        matrix = PageMatrix(list(known.values()), self.criteria, self.markers)
+        rows = {page: row for row, page in enumerate(known)}
+        usable = {
+            page: rows[page]
+            for page, a in known.items()
+            if page in donor_pages and a.content_type != "error"
+        }
+        pool = list(usable.values())
+
+        draws = []
+        for stratum in strata:
+            pending = sum(page not in known for page in stratum)
+            if pending:
+                stratum_donors = [usable[p] for p in stratum if p in usable] or pool
+                if not stratum_donors:
+                    return None
+                draws.append((stratum_donors, pending))
+
+        total_pages = len(known.keys() | {p for stratum in strata for p in stratum})
+        if not draws:
+            exact = self._score_counts(matrix, matrix.counts())
+            return NotebookEstimate(
+                total_pages=total_pages,
+                pages_analyzed=len(known),
+                confidence=confidence,
+                complete=True,
+                scores={
+                    code: ScoreEstimate(
+                        criterion_code=code,
+                        score=s.score,
+                        mean=float(s.score),
+                        low=s.score,
+                        high=s.score,
+                    )
+                    for code, s in exact.items()
+                },
+            )
 
-        # Aggregate key elements
-        key_elements_found = self._aggregate_key_elements(relevant_pages)
+        rng = random.Random(seed)
+        samples: Dict[str, List[int]] = {code: [] for code in self.criteria}
+        for _ in range(replicates):
+            weights = np.ones(len(matrix))
+            for stratum_donors, pending in draws:
+                np.add.at(weights, rng.choices(stratum_donors, k=pending), 1)
+            for code, s in self._score_counts(matrix, matrix.counts(weights)).items():
+                samples[code].append(s.score)
 
-        # Calculate score based on criterion
-        score, status, evidence, missing = self._calculate_score(
-            code, criterion, key_elements_found, relevant_pages
-        )
+        tail = (1 - confidence) / 2
+        scores = {}
+        for code, values in samples.items():
+            values.sort()
+            scores[code] = ScoreEstimate(
+                criterion_code=code,
+                score=values[len(values) // 2],
+                mean=sum(values) / len(values),
+                low=values[int(tail * len(values))],
+                high=values[max(0, math.ceil((1 - tail) * len(values)) - 1)],
+            )
 
-        return RubricScore(
-            criterion_code=code,
-            status=status,
-            score=score,
-            evidence=evidence,
-            missing_elements=missing,
+        return NotebookEstimate(
+            total_pages=total_pages,
+            pages_analyzed=len(known),
+            confidence=confidence,
+            scores=scores,
         )
 
-    def _aggregate_key_elements(
-        self, pages: List[PageAnalysis]
-    ) -> Dict[str, int]:
+    def _score_counts(
+        self,
+        matrix: PageMatrix,
+        counts: np.ndarray,
+        codes: Optional[Iterable[str]] = None,
+    ) -> Dict[str, RubricScore]:
         """
-        Aggregate key elements found across pages.
+        Score criteria from their rows of a page matrix's counts.
 
         Args:
-            pages: List of PageAnalysis
+            matrix: Encoded page analyses
+            counts: ``matrix.counts()``, one row per criterion
+            codes: Criteria to score. If None, all criteria.
 
         Returns:
-            Dict of element name to count
+            Dict mapping criterion code to RubricScore
         """
-        elements = {}
+        scores = {}
+        codes = self.criteria.keys() if codes is None else codes
+        index = {code: i for i, code in enumerate(matrix.codes)}
 
-        for page in pages:
-            for element, found in page.key_elements.items():
-                if found:
-                    elements[element] = elements.get(element, 0) + 1
+        for code in codes:
+            scores[code] = self.score_criterion(code, matrix.unpack(counts[index[code]]))
 
-        return elements
+        return scores
 
-    def _calculate_score(
-        self,
-        code: str,
-        criterion: RubricCriterion,
-        key_elements: Dict[str, int],
-        relevant_pages: List[PageAnalysis],
-    ) -> tuple:
+    def score_criterion(self, code: str, counts: CriterionCounts) -> RubricScore:
         """
-        Calculate score for a criterion.
+        Score one criterion from the counts over its tagged pages.
 
         Args:
-            code: Criterion code
-            criterion: RubricCriterion
-            key_elements: Aggregated key elements
-            relevant_pages: Relevant pages
+            code: Criterion code (EN1, EN2, etc.)
+            counts: Counts over the pages tagged with the criterion
 
         Returns:
-            Tuple of (score, status, evidence, missing_elements)
+            RubricScore for this criterion
         """
-        evidence = []
-        missing = []
-
-        # EN1: Identify the Challenge
-        if code == "EN1":
-            has_game_analysis = any(
-                "game_analysis" in p.content_type.lower() for p in relevant_pages
-            )
-            has_challenge_id = len(relevant_pages) > 0
-
-            if has_game_analysis and has_challenge_id:
-                score = 3
-                status = RubricStatus.FULLY_DEVELOPED
-                evidence = [f"Found {len(relevant_pages)} pages identifying challenges"]
-            elif has_challenge_id:
-                score = 2
-                status = RubricStatus.DEVELOPING
-                evidence = ["Some challenge identification present"]
-                missing = ["Need detailed game analysis with strategy breakdown"]
-            else:
-                score = 1
-                status = RubricStatus.PARTIAL
-                missing = ["Missing challenge identification pages"]
-
-        # EN4: Brainstorm Solutions (3+ options)
-        elif code == "EN4":
-            brainstorming_count = key_elements.get("brainstorming", 0)
-            decision_matrix_count = key_elements.get("decision_matrix", 0)
-
-            if brainstorming_count >= 3 and decision_matrix_count >= 1:
-                score = 3
-                status = RubricStatus.FULLY_DEVELOPED
-                evidence = [
-                    f"Found {brainstorming_count} pages with multiple design options",
-                    f"Found {decision_matrix_count} decision matrices",
-                ]
-            elif brainstorming_count >= 1:
-                score = 2
-                status = RubricStatus.DEVELOPING
-                evidence = [f"Found {brainstorming_count} brainstorming pages"]
-                missing = [
-                    "Need 3+ design options per subsystem with diagrams",
-                    "Need decision matrices to justify selections",
-                ]
-            else:
-                score = 1
-                status = RubricStatus.PARTIAL
-                missing = [
-                    "Missing brainstorming pages",
-                    "Need 3+ options per subsystem",
-                    "Need decision matrices",
-                ]
-
-        # EN5: Build and Program Documentation
-        elif code == "EN5":
-            cad_count = key_elements.get("cad_drawings", 0)
-            build_pages = sum(
-                1 for p in relevant_pages if "build" in p.content_type.lower()
-            )
-
-            if cad_count >= 3 and build_pages >= 5:
-                score = 3
-                status = RubricStatus.FULLY_DEVELOPED
-                evidence = [
-                    f"Found {cad_count} pages with CAD drawings",
-                    f"Found {build_pages} build documentation pages",
-                ]
-            elif cad_count >= 1 or build_pages >= 2:
-                score = 2
-                status = RubricStatus.DEVELOPING
-                evidence = ["Some build documentation present"]
-                missing = ["Need more detailed build steps", "Add more CAD/technical drawings"]
-            else:
-                score = 1
-                status = RubricStatus.PARTIAL
-                missing = ["Missing comprehensive build documentation"]
-
-        # EN6: Test and Record Results
-        elif code == "EN6":
-            testing_count = key_elements.get("testing_data", 0)
-            failure_docs = key_elements.get("failure_documentation", 0)
-
-            if testing_count >= 3 and failure_docs >= 1:
-                score = 3
-                status = RubricStatus.FULLY_DEVELOPED
-                evidence = [
-                    f"Found {testing_count} pages with quantitative test data",
-                    "Documented failures and successes",
-                ]
-            elif testing_count >= 1:
-                score = 2
-                status = RubricStatus.DEVELOPING
-                evidence = ["Some testing documentation present"]
-                missing = [
-                    "Need more quantitative test data",
-                    "Document both successes AND failures",
-                ]
-            else:
-                score = 1
-                status = RubricStatus.PARTIAL
-                missing = ["Missing testing documentation with quantitative data"]
-
-        # EN7: Design Iterations
-        elif code == "EN7":
-            iteration_count = key_elements.get("design_iteration", 0)
-
-            if iteration_count >= 3:
-                score = 3
-                status = RubricStatus.FULLY_DEVELOPED
-                evidence = [f"Found {iteration_count} clear design iterations"]
-            elif iteration_count >= 1:
-                score = 2
-                status = RubricStatus.DEVELOPING
-                evidence = ["Some design iterations present"]
-                missing = [
-                    "Need more clearly labeled design cycles",
-                    "Show progression and improvement over time",
-                ]
-            else:
-                score = 1
-                status = RubricStatus.PARTIAL
-                missing = ["Missing clear design iteration documentation"]
-
-        # EN8: Project Management
-        elif code == "EN8":
-            meeting_count = key_elements.get("meeting_notes", 0)
-
-            if meeting_count >= 5 and len(relevant_pages) >= 8:
-                score = 3
-                status = RubricStatus.FULLY_DEVELOPED
-                evidence = [
-                    f"Found {meeting_count} meeting notes",
-                    "Project management documentation present",
-                ]
-            elif meeting_count >= 2:
-                score = 2
-                status = RubricStatus.DEVELOPING
-                evidence = ["Some project management documentation"]
-                missing = [
-                    "Need more regular meeting notes",
-                    "Document team roles and responsibilities",
-                ]
-            else:
-                score = 1
-                status = RubricStatus.PARTIAL
-                missing = ["Missing project management documentation"]
-
-        # EN9: Sequential Documentation
-        elif code == "EN9":
-            dated_count = key_elements.get("dates_timestamps", 0)
-            total_pages = len(relevant_pages) if relevant_pages else 1
-
-            dated_percentage = (dated_count / total_pages) * 100 if total_pages > 0 else 0
-
-            if dated_percentage >= 80:
-                score = 3
-                status = RubricStatus.FULLY_DEVELOPED
-                evidence = [f"{dated_percentage:.0f}% of pages have dates/timestamps"]
-            elif dated_percentage >= 50:
-                score = 2
-                status = RubricStatus.DEVELOPING
-                evidence = [f"{dated_percentage:.0f}% of pages have dates"]
-                missing = ["Add dates/timestamps to more entries"]
-            else:
-                score = 1
-                status = RubricStatus.PARTIAL
-                missing = ["Most pages missing dates/timestamps"]
-
-        # Default scoring for other criteria
-        else:
-            if len(relevant_pages) >= 5:
-                score = 3
-                status = RubricStatus.FULLY_DEVELOPED
-                evidence = [f"Found {len(relevant_pages)} relevant pages"]
-            elif len(relevant_pages) >= 2:
-                score = 2
-                status = RubricStatus.DEVELOPING
-                evidence = [f"Found {len(relevant_pages)} relevant pages"]
-            else:
-                score = 1
-                status = RubricStatus.PARTIAL
-                evidence = []
-                missing = [f"Need more content for {criterion.title}"]
-
-        return score, status, evidence, missing
+        score, status, evidence, missing = self.rules[code].score(counts)
+        return RubricScore(
+            criterion_code=code,
+            status=status,
+            score=score,
+            evidence=evidence,
+            missing_elements=missing,
+        )
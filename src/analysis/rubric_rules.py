@@ -0,0 +1,290 @@
+"""Score rules declared in the rubric YAML, built into scoring functions."""
+
+import operator
+import re
+from string import Formatter
+from typing import Any, Callable, Dict, Iterable, List, Tuple
+
+from ..models import KEY_ELEMENTS, RubricStatus
+from .page_matrix import CriterionCounts
+
+# Comparison operators allowed in rule conditions
+OPERATORS = {
+    ">=": operator.ge,
+    "<=": operator.le,
+    "==": operator.eq,
+    "!=": operator.ne,
+    ">": operator.gt,
+    "<": operator.lt,
+}
+
+_NAME = re.compile(r"^[a-z_][a-z0-9_]*$")
+_CONDITION = re.compile(
+    r"^\s*([a-z_][a-z0-9_]*)\s*("
+    + "|".join(re.escape(op) for op in OPERATORS)
+    + r")\s*(-?\d+(?:\.\d+)?)\s*$"
+)
+
+# Joins a level's templates so they are filled in with one format call;
+# templates and titles containing it are rejected at load
+TEMPLATE_SEPARATOR = "\x00"
+
+# Where a quantity is read from: (source, key) pairs name the count a rule
+# compares, with key the element or marker name where there is one
+PAGES, ELEMENT, PERCENT, MARKER, TITLE = range(5)
+
+
+def _quantity(
+    name: str, title: str, elements: Iterable[str], markers: Iterable[str]
+) -> Tuple[Tuple[int, str], Any]:
+    """
+    Source of a quantity a rule mentions, with a sample value of its type.
+
+    Args:
+        name: Quantity name (see the header of ``criteria.yaml``)
+        title: Criterion title, the value of ``title``
+        elements: Key element names that ``<element>`` and
+            ``<element>_percent`` refer to
+        markers: Content-type markers that ``<marker>_pages`` refers to
+
+    Returns:
+        Tuple of ((source, key), sample value used to check format specs)
+
+    Raises:
+        ValueError: If the name is no known quantity, e.g. a misspelt key
+            element, which would otherwise always read 0
+    """
+    if name == "pages":
+        return (PAGES, ""), 0
+    if name == "title":
+        if TEMPLATE_SEPARATOR in title:
+            raise ValueError(f"Title cannot contain NUL: {title!r}")
+        return (TITLE, title), title
+    if name in elements:
+        return (ELEMENT, name), 0
+    if name.endswith("_percent") and name[: -len("_percent")] in elements:
+        return (PERCENT, name[: -len("_percent")]), 0.0
+    if name.endswith("_pages") and name[: -len("_pages")] in markers:
+        return (MARKER, name[: -len("_pages")]), 0
+    raise ValueError(
+        f"Unknown quantity {name!r} (key elements: {', '.join(sorted(elements))}; "
+        f"markers: {', '.join(sorted(markers))})"
+    )
+
+
+def _parse_condition(condition: str) -> Tuple[str, Callable[[Any, Any], bool], float]:
+    """Split ``"<quantity> <op> <number>"`` into its name, operator and number."""
+    match = _CONDITION.match(condition) if isinstance(condition, str) else None
+    if match is None:
+        raise ValueError(f"Invalid condition: {condition!r}")
+    name, op, number = match.groups()
+    return name, OPERATORS[op], float(number)
+
+
+def _parse_template(template: str, slot: Callable[[str], int]) -> Tuple[str, bool]:
+    """
+    Check a format template's fields and number them by quantity slot.
+
+    Fields must be plain quantity names, with no conversion other than
+    ``!r``, ``!s`` or ``!a`` and no nested fields. ``"{pages} pages"``
+    becomes ``"{0} pages"`` if ``pages`` is slot 0, so the template is
+    filled in with one ``format(*values)`` call.
+
+    Args:
+        template: Evidence or missing template from the rubric
+        slot: Slot of a quantity name, registering it if new
+
+    Returns:
+        Tuple of (template with positional fields, whether it has any)
+    """
+    if not isinstance(template, str) or TEMPLATE_SEPARATOR in template:
+        raise ValueError(f"Template must be a string without NUL: {template!r}")
+    try:
+        parts = list(Formatter().parse(template))
+    except ValueError as e:
+        raise ValueError(f"Invalid template {template!r}: {e}") from e
+    positional = []
+    for literal, field, spec, conversion in parts:
+        positional.append(literal.replace("{", "{{").replace("}", "}}"))
+        if field is None:
+            continue
+        if not _NAME.match(field):
+            raise ValueError(f"Invalid template field {field!r} in {template!r}")
+        if conversion not in (None, "r", "s", "a"):
+            raise ValueError(f"Invalid conversion !{conversion} in {template!r}")
+        if spec and "{" in spec:
+            raise ValueError(f"Nested template field in {template!r}")
+        conversion = f"!{conversion}" if conversion else ""
+        spec = f":{spec}" if spec else ""
+        positional.append(f"{{{slot(field)}{conversion}{spec}}}")
+    return "".join(positional), len(positional) > len(parts)
+
+
+def _check_template(template: str, positional: str, samples: List[Any]) -> None:
+    """Format a template with sample values, so bad format specs fail at load."""
+    try:
+        positional.format(*samples)
+    except (IndexError, ValueError, TypeError) as e:
+        raise ValueError(f"Invalid template {template!r}: {e}") from e
+
+
+class ScoreRule:
+    """
+    A criterion's score levels, built into one scoring function.
+
+    Each quantity the rule mentions gets a slot, read once per call from
+    the counts; each condition becomes a (slot, operator, number) triple
+    and each level's output is prepared up front, so scoring runs in one
+    frame with no calls but the comparisons and one format per template
+    list. Names and templates are checked when the rubric is loaded, so a
+    malformed rule fails then, with the criterion named, rather than while
+    scoring.
+    """
+
+    def __init__(
+        self,
+        spec: Dict[str, Any],
+        title: str,
+        markers: Iterable[str],
+        code: str = "",
+        elements: Iterable[str] = KEY_ELEMENTS,
+    ):
+        """
+        Build a criterion's rule.
+
+        Args:
+            spec: Mapping with ``levels`` (tried in order) and ``fallback``.
+                A level has ``score``, ``status``, either ``all`` or ``any``
+                (a list of conditions), and optional ``evidence`` and
+                ``missing`` templates.
+            title: Criterion title, available to templates as ``{title}``
+            markers: Content-type markers that ``<marker>_pages`` refers to
+            code: Criterion code, used in error messages
+            elements: Key element names conditions and templates may use
+        """
+        self.title = title
+        self.code = code
+        levels = [*spec.get("levels", []), spec["fallback"]]
+        markers, elements = set(markers), set(elements)
+
+        self._sources: List[Tuple[int, str]] = []
+        slots: Dict[str, int] = {}
+        samples: List[Any] = []
+
+        def slot(name: str) -> int:
+            if name not in slots:
+                source, sample = _quantity(name, title, elements, markers)
+                slots[name] = len(self._sources)
+                self._sources.append(source)
+                samples.append(sample)
+            return slots[name]
+
+        self._levels = []
+        for index, level in enumerate(levels):
+            if "all" in level and "any" in level:
+                raise ValueError("A score level takes either 'all' or 'any', not both")
+            conditions = []
+            for condition in level.get("all", level.get("any", [])):
+                name, op, number = _parse_condition(condition)
+                if name == "title":
+                    raise ValueError(f"Conditions cannot compare the title: {condition!r}")
+                conditions.append((slot(name), op, number))
+            if index == len(levels) - 1 and conditions:
+                raise ValueError("The fallback level cannot have conditions")
+
+            # A template list that fills in nothing is kept as ready text;
+            # one that does is joined into a single template, formatted with
+            # one call and split apart again
+            output = [int(level["score"]), RubricStatus(level["status"])]
+            for key in ("evidence", "missing"):
+                parsed, filled = [], False
+                for template in level.get(key, []):
+                    positional, fields = _parse_template(template, slot)
+                    _check_template(template, positional, samples)
+                    parsed.append(positional)
+                    filled = filled or fields
+                if filled:
+                    output += [(), TEMPLATE_SEPARATOR.join(parsed)]
+                else:
+                    output += [tuple(template.format() for template in parsed), None]
+
+            self._levels.append(
+                (tuple(conditions), "any" in level and bool(conditions), tuple(output))
+            )
+
+    def score(self, counts: CriterionCounts) -> tuple:
+        """
+        Score a criterion from the counts over its tagged pages.
+
+        Args:
+            counts: Counts over the pages tagged with the criterion
+
+        Returns:
+            Tuple of (score, status, evidence, missing_elements)
+        """
+        pages = counts.pages
+        elements = counts.key_elements
+        values = []
+        for source, key in self._sources:
+            if source == ELEMENT:
+                values.append(elements.get(key, 0))
+            elif source == PAGES:
+                values.append(pages)
+            elif source == PERCENT:
+                values.append(elements.get(key, 0) / (pages or 1) * 100)
+            elif source == MARKER:
+                values.append(counts.content_types.get(key, 0))
+            else:
+                values.append(key)
+
+        for conditions, any_of, output in self._levels:
+            for slot, op, number in conditions:
+                if op(values[slot], number) == any_of:
+                    held = any_of
+                    break
+            else:
+                held = not any_of
+            if held:
+                score, status, evidence, evidence_template, missing, missing_template = output
+                return (
+                    score,
+                    status,
+                    list(evidence)
+                    if evidence_template is None
+                    else evidence_template.format(*values).split(TEMPLATE_SEPARATOR),
+                    list(missing)
+                    if missing_template is None
+                    else missing_template.format(*values).split(TEMPLATE_SEPARATOR),
+                )
+        raise AssertionError("The fallback level always holds")
+
+
+def compile_rules(
+    data: Dict[str, Any], titles: Dict[str, str]
+) -> Tuple[Dict[str, ScoreRule], List[str]]:
+    """
+    Compile the score rules of a rubric YAML file.
+
+    Args:
+        data: Parsed rubric YAML
+        titles: Title of each criterion code
+
+    Returns:
+        Tuple of (rule per criterion code, content-type markers)
+    """
+    markers = list(data.get("content_type_markers", []))
+    for marker in markers:
+        if not _NAME.match(marker):
+            raise ValueError(f"Invalid content type marker: {marker!r}")
+
+    default = data.get("default_scoring")
+    rules = {}
+    for code, title in titles.items():
+        spec = data["rubric_criteria"][code].get("scoring", default)
+        if spec is None:
+            raise ValueError(f"{code} has no scoring rule and there is no default_scoring")
+        try:
+            rules[code] = ScoreRule(spec, title, markers, code)
+        except (KeyError, TypeError, ValueError) as e:
+            raise ValueError(f"Invalid scoring rule for {code}: {e}") from e
+    return rules, markers
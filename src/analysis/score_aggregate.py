@@ -0,0 +1,196 @@
+"""Partial rubric counts of a shard of pages, mergeable across workers."""
+
+import json
+import os
+from pathlib import Path
+from typing import Dict, Iterable, List, Tuple
+
+import numpy as np
+from pydantic import BaseModel, Field
+
+from ..models import PageAnalysis
+from .page_matrix import CONTENT_TYPE_MARKERS, CriterionCounts, PageMatrix
+
+# Key element marking pages that show dates or timestamps
+DATE_ELEMENT = "dates_timestamps"
+
+
+def _add(a: Dict[str, int], b: Dict[str, int]) -> Dict[str, int]:
+    """Sum two count dicts key by key."""
+    total = dict(a)
+    for key, count in b.items():
+        total[key] = total.get(key, 0) + count
+    return total
+
+
+def _page_ranges(page_numbers: Iterable[int]) -> List[Tuple[int, int]]:
+    """Collapse page numbers into sorted inclusive ``(first, last)`` runs."""
+    ranges: List[Tuple[int, int]] = []
+    for number in sorted(set(page_numbers)):
+        if ranges and number == ranges[-1][1] + 1:
+            ranges[-1] = (ranges[-1][0], number)
+        else:
+            ranges.append((number, number))
+    return ranges
+
+
+class ScoreAggregate(BaseModel):
+    """
+    Everything rubric scoring needs from a set of pages, without the pages.
+
+    Aggregates of disjoint shards merge by adding their counts, so pages
+    can be analyzed and counted on separate workers or machines and only
+    these small summaries brought together. ``merge`` is associative and
+    commutative, with an empty aggregate as its identity, and refuses to
+    merge shards that share a page, which would count it twice.
+    """
+
+    markers: List[str] = Field(
+        default_factory=lambda: list(CONTENT_TYPE_MARKERS),
+        description="Content-type markers the criterion counts were taken by",
+    )
+    page_ranges: List[Tuple[int, int]] = Field(
+        default_factory=list, description="Inclusive runs of the page numbers counted"
+    )
+    criteria: Dict[str, CriterionCounts] = Field(
+        default_factory=dict, description="Counts over the pages tagged with each criterion"
+    )
+    key_elements: Dict[str, int] = Field(
+        default_factory=dict, description="Pages showing each key element"
+    )
+    content_types: Dict[str, int] = Field(
+        default_factory=dict, description="Pages of each content type"
+    )
+
+    @classmethod
+    def from_pages(
+        cls,
+        page_analyses: List[PageAnalysis],
+        codes: Iterable[str],
+        markers: Iterable[str] = CONTENT_TYPE_MARKERS,
+    ) -> "ScoreAggregate":
+        """
+        Count a shard of page analyses.
+
+        Args:
+            page_analyses: Pages of the shard, each page number at most once
+            codes: Criterion codes to count
+            markers: Content-type substrings to count pages by
+
+        Returns:
+            ScoreAggregate of the shard
+        """
+        numbers = [p.page_number for p in page_analyses]
+        if len(set(numbers)) != len(numbers):
+            raise ValueError("A shard cannot hold the same page number twice")
+
+        matrix = PageMatrix(page_analyses, codes, markers)
+        counts = matrix.counts()
+        elements = matrix.flags.sum(axis=0).tolist()
+        types = np.bincount(matrix.type_codes, minlength=len(matrix.content_types)).tolist()
+        return cls(
+            markers=matrix.markers,
+            page_ranges=_page_ranges(numbers),
+            criteria={code: matrix.unpack(counts[i]) for i, code in enumerate(matrix.codes)},
+            key_elements={
+                name: count for name, count in zip(matrix.elements, elements) if count
+            },
+            content_types=dict(zip(matrix.content_types, types)),
+        )
+
+    @property
+    def pages(self) -> int:
+        """Pages counted."""
+        return sum(last - first + 1 for first, last in self.page_ranges)
+
+    @property
+    def dated_pages(self) -> int:
+        """Pages showing dates or timestamps."""
+        return self.key_elements.get(DATE_ELEMENT, 0)
+
+    def criterion(self, code: str) -> CriterionCounts:
+        """Counts for a criterion, or zero counts if no shard counted it."""
+        counts = self.criteria.get(code)
+        if counts is None:
+            return CriterionCounts(content_types=dict.fromkeys(self.markers, 0))
+        return counts
+
+    def merge(self, other: "ScoreAggregate") -> "ScoreAggregate":
+        """
+        Combine with the aggregate of another, disjoint shard.
+
+        Args:
+            other: Aggregate to merge with
+
+        Returns:
+            New ScoreAggregate counting the pages of both
+
+        Raises:
+            ValueError: If the shards share a page or were counted by
+                different content-type markers
+        """
+        if self.markers != other.markers:
+            raise ValueError(
+                f"Cannot merge aggregates counted by markers {self.markers} and {other.markers}"
+            )
+        ranges = sorted(self.page_ranges + other.page_ranges)
+        for (_, last), (first, _) in zip(ranges, ranges[1:]):
+            if first <= last:
+                raise ValueError(f"Shards overlap at page {first}")
+
+        criteria = {}
+        for code in self.criteria.keys() | other.criteria.keys():
+            a, b = self.criterion(code), other.criterion(code)
+            criteria[code] = CriterionCounts(
+                pages=a.pages + b.pages,
+                key_elements=_add(a.key_elements, b.key_elements),
+                content_types=_add(a.content_types, b.content_types),
+            )
+
+        merged = []
+        for first, last in ranges:
+            if merged and first == merged[-1][1] + 1:
+                merged[-1] = (merged[-1][0], last)
+            else:
+                merged.append((first, last))
+
+        return ScoreAggregate(
+            markers=list(self.markers),
+            page_ranges=merged,
+            criteria=dict(sorted(criteria.items())),
+            key_elements=_add(self.key_elements, other.key_elements),
+            content_types=_add(self.content_types, other.content_types),
+        )
+
+    @classmethod
+    def merge_all(cls, aggregates: Iterable["ScoreAggregate"]) -> "ScoreAggregate":
+        """
+        Merge any number of shard aggregates, in any order or grouping.
+
+        Args:
+            aggregates: Aggregates of disjoint shards
+
+        Returns:
+            ScoreAggregate of all the shards (empty if there are none)
+        """
+        aggregates = list(aggregates)
+        if not aggregates:
+            return cls()
+        total = aggregates[0]
+        for aggregate in aggregates[1:]:
+            total = total.merge(aggregate)
+        return total
+
+    def save_to_file(self, filepath: Path) -> None:
+        """Save aggregate to JSON file, replacing it atomically."""
+        partial = filepath.with_suffix(".tmp")
+        with open(partial, "w") as f:
+            json.dump(self.model_dump(), f, indent=2)
+        os.replace(partial, filepath)
+
+    @classmethod
+    def load_from_file(cls, filepath: Path) -> "ScoreAggregate":
+        """Load aggregate from JSON file."""
+        with open(filepath, "r") as f:
+            data = json.load(f)
+        return cls(**data)
@@ -0,0 +1,240 @@
+"""What-if rubric scores for hypothetical page additions and removals."""
+
+from typing import Dict, Iterable, List, Optional, Tuple, Union
+
+from pydantic import BaseModel, Field
+
+from ..models import KEY_ELEMENTS, PageAnalysis, RubricScore
+from .page_matrix import CriterionCounts
+from .rubric_matcher import RubricMatcher
+from .score_aggregate import ScoreAggregate
+from .scoring_state import Contribution, page_contribution
+
+# Criteria that must all reach FULLY_DEVELOPED_SCORE for Fully Developed status
+FULLY_DEVELOPED_CODES = ("EN1", "EN2", "EN3", "EN4")
+
+# Lowest score each Fully Developed criterion may have
+FULLY_DEVELOPED_SCORE = 2
+
+# Lowest average score of a Fully Developed notebook that is Excellence Award ready
+EXCELLENCE_AVERAGE = 2.5
+
+
+def notebook_status(rubric_scores: Dict[str, RubricScore]) -> Tuple[bool, float, bool]:
+    """
+    Overall status of a set of rubric scores, as the terminal report shows it.
+
+    Args:
+        rubric_scores: Dict of criterion codes to RubricScores
+
+    Returns:
+        Tuple of (fully developed, average score, Excellence Award ready)
+    """
+    fully_developed = all(
+        rubric_scores[code].score >= FULLY_DEVELOPED_SCORE
+        for code in FULLY_DEVELOPED_CODES
+        if code in rubric_scores
+    )
+    scores = [s.score for s in rubric_scores.values()]
+    average = sum(scores) / len(scores) if scores else 0
+    return fully_developed, average, fully_developed and average >= EXCELLENCE_AVERAGE
+
+
+class HypotheticalPage(BaseModel):
+    """A page that could be added to the notebook."""
+
+    content_type: str = Field(description="Type of content: design, testing, meeting, etc.")
+    rubric_categories: List[str] = Field(
+        default_factory=list, description="EN1-EN10 categories the page would count towards"
+    )
+    key_elements: Dict[str, bool] = Field(
+        default_factory=dict, description="Key elements the page would show"
+    )
+    copies: int = Field(default=1, ge=1, description="How many such pages to add")
+
+    @classmethod
+    def parse(cls, spec: str) -> "HypotheticalPage":
+        """
+        Parse a page written as ``content_type[:EN6,EN7[:element,...]][*copies]``.
+
+        Args:
+            spec: Page spec, e.g. ``testing:EN6:testing_data,dates_timestamps*2``
+
+        Returns:
+            HypotheticalPage described by the spec
+        """
+        copies = 1
+        if "*" in spec:
+            spec, count = spec.rsplit("*", 1)
+            if not count.strip().isdigit():
+                raise ValueError(f"Invalid page count in {spec!r}: {count!r}")
+            copies = int(count)
+        parts = [part.strip() for part in spec.split(":")]
+        if len(parts) > 3 or not parts[0]:
+            raise ValueError(
+                f"Invalid page {spec!r}. Use content_type[:categories[:elements]][*copies]"
+            )
+        parts += [""] * (3 - len(parts))
+
+        def names(part: str) -> List[str]:
+            return [name.strip() for name in part.split(",") if name.strip()]
+
+        return cls(
+            content_type=parts[0],
+            rubric_categories=[code.upper() for code in names(parts[1])],
+            key_elements=dict.fromkeys(names(parts[2]), True),
+            copies=copies,
+        )
+
+    def to_analysis(self) -> PageAnalysis:
+        """The page as an analysis, without a page number."""
+        return PageAnalysis(
+            page_number=0,
+            content_type=self.content_type,
+            summary="Hypothetical page",
+            rubric_categories=self.rubric_categories,
+            key_elements=self.key_elements,
+        )
+
+
+class WhatIf(BaseModel):
+    """Hypothetical changes to the analyzed notebook."""
+
+    add: List[HypotheticalPage] = Field(default_factory=list, description="Pages to add")
+    remove: List[int] = Field(
+        default_factory=list, description="Page numbers of analyzed pages to remove"
+    )
+
+
+class SimulationResult(BaseModel):
+    """Rubric scores the notebook would have after hypothetical changes."""
+
+    scores: Dict[str, RubricScore] = Field(default_factory=dict)
+    changes: Dict[str, int] = Field(
+        default_factory=dict, description="Score change of each criterion that moves"
+    )
+    fully_developed: bool = Field(description="Whether EN1-EN4 all score 2 or more")
+    average_score: float
+    excellence_ready: bool = Field(
+        description="Whether the notebook is Fully Developed and averages 2.5 or more"
+    )
+
+
+class ScoreSimulator:
+    """
+    Answers what-if questions about the analyzed notebook's scores.
+
+    The notebook's counts are aggregated once, up front. A query only
+    applies the hypothetical pages' deltas to the criteria they touch and
+    re-runs those criteria's score rules; every other criterion keeps its
+    current score, so each query costs microseconds whatever the size of
+    the notebook.
+    """
+
+    def __init__(
+        self,
+        matcher: RubricMatcher,
+        page_analyses: Union[List[PageAnalysis], ScoreAggregate],
+    ):
+        """
+        Aggregate the current notebook.
+
+        Args:
+            matcher: Matcher whose criteria and score rules are used
+            page_analyses: Analyzed pages, or their merged ScoreAggregate
+                (pages cannot then be removed by number)
+        """
+        self.matcher = matcher
+        if isinstance(page_analyses, ScoreAggregate):
+            self.pages: Optional[Dict[int, PageAnalysis]] = None
+            self.aggregate = page_analyses
+        else:
+            self.pages = {a.page_number: a for a in page_analyses}
+            self.aggregate = matcher.aggregate(list(self.pages.values()))
+        self.scores = matcher.score_notebook(self.aggregate)
+        self.elements = set(KEY_ELEMENTS) | set(self.aggregate.key_elements)
+
+    def _added(self, page: HypotheticalPage) -> Contribution:
+        """Check a hypothetical page and work out what it adds."""
+        unknown = [c for c in page.rubric_categories if c not in self.matcher.criteria]
+        if unknown:
+            raise ValueError(f"Unknown rubric categories: {', '.join(unknown)}")
+        unknown = [e for e in page.key_elements if e not in self.elements]
+        if unknown:
+            raise ValueError(
+                f"Unknown key elements: {', '.join(unknown)} "
+                f"(known: {', '.join(sorted(self.elements))})"
+            )
+        return page_contribution(page.to_analysis(), self.matcher.criteria, self.matcher.markers)
+
+    def _removed(self, page_numbers: Iterable[int]) -> List[Contribution]:
+        """Check pages to remove and work out what each took away."""
+        page_numbers = list(dict.fromkeys(page_numbers))
+        if not page_numbers:
+            return []
+        if self.pages is None:
+            raise ValueError("Pages cannot be removed from an aggregate-only notebook")
+        missing = [str(n) for n in page_numbers if n not in self.pages]
+        if missing:
+            raise ValueError(f"No analyzed pages numbered {', '.join(missing)}")
+        return [
+            page_contribution(self.pages[n], self.matcher.criteria, self.matcher.markers)
+            for n in page_numbers
+        ]
+
+    def simulate(self, what_if: WhatIf) -> SimulationResult:
+        """
+        Score the notebook as if pages were added and removed.
+
+        Args:
+            what_if: Pages to add and page numbers to remove
+
+        Returns:
+            SimulationResult with the new scores and overall status
+
+        Raises:
+            ValueError: If a page names an unknown criterion or key element,
+                or a page to remove was not analyzed
+        """
+        deltas = [(contribution, -1) for contribution in self._removed(what_if.remove)]
+        deltas += [(self._added(page), page.copies) for page in what_if.add]
+
+        # Per touched criterion: page delta, element deltas, marker deltas
+        touched: Dict[str, Tuple[List[int], Dict[str, int], Dict[str, int]]] = {}
+        for (codes, elements, markers), sign in deltas:
+            for code in codes:
+                pages, element_deltas, marker_deltas = touched.setdefault(code, ([0], {}, {}))
+                pages[0] += sign
+                for name in elements:
+                    element_deltas[name] = element_deltas.get(name, 0) + sign
+                for marker in markers:
+                    marker_deltas[marker] = marker_deltas.get(marker, 0) + sign
+
+        scores = dict(self.scores)
+        for code, (pages, element_deltas, marker_deltas) in touched.items():
+            base = self.aggregate.criterion(code)
+            key_elements = dict(base.key_elements)
+            for name, delta in element_deltas.items():
+                key_elements[name] = key_elements.get(name, 0) + delta
+            content_types = dict(base.content_types)
+            for marker, delta in marker_deltas.items():
+                content_types[marker] = content_types.get(marker, 0) + delta
+            counts = CriterionCounts(
+                pages=base.pages + pages[0],
+                key_elements={n: c for n, c in key_elements.items() if c},
+                content_types=content_types,
+            )
+            scores[code] = self.matcher.score_criterion(code, counts)
+
+        fully_developed, average, excellence_ready = notebook_status(scores)
+        return SimulationResult(
+            scores=scores,
+            changes={
+                code: scores[code].score - self.scores[code].score
+                for code in self.matcher.criteria
+                if code in touched and scores[code].score != self.scores[code].score
+            },
+            fully_developed=fully_developed,
+            average_score=average,
+            excellence_ready=excellence_ready,
+        )
@@ -0,0 +1,169 @@
+"""Rubric counts kept up to date page by page, for live scoring."""
+
+from typing import Container, Dict, Iterable, Optional, Set, Tuple
+
+from ..models import PageAnalysis, RubricScore
+from .page_matrix import CriterionCounts
+from .rubric_matcher import RubricMatcher
+
+# What one page adds to the counts: (criteria, shown elements, content-type markers)
+Contribution = Tuple[Tuple[str, ...], Tuple[str, ...], Tuple[str, ...]]
+
+
+def page_contribution(
+    analysis: PageAnalysis, codes: Container[str], markers: Iterable[str]
+) -> Contribution:
+    """
+    What a page adds to the counts, as ``PageMatrix`` would count it.
+
+    Args:
+        analysis: Page to count
+        codes: Criterion codes being counted; other tags are ignored
+        markers: Content-type substrings to count the page by
+
+    Returns:
+        Tuple of (criteria, shown elements, matched markers)
+    """
+    content_type = analysis.content_type.lower()
+    return (
+        tuple(dict.fromkeys(c for c in analysis.rubric_categories if c in codes)),
+        tuple(name for name, found in analysis.key_elements.items() if found),
+        tuple(m for m in markers if m in content_type),
+    )
+
+
+class ScoringState:
+    """
+    Per-criterion page, element and content-type counts of a notebook.
+
+    Adding, removing or replacing a page applies only that page's delta to
+    the criteria it is tagged with, in time independent of the notebook's
+    size. Scores are re-derived lazily, and only for criteria whose counts
+    changed since they were last read. Pages are keyed by page number, so
+    adding a page number that is already present replaces it. Only what
+    each page contributes is kept, not its analysis, so a long run's state
+    stays small.
+    """
+
+    def __init__(self, matcher: RubricMatcher, page_analyses: Iterable[PageAnalysis] = ()):
+        """
+        Start from a set of pages.
+
+        Args:
+            matcher: Matcher whose criteria and score rules are used
+            page_analyses: Pages already in the notebook
+        """
+        self.matcher = matcher
+        self._contributions: Dict[int, Contribution] = {}
+        self._pages = {code: 0 for code in matcher.criteria}
+        self._elements: Dict[str, Dict[str, int]] = {code: {} for code in matcher.criteria}
+        self._types: Dict[str, Dict[str, int]] = {
+            code: dict.fromkeys(matcher.markers, 0) for code in matcher.criteria
+        }
+        self._scores: Dict[str, RubricScore] = {}
+        self._dirty: Set[str] = set(matcher.criteria)
+
+        for analysis in page_analyses:
+            self.add_page(analysis)
+
+    def __len__(self) -> int:
+        return len(self._contributions)
+
+    def __contains__(self, page_number: int) -> bool:
+        return page_number in self._contributions
+
+    def _contribution(self, analysis: PageAnalysis) -> Contribution:
+        """What a page adds to the counts."""
+        return page_contribution(analysis, self._pages, self.matcher.markers)
+
+    def _apply(self, contribution: Contribution, sign: int) -> None:
+        """Add (``sign`` 1) or take away (-1) a page's contribution."""
+        codes, elements, markers = contribution
+        for code in codes:
+            self._pages[code] += sign
+            counts = self._elements[code]
+            for name in elements:
+                count = counts.get(name, 0) + sign
+                if count:
+                    counts[name] = count
+                else:
+                    del counts[name]
+            types = self._types[code]
+            for marker in markers:
+                types[marker] += sign
+            self._dirty.add(code)
+
+    def add_page(self, analysis: PageAnalysis) -> None:
+        """
+        Add a page, replacing any page with the same number.
+
+        Args:
+            analysis: Page to add
+        """
+        if analysis.page_number in self._contributions:
+            self.replace_page(analysis)
+            return
+        contribution = self._contribution(analysis)
+        self._contributions[analysis.page_number] = contribution
+        self._apply(contribution, 1)
+
+    def remove_page(self, page_number: int) -> bool:
+        """
+        Remove a page.
+
+        Args:
+            page_number: Number of the page to remove
+
+        Returns:
+            Whether there was such a page
+        """
+        contribution = self._contributions.pop(page_number, None)
+        if contribution is None:
+            return False
+        self._apply(contribution, -1)
+        return True
+
+    def replace_page(self, analysis: PageAnalysis) -> None:
+        """
+        Replace a page's analysis (or add it, if its number is new).
+
+        Criteria are only marked changed if the page's tags, shown elements
+        or content-type markers differ from the replaced analysis.
+
+        Args:
+            analysis: New analysis of the page
+        """
+        new = self._contribution(analysis)
+        old = self._contributions.get(analysis.page_number)
+        self._contributions[analysis.page_number] = new
+        if old is not None:
+            if old == new:
+                return
+            self._apply(old, -1)
+        self._apply(new, 1)
+
+    def counts(self, code: str) -> CriterionCounts:
+        """Current counts over the pages tagged with a criterion."""
+        return CriterionCounts(
+            pages=self._pages[code],
+            key_elements=dict(self._elements[code]),
+            content_types=dict(self._types[code]),
+        )
+
+    def scores(self, codes: Optional[Iterable[str]] = None) -> Dict[str, RubricScore]:
+        """
+        Current scores, re-deriving only criteria whose counts changed.
+
+        Args:
+            codes: Criteria to return. If None, all criteria.
+
+        Returns:
+            Dict mapping criterion code to RubricScore, as
+            ``RubricMatcher.score_notebook`` would score the current pages
+        """
+        codes = list(self.matcher.criteria if codes is None else codes)
+        for code in codes:
+            if code in self._dirty:
+                self._scores[code] = self.matcher.score_criterion(code, self.counts(code))
+                self._dirty.discard(code)
+        return {code: self._scores[code] for code in codes}
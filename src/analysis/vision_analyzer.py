@@ -1,30 +1,440 @@
 """Vision analysis using GPT-4 Vision to analyze notebook pages."""
 
+import asyncio
 import base64
+import io
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import List, Optional
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
 
-from openai import OpenAI
 from PIL import Image
+from pydantic import BaseModel, Field, ValidationError
 
 from ..config import get_settings
-from ..models import NotebookPage, PageAnalysis
+from ..llm import create_chat_completion_async, get_client_factory, get_rate_limiter
+from ..models import KEY_ELEMENTS, NotebookPage, PageAnalysis
+from .analysis_cache import AnalysisCache
+from .image_preprocessor import ImagePreprocessor
+from .layout_detector import detect_layout
+from .pdf_source import PdfNotebook
+
+
+# Clarifications appended to some key elements' instructions
+KEY_ELEMENT_NOTES = {
+    "brainstorming": " (3+ design options shown)",
+    "testing_data": " (quantitative data present)",
+    "design_iteration": " (shows progression)",
+}
+# Key element instructions, in prompt order
+KEY_ELEMENT_PROMPTS = {
+    name: f"{name}: true/false{KEY_ELEMENT_NOTES.get(name, '')}" for name in KEY_ELEMENTS
+}
+
+ANALYSIS_TEMPLATE = """
+Analyze this VEX robotics engineering notebook page.
+
+Identify:
+1. Content Type (cover, table_of_contents, game_analysis, design, brainstorming,
+   testing, meeting_notes, build_documentation, programming, competition, appendix, other)
+2. Brief Summary (2-3 sentences)
+3. Relevant Rubric Categories (EN1-EN10):
+   - EN1: Identify the Challenge
+   - EN2: Student-Centered Policy
+   - EN3: Academic Honesty
+   - EN4: Brainstorm Solutions (3+ options with diagrams)
+   - EN5: Build and Program Documentation
+   - EN6: Test and Record Results
+   - EN7: Design Iterations
+   - EN8: Project Management
+   - EN9: Sequential Documentation (dates/timestamps)
+   - EN10: Appendices
+4. Key Elements Found:
+{key_elements}
+5. Notes (any important observations)
+"""
+
+TEXT_RESPONSE_FORMAT = """
+Respond in this exact format:
+CONTENT_TYPE: [type]
+SUMMARY: [summary]
+RUBRIC_CATEGORIES: [comma-separated EN codes]
+KEY_ELEMENTS: [JSON object with true/false for each element]
+NOTES: [observations]
+"""
+
+# Structured output mode: the response schema carries the field formats
+JSON_RESPONSE_FORMAT = """
+Respond with a JSON object with the fields content_type, summary,
+rubric_categories (EN codes), key_elements (true/false for each element
+above) and notes.
+"""
+
+# Content types and rubric codes allowed by the structured output schema
+CONTENT_TYPES = [
+    "cover",
+    "table_of_contents",
+    "game_analysis",
+    "design",
+    "brainstorming",
+    "testing",
+    "meeting_notes",
+    "build_documentation",
+    "programming",
+    "competition",
+    "appendix",
+    "other",
+]
+RUBRIC_CODES = [f"EN{i}" for i in range(1, 11)]
+
+# Fields a text-format response must contain to be parsed without defaults
+TEXT_RESPONSE_FIELDS = {"content_type", "summary", "rubric_categories", "key_elements"}
+
+# Requests sent per page when a structured response fails validation
+STRUCTURED_ATTEMPTS = 2
+
+
+def build_analysis_prompt(
+    settled: Optional[Dict[str, bool]] = None, structured: bool = False
+) -> str:
+    """
+    Build the single-page analysis prompt.
+
+    Args:
+        settled: Key elements already determined locally; they are left out
+            of the prompt so the model is not asked about them
+        structured: Ask for a JSON object (structured output mode) instead
+            of the line-based text format
+
+    Returns:
+        Prompt text
+    """
+    settled = settled or {}
+    lines = [
+        f"   - {text}" for name, text in KEY_ELEMENT_PROMPTS.items() if name not in settled
+    ]
+    response_format = JSON_RESPONSE_FORMAT if structured else TEXT_RESPONSE_FORMAT
+    return ANALYSIS_TEMPLATE.format(key_elements="\n".join(lines)) + response_format
+
+
+def analysis_schema(
+    settled: Optional[Dict[str, bool]] = None, confidence: bool = False
+) -> dict:
+    """
+    Build the JSON schema of one page analysis for structured output.
+
+    Args:
+        settled: Key elements determined locally, left out of the schema
+        confidence: Include the cascade first pass's confidence field
+
+    Returns:
+        JSON schema (strict mode compatible) for a single page
+    """
+    elements = [name for name in KEY_ELEMENT_PROMPTS if name not in (settled or {})]
+    properties = {
+        "content_type": {"type": "string", "enum": CONTENT_TYPES},
+        "summary": {"type": "string"},
+        "rubric_categories": {
+            "type": "array",
+            "items": {"type": "string", "enum": RUBRIC_CODES},
+        },
+        "key_elements": {
+            "type": "object",
+            "properties": {name: {"type": "boolean"} for name in elements},
+            "required": elements,
+            "additionalProperties": False,
+        },
+        "notes": {"type": "string"},
+    }
+    if confidence:
+        properties["confidence"] = {"type": "number"}
+    return {
+        "type": "object",
+        "properties": properties,
+        "required": list(properties),
+        "additionalProperties": False,
+    }
+
+
+class StructuredAnalysis(BaseModel):
+    """A page analysis as returned in structured output mode."""
+
+    content_type: str = Field(min_length=1)
+    summary: str
+    rubric_categories: List[str]
+    key_elements: Dict[str, bool]
+    notes: str = ""
+    confidence: Optional[float] = None
+
+
+class StructuredPack(BaseModel):
+    """A multi-page response in structured output mode."""
+
+    pages: List[StructuredAnalysis]
+
+
+def extract_json_object(text: str) -> Optional[str]:
+    """
+    Cut the outermost JSON object out of a response with extra text.
+
+    Handles the usual ways a JSON answer gets wrapped: markdown code fences
+    and a sentence before or after the object.
+
+    Args:
+        text: Raw response text
+
+    Returns:
+        The text from the first "{" to the last "}", or None if absent
+    """
+    start, end = text.find("{"), text.rfind("}")
+    if start == -1 or end < start:
+        return None
+    return text[start : end + 1]
+
+
+ANALYSIS_PROMPT = build_analysis_prompt()
+
+PACK_PROMPT = """
+You are given {count} VEX robotics engineering notebook pages, numbered 1 to {count}
+in the order the images appear. Analyze each page independently using the
+instructions below.
+{instructions}
+Repeat this format once per page. Start each page's block with a line
+containing only "=== PAGE <number> ===" (for example "=== PAGE 1 ===").
+"""
+
+JSON_PACK_PROMPT = """
+You are given {count} VEX robotics engineering notebook pages, numbered 1 to {count}
+in the order the images appear. Analyze each page independently using the
+instructions below.
+{instructions}
+Return a JSON object whose "pages" array holds one such object per page,
+in the order the images appear.
+"""
+
+# First-pass prompt for the cheap model in cascade mode; the extra
+# CONFIDENCE line decides whether the page is escalated.
+TRIAGE_SUFFIX = (
+    "CONFIDENCE: [0.0-1.0, how certain you are of the content type and key elements]\n"
+)
+JSON_TRIAGE_SUFFIX = (
+    "Also give confidence: 0.0-1.0, how certain you are of the content type "
+    "and key elements.\n"
+)
+TRIAGE_PROMPT = ANALYSIS_PROMPT + TRIAGE_SUFFIX
+
+PAGE_SEPARATOR = re.compile(r"^\s*=+\s*PAGE\s+(\d+)\s*=+\s*$", re.MULTILINE)
+
+
+TEXT_LAYER_TEMPLATE = """
+The page is given below as the text layer of the exported notebook PDF,
+in place of an image of the page.
+
+PAGE TEXT:
+{text}
+"""
+
+
+class PageText(str):
+    """Prompt text carrying a PDF page's text layer, sent in place of its image."""
+
+
+class ParseStats(BaseModel):
+    """How often page responses could not be parsed as returned."""
+
+    structured: bool = False
+    parsed: int = 0
+    malformed: int = 0
+    repaired: int = 0
+    retried: int = 0
+    failed: int = 0
+
+    @property
+    def malformed_rate(self) -> float:
+        """Share of page responses that failed a clean first parse."""
+        return self.malformed / self.parsed if self.parsed else 0.0
+
+
+class CascadeStats(BaseModel):
+    """Escalation counts for pages triaged by the cheap model."""
+
+    triaged: int = 0
+    escalated: int = 0
+    reasons: Dict[str, int] = Field(default_factory=dict)
+
+    def record(self, reason: Optional[str]) -> None:
+        """Count one triaged page and, if escalated, why."""
+        self.triaged += 1
+        if reason is not None:
+            self.escalated += 1
+            self.reasons[reason] = self.reasons.get(reason, 0) + 1
+
+
+class PipelineStats(BaseModel):
+    """Stage timings of one ``analyze_pages_async`` run."""
+
+    wall_seconds: float = 0.0
+    reader_workers: int = 0
+    network_workers: int = 0
+    queue_size: int = 0
+    # Reading, cache lookup, preprocessing and encoding
+    reader_busy_seconds: float = 0.0
+    # Readers waiting for room in the queue (the network stage is behind)
+    reader_blocked_seconds: float = 0.0
+    # Requests, including rate limiter waits and retries
+    network_busy_seconds: float = 0.0
+    # Network workers waiting for a prepared page (the reader stage is behind)
+    network_starved_seconds: float = 0.0
+    depth_samples: int = 0
+    depth_total: int = 0
+    depth_max: int = 0
+
+    def sample_depth(self, depth: int) -> None:
+        """Record the queue depth seen by a network worker."""
+        self.depth_samples += 1
+        self.depth_total += depth
+        self.depth_max = max(self.depth_max, depth)
+
+    @property
+    def mean_queue_depth(self) -> float:
+        return self.depth_total / self.depth_samples if self.depth_samples else 0.0
+
+    def _share(self, seconds: float, workers: int) -> float:
+        capacity = self.wall_seconds * workers
+        return seconds / capacity if capacity else 0.0
+
+    @property
+    def reader_utilization(self) -> float:
+        return self._share(self.reader_busy_seconds, self.reader_workers)
+
+    @property
+    def reader_blocked(self) -> float:
+        return self._share(self.reader_blocked_seconds, self.reader_workers)
+
+    @property
+    def network_utilization(self) -> float:
+        return self._share(self.network_busy_seconds, self.network_workers)
+
+    @property
+    def network_starved(self) -> float:
+        return self._share(self.network_starved_seconds, self.network_workers)
+
+    @property
+    def bottleneck(self) -> str:
+        """The stage the other one spent more of its time waiting on."""
+        return "reader" if self.network_starved > self.reader_blocked else "network"
 
 
 class VisionAnalyzer:
     """Analyzes notebook pages using GPT-4 Vision API."""
 
-    def __init__(self, api_key: Optional[str] = None):
+    def __init__(
+        self,
+        api_key: Optional[str] = None,
+        max_concurrency: Optional[int] = None,
+        cache: Optional[AnalysisCache] = None,
+        use_cache: Optional[bool] = None,
+        preprocessor: Optional[ImagePreprocessor] = None,
+        use_preprocessing: Optional[bool] = None,
+        detail: Optional[str] = None,
+        pages_per_request: Optional[int] = None,
+        cascade: Optional[bool] = None,
+        layout_hints: Optional[bool] = None,
+        pdf_text_layer: Optional[bool] = None,
+        structured_output: Optional[bool] = None,
+    ):
         """
         Initialize the vision analyzer.
 
         Args:
             api_key: OpenAI API key. If None, uses config settings.
+            max_concurrency: Maximum page requests in flight at once.
+                If None, uses config settings.
+            cache: AnalysisCache to consult before uploading a page. If None,
+                a default cache is opened when caching is enabled.
+            use_cache: Whether to use the analysis cache. If None, uses
+                config settings.
+            preprocessor: ImagePreprocessor applied before encoding. If None,
+                a default one is used when preprocessing is enabled.
+            use_preprocessing: Whether to preprocess images before upload.
+                If None, uses config settings.
+            detail: OpenAI image detail level ("low", "high" or "auto").
+                If None, uses config settings.
+            pages_per_request: Pages packed into each vision request by
+                ``analyze_pages``. If None, uses config settings.
+            cascade: Whether to triage pages with the cheap cascade model
+                first and escalate only uncertain or high-value pages. If
+                None, uses config settings.
+            layout_hints: Whether to detect key elements locally and leave
+                confidently detected ones out of single-page prompts. If
+                None, uses config settings.
+            pdf_text_layer: Whether PDF pages with a real text layer and no
+                pictures are sent as text instead of an image. If None, uses
+                config settings.
+            structured_output: Whether to request page analyses as JSON
+                matching a schema (response_format) instead of the
+                line-based text format. If None, uses config settings.
         """
         settings = get_settings()
         self.api_key = api_key or settings.openai_api_key
+        self.base_url = settings.openai_base_url
         self.model = settings.openai_model
-        self.client = OpenAI(api_key=self.api_key)
+        self.max_concurrency = max_concurrency or settings.max_concurrent_requests
+        self.async_client = get_client_factory().async_client(self.api_key, self.base_url)
+
+        if use_cache is None:
+            use_cache = settings.analysis_cache_enabled
+        if not use_cache:
+            self.cache = None
+        else:
+            self.cache = cache if cache is not None else AnalysisCache()
+
+        if use_preprocessing is None:
+            use_preprocessing = settings.image_preprocessing
+        if not use_preprocessing:
+            self.preprocessor = None
+        else:
+            self.preprocessor = (
+                preprocessor if preprocessor is not None else ImagePreprocessor()
+            )
+        self.detail = detail or settings.vision_detail
+        self.pages_per_request = pages_per_request or settings.pages_per_request
+        self.prefetch_workers = settings.prefetch_workers
+        self.prefetch_queue_size = settings.prefetch_queue_size
+        self.pipeline_stats = PipelineStats()
+
+        self.cascade = settings.cascade_enabled if cascade is None else cascade
+        self.cascade_model = settings.cascade_model
+        self.cascade_detail = settings.cascade_detail
+        self.cascade_min_confidence = settings.cascade_min_confidence
+        self.cascade_escalate_types = {
+            t.strip() for t in settings.cascade_escalate_types.split(",") if t.strip()
+        }
+        self.cascade_stats = CascadeStats()
+
+        self.layout_hints = (
+            settings.layout_hints_enabled if layout_hints is None else layout_hints
+        )
+        self.layout_min_confidence = settings.layout_min_confidence
+
+        self.pdf_text_layer = (
+            settings.pdf_text_layer if pdf_text_layer is None else pdf_text_layer
+        )
+        self.pdf_render_long_edge = settings.pdf_render_long_edge
+        self._pdf_documents: Dict[Path, PdfNotebook] = {}
+        self._pdf_lock = threading.Lock()
+
+        self.structured_output = (
+            settings.structured_output if structured_output is None else structured_output
+        )
+        self.parse_stats = ParseStats(structured=self.structured_output)
+
+    @property
+    def image_mime_type(self) -> str:
+        """MIME type of the images sent to the API."""
+        return self.preprocessor.mime_type if self.preprocessor else "image/png"
 
     def encode_image(self, image_path: Path) -> str:
         """
@@ -37,96 +447,704 @@ class VisionAnalyzer:
             Base64 encoded image string
         """
         with open(image_path, "rb") as image_file:
-            return base64.b64encode(image_file.read()).decode("utf-8")
+            return self._encode_bytes(image_file.read())
+
+    def _encode_bytes(self, image_bytes: bytes, preprocess: bool = True) -> str:
+        """Preprocess (if enabled) and base64-encode image bytes."""
+        if preprocess and self.preprocessor is not None:
+            image_bytes = self.preprocessor.process(image_bytes)
+        return base64.b64encode(image_bytes).decode("utf-8")
+
+    def _cache_key(
+        self,
+        image_hash: str,
+        pack_size: int = 1,
+        settled: Optional[Dict[str, bool]] = None,
+    ) -> str:
+        """
+        Build the cache key for a page image under the current settings.
+
+        Packed results are keyed by pack size so that runs comparing pack
+        sizes never read each other's results. Pages with locally settled
+        key elements are keyed by the shortened prompt they were sent with.
+        """
+        image_settings = self.preprocessor.cache_tag if self.preprocessor else "raw"
+        extra = [image_settings, self.detail]
+        if pack_size > 1:
+            extra.append(f"pack:{pack_size}")
+        return AnalysisCache.make_key(
+            image_hash, self._analysis_prompt(settled), self.model, *extra
+        )
+
+    def _triage_cache_key(
+        self, image_hash: str, settled: Optional[Dict[str, bool]] = None
+    ) -> str:
+        """Build the cache key for a cascade first-pass result."""
+        image_settings = self.preprocessor.cache_tag if self.preprocessor else "raw"
+        return AnalysisCache.make_key(
+            image_hash,
+            self._triage_prompt(settled),
+            self.cascade_model,
+            image_settings,
+            self.cascade_detail,
+        )
+
+    def _analysis_prompt(self, settled: Optional[Dict[str, bool]] = None) -> str:
+        """Single-page prompt in the analyzer's response format."""
+        return build_analysis_prompt(settled, self.structured_output)
+
+    def _triage_prompt(self, settled: Optional[Dict[str, bool]] = None) -> str:
+        """Cascade first-pass prompt in the analyzer's response format."""
+        suffix = JSON_TRIAGE_SUFFIX if self.structured_output else TRIAGE_SUFFIX
+        return self._analysis_prompt(settled) + suffix
+
+    def _response_format(
+        self,
+        settled: Optional[Dict[str, bool]] = None,
+        confidence: bool = False,
+        pack: bool = False,
+    ) -> dict:
+        """
+        Extra chat completion arguments requesting structured output.
+
+        Args:
+            settled: Key elements left out of the prompt
+            confidence: Ask for the cascade first pass's confidence
+            pack: Ask for a multi-page response
+
+        Returns:
+            ``{"response_format": ...}``, or an empty dict in text mode
+        """
+        if not self.structured_output:
+            return {}
+        schema = analysis_schema(settled, confidence)
+        if pack:
+            schema = {
+                "type": "object",
+                "properties": {"pages": {"type": "array", "items": schema}},
+                "required": ["pages"],
+                "additionalProperties": False,
+            }
+        return {
+            "response_format": {
+                "type": "json_schema",
+                "json_schema": {
+                    "name": "notebook_pages" if pack else "page_analysis",
+                    "strict": True,
+                    "schema": schema,
+                },
+            }
+        }
+
+    def _settled_elements(self, image_bytes: bytes) -> Dict[str, bool]:
+        """Key elements detected locally with enough confidence to skip asking."""
+        try:
+            hints = detect_layout(image_bytes)
+        except Exception:
+            return {}
+        return hints.settled(self.layout_min_confidence)
+
+    def _pdf_document(self, pdf_path: Path) -> PdfNotebook:
+        """Open a PDF notebook once and share it between reader threads."""
+        with self._pdf_lock:
+            if pdf_path not in self._pdf_documents:
+                self._pdf_documents[pdf_path] = PdfNotebook(pdf_path)
+            return self._pdf_documents[pdf_path]
+
+    def _render_pdf_page(self, page: NotebookPage) -> bytes:
+        """
+        Rasterize a PDF page straight to the bytes that are uploaded.
+
+        The page is rendered at the upload resolution and, when
+        preprocessing is enabled, trimmed and encoded here, so it is never
+        decoded or resized a second time.
+        """
+        long_edge = (
+            self.preprocessor.max_long_edge
+            if self.preprocessor is not None
+            else self.pdf_render_long_edge
+        )
+        image = self._pdf_document(page.file_path).render(page.pdf_page_index, long_edge)
+        if self.preprocessor is not None:
+            return self.preprocessor.encode(self.preprocessor.prepare(image))
+        buffer = io.BytesIO()
+        image.save(buffer, format="PNG")
+        return buffer.getvalue()
+
+    def _read_image(self, page: NotebookPage) -> bytes:
+        """Return the raw image bytes for a page."""
+        if page.image_data is not None:
+            return page.image_data
+        if page.pdf_page_index is not None:
+            return self._render_pdf_page(page)
+        return page.file_path.read_bytes()
+
+    def _page_text(self, page: NotebookPage, pack_size: int) -> Optional[PageText]:
+        """The text to send in place of a PDF page's image, if it qualifies."""
+        if page.pdf_page_index is None or not self.pdf_text_layer or pack_size != 1:
+            return None
+        text = self._pdf_document(page.file_path).text_layer(page.pdf_page_index)
+        if text is None:
+            return None
+        return PageText(TEXT_LAYER_TEMPLATE.format(text=text))
+
+    def _prepare_page(
+        self, page: NotebookPage, pack_size: int = 1
+    ) -> Tuple[str, Optional[PageAnalysis], Optional[str], Dict[str, bool]]:
+        """
+        Read a page, consult the cache and encode the image only on a miss.
+
+        PDF pages are rendered here, one at a time. A PDF page that can be
+        sent as text is never rendered: its text layer is used (and hashed
+        for the cache) in place of the image.
+
+        Args:
+            page: NotebookPage to prepare
+            pack_size: Pack size of the run, for the cache key
+
+        Returns:
+            Tuple of (image hash, cached analysis or None,
+            base64 image (or PageText) or None on a cache hit, key elements
+            settled locally)
+        """
+        page_text = self._page_text(page, pack_size)
+        if page_text is not None:
+            image_bytes = None
+            image_hash = AnalysisCache.hash_image(page_text.encode())
+        else:
+            image_bytes = self._read_image(page)
+            image_hash = AnalysisCache.hash_image(image_bytes)
+
+        # Packed prompts are shared by several pages, so hints apply to
+        # single-page requests only
+        settled = {}
+        if self.layout_hints and pack_size == 1 and image_bytes is not None:
+            settled = self._settled_elements(image_bytes)
+
+        if self.cache is not None:
+            cached = self.cache.get(
+                self._cache_key(image_hash, pack_size, settled), page.page_number
+            )
+            if cached is None and self.cascade:
+                # A first-pass result that needed no escalation is final
+                triage = self.cache.get(
+                    self._triage_cache_key(image_hash, settled), page.page_number
+                )
+                if triage is not None and self._escalation_reason(triage) is None:
+                    cached = triage
+            if cached is not None:
+                return image_hash, cached, None, settled
+
+        if page_text is not None:
+            return image_hash, None, page_text, settled
+        # Rendered PDF pages are already preprocessed
+        return (
+            image_hash,
+            None,
+            self._encode_bytes(image_bytes, preprocess=page.pdf_page_index is None),
+            settled,
+        )
+
+    def _store_result(
+        self,
+        image_hash: str,
+        analysis: PageAnalysis,
+        pack_size: int = 1,
+        settled: Optional[Dict[str, bool]] = None,
+    ) -> None:
+        """Save a successful analysis to the cache."""
+        if self.cache is None or analysis.content_type == "error":
+            return
+        self.cache.put(
+            self._cache_key(image_hash, pack_size, settled),
+            image_hash,
+            self.model,
+            analysis,
+        )
+
+    def _store_triage(
+        self,
+        image_hash: str,
+        analysis: PageAnalysis,
+        settled: Optional[Dict[str, bool]] = None,
+    ) -> None:
+        """Save a final cascade first-pass result to the cache."""
+        if self.cache is None:
+            return
+        self.cache.put(
+            self._triage_cache_key(image_hash, settled),
+            image_hash,
+            self.cascade_model,
+            analysis,
+        )
+
+    def _image_part(self, base64_image: str, detail: Optional[str] = None) -> dict:
+        """Build the image content part for one page."""
+        return {
+            "type": "image_url",
+            "image_url": {
+                "url": f"data:{self.image_mime_type};base64,{base64_image}",
+                "detail": detail or self.detail,
+            },
+        }
+
+    def _build_messages(
+        self,
+        base64_image: str,
+        prompt: str = ANALYSIS_PROMPT,
+        detail: Optional[str] = None,
+    ) -> List[dict]:
+        """
+        Build the chat messages for a single page analysis request.
+
+        Args:
+            base64_image: Base64 encoded page image, or the PageText of a
+                PDF page sent as text
+            prompt: Instructions sent with the image
+            detail: Image detail level. If None, uses the analyzer default.
+
+        Returns:
+            List of chat messages
+        """
+        if isinstance(base64_image, PageText):
+            return [{"role": "user", "content": prompt + base64_image}]
+        return [
+            {
+                "role": "user",
+                "content": [
+                    {"type": "text", "text": prompt},
+                    self._image_part(base64_image, detail),
+                ],
+            }
+        ]
+
+    def _build_pack_messages(self, base64_images: List[str]) -> List[dict]:
+        """
+        Build the chat messages for a multi-page analysis request.
+
+        Args:
+            base64_images: Base64 encoded page images, in pack order
+
+        Returns:
+            List of chat messages
+        """
+        template = JSON_PACK_PROMPT if self.structured_output else PACK_PROMPT
+        prompt = template.format(
+            count=len(base64_images), instructions=self._analysis_prompt()
+        )
+        return [
+            {
+                "role": "user",
+                "content": [{"type": "text", "text": prompt}]
+                + [self._image_part(image) for image in base64_images],
+            }
+        ]
+
+    def _error_analysis(self, page_number: int, error: Exception) -> PageAnalysis:
+        """Build the placeholder PageAnalysis returned when a request fails."""
+        return PageAnalysis(
+            page_number=page_number,
+            content_type="error",
+            summary=f"Error analyzing page: {str(error)}",
+            rubric_categories=[],
+            key_elements={},
+            notes=f"Analysis failed: {str(error)}",
+        )
 
     def analyze_page(self, page: NotebookPage) -> PageAnalysis:
         """
         Analyze a single notebook page using GPT-4 Vision.
 
+        Runs ``analyze_page_async`` to completion, so cascade triage,
+        structured-output retries and parse stats follow the one code path
+        batch runs use. Must not be called from inside a running event
+        loop.
+
+        Args:
+            page: NotebookPage to analyze
+
+        Returns:
+            PageAnalysis with findings
+        """
+        return self._run(self.analyze_page_async(page))
+
+    async def analyze_page_async(self, page: NotebookPage) -> PageAnalysis:
+        """
+        Analyze a single notebook page without blocking the event loop.
+
         Args:
             page: NotebookPage to analyze
 
         Returns:
             PageAnalysis with findings
         """
-        # Encode image
-        base64_image = self.encode_image(page.file_path)
-
-        # Create prompt for analysis
-        prompt = """
-        Analyze this VEX robotics engineering notebook page.
-
-        Identify:
-        1. Content Type (cover, table_of_contents, game_analysis, design, brainstorming,
-           testing, meeting_notes, build_documentation, programming, competition, appendix, other)
-        2. Brief Summary (2-3 sentences)
-        3. Relevant Rubric Categories (EN1-EN10):
-           - EN1: Identify the Challenge
-           - EN2: Student-Centered Policy
-           - EN3: Academic Honesty
-           - EN4: Brainstorm Solutions (3+ options with diagrams)
-           - EN5: Build and Program Documentation
-           - EN6: Test and Record Results
-           - EN7: Design Iterations
-           - EN8: Project Management
-           - EN9: Sequential Documentation (dates/timestamps)
-           - EN10: Appendices
-        4. Key Elements Found:
-           - brainstorming: true/false (3+ design options shown)
-           - decision_matrix: true/false
-           - cad_drawings: true/false
-           - testing_data: true/false (quantitative data present)
-           - meeting_notes: true/false
-           - dates_timestamps: true/false
-           - design_iteration: true/false (shows progression)
-           - failure_documentation: true/false
-        5. Notes (any important observations)
-
-        Respond in this exact format:
-        CONTENT_TYPE: [type]
-        SUMMARY: [summary]
-        RUBRIC_CATEGORIES: [comma-separated EN codes]
-        KEY_ELEMENTS: [JSON object with true/false for each element]
-        NOTES: [observations]
+        prepared = await asyncio.to_thread(self._prepare_page, page)
+        return await self._analyze_prepared_async(page, prepared)
+
+    async def _analyze_prepared_async(
+        self,
+        page: NotebookPage,
+        prepared: Tuple[str, Optional[PageAnalysis], Optional[str], Dict[str, bool]],
+    ) -> PageAnalysis:
+        """
+        Analyze a page whose image was already read and encoded.
+
+        Args:
+            page: NotebookPage to analyze
+            prepared: Result of ``_prepare_page`` for the page
+
+        Returns:
+            PageAnalysis with findings
         """
+        image_hash, cached, base64_image, settled = prepared
+        if cached is not None:
+            return cached
+
+        if self.cascade:
+            try:
+                response = await create_chat_completion_async(
+                    self.async_client, **self._triage_request(page, base64_image, settled)
+                )
+                triage = self._parse_page_response(
+                    page.page_number,
+                    response.choices[0].message.content,
+                    self.cascade_model,
+                    settled,
+                )
+            except Exception as e:
+                triage = self._error_analysis(page.page_number, e)
+            if not self._should_escalate(triage):
+                await asyncio.to_thread(self._store_triage, image_hash, triage, settled)
+                return triage
+
+        return await self._request_page_async(
+            page, image_hash, base64_image, settled=settled
+        )
+
+    def _triage_request(
+        self,
+        page: NotebookPage,
+        base64_image: str,
+        settled: Optional[Dict[str, bool]] = None,
+    ) -> dict:
+        """Chat completion arguments for a cascade first pass."""
+        return {
+            "tag": "cascade_triage",
+            "pages": [page.page_number],
+            "model": self.cascade_model,
+            "messages": self._build_messages(
+                base64_image, self._triage_prompt(settled), self.cascade_detail
+            ),
+            "max_tokens": 1000,
+            **self._response_format(settled, confidence=True),
+        }
+
+    def _page_request(
+        self,
+        page: NotebookPage,
+        base64_image: str,
+        settled: Optional[Dict[str, bool]] = None,
+    ) -> dict:
+        """Chat completion arguments for a single-page analysis."""
+        return {
+            "tag": "analyze_page",
+            "pages": [page.page_number],
+            "model": self.model,
+            "messages": self._build_messages(base64_image, self._analysis_prompt(settled)),
+            "max_tokens": 1000,
+            **self._response_format(settled),
+        }
 
+    def _escalation_reason(self, analysis: PageAnalysis) -> Optional[str]:
+        """
+        Decide whether a first-pass result needs the expensive model.
+
+        Args:
+            analysis: Result from the cascade model
+
+        Returns:
+            Reason for escalating ("error", "unparseable", "low_confidence"
+            or "high_value"), or None if the result can be kept
+        """
+        if analysis.content_type == "error":
+            return "error"
+        if analysis.content_type == "unknown" or analysis.confidence is None:
+            return "unparseable"
+        if analysis.confidence < self.cascade_min_confidence:
+            return "low_confidence"
+        if analysis.content_type in self.cascade_escalate_types:
+            return "high_value"
+        return None
+
+    def _should_escalate(self, analysis: PageAnalysis) -> bool:
+        """Record a first-pass result in the cascade stats; True to escalate."""
+        reason = self._escalation_reason(analysis)
+        self.cascade_stats.record(reason)
+        return reason is not None
+
+    async def _request_page_async(
+        self,
+        page: NotebookPage,
+        image_hash: str,
+        base64_image: str,
+        pack_size: int = 1,
+        settled: Optional[Dict[str, bool]] = None,
+    ) -> PageAnalysis:
+        """
+        Send one prepared page to the API and parse the result.
+
+        In structured output mode, a response that fails validation and
+        cannot be repaired is requested again once, for this page only.
+        """
         try:
-            response = self.client.chat.completions.create(
-                model=self.model,
-                messages=[
-                    {
-                        "role": "user",
-                        "content": [
-                            {"type": "text", "text": prompt},
-                            {
-                                "type": "image_url",
-                                "image_url": {
-                                    "url": f"data:image/png;base64,{base64_image}"
-                                },
-                            },
-                        ],
-                    }
-                ],
-                max_tokens=1000,
+            attempts = STRUCTURED_ATTEMPTS if self.structured_output else 1
+            for attempt in range(1, attempts + 1):
+                response = await create_chat_completion_async(
+                    self.async_client, **self._page_request(page, base64_image, settled)
+                )
+                try:
+                    analysis = self._parse_page_response(
+                        page.page_number,
+                        response.choices[0].message.content,
+                        settled=settled,
+                    )
+                    break
+                except ValueError:
+                    if attempt == attempts:
+                        self.parse_stats.failed += 1
+                        raise
+                    self.parse_stats.retried += 1
+            await asyncio.to_thread(
+                self._store_result, image_hash, analysis, pack_size, settled
             )
-
-            # Parse response
-            content = response.choices[0].message.content
-            return self._parse_analysis_response(page.page_number, content)
+            return analysis
 
         except Exception as e:
-            # Return basic analysis on error
-            return PageAnalysis(
-                page_number=page.page_number,
-                content_type="error",
-                summary=f"Error analyzing page: {str(e)}",
-                rubric_categories=[],
-                key_elements={},
-                notes=f"Analysis failed: {str(e)}",
+            return self._error_analysis(page.page_number, e)
+
+    async def analyze_pack_async(
+        self, pages: List[NotebookPage]
+    ) -> List[PageAnalysis]:
+        """
+        Analyze several pages with a single vision request.
+
+        Cached pages are skipped. If the packed response cannot be split
+        into one well-formed analysis per page, the uncached pages are
+        re-sent one at a time.
+
+        Args:
+            pages: NotebookPages to analyze together
+
+        Returns:
+            List of PageAnalysis results in the same order as ``pages``
+        """
+        pack_size = len(pages)
+        prepared = await asyncio.to_thread(
+            lambda: [self._prepare_page(page, pack_size) for page in pages]
+        )
+        return await self._analyze_pack_prepared_async(pages, prepared)
+
+    async def _analyze_pack_prepared_async(
+        self, pages: List[NotebookPage], prepared: List[tuple]
+    ) -> List[PageAnalysis]:
+        """
+        Analyze a pack whose images were already read and encoded.
+
+        Args:
+            pages: NotebookPages to analyze together
+            prepared: Result of ``_prepare_page`` for each page
+
+        Returns:
+            List of PageAnalysis results in the same order as ``pages``
+        """
+        pack_size = len(pages)
+        results = {}
+        misses = []
+        for page, (image_hash, cached, base64_image, settled) in zip(pages, prepared):
+            if cached is not None:
+                results[page.page_number] = cached
+            else:
+                misses.append((page, image_hash, base64_image, settled))
+
+        if len(misses) == 1:
+            page, image_hash, base64_image, settled = misses[0]
+            results[page.page_number] = await self._request_page_async(
+                page, image_hash, base64_image, pack_size, settled
+            )
+        elif misses:
+            try:
+                response = await create_chat_completion_async(
+                    self.async_client,
+                    tag="analyze_pack",
+                    pages=[page.page_number for page, _, _, _ in misses],
+                    model=self.model,
+                    messages=self._build_pack_messages(
+                        [base64_image for _, _, base64_image, _ in misses]
+                    ),
+                    max_tokens=1000 * len(misses),
+                    **self._response_format(pack=True),
+                )
+                analyses = self._parse_packed_response(
+                    [page.page_number for page, _, _, _ in misses],
+                    response.choices[0].message.content,
+                )
+                for (page, image_hash, _, _), analysis in zip(misses, analyses):
+                    results[page.page_number] = analysis
+                    await asyncio.to_thread(
+                        self._store_result, image_hash, analysis, pack_size
+                    )
+
+            except Exception:
+                # Fall back to one request per page, one at a time so the
+                # pack never holds more than its single in-flight slot.
+                # Results are stored under the pack's cache key, like the
+                # pages answered by the packed request.
+                for page, image_hash, base64_image, settled in misses:
+                    results[page.page_number] = await self._request_page_async(
+                        page, image_hash, base64_image, pack_size, settled
+                    )
+
+        return [results[page.page_number] for page in pages]
+
+    def _parse_packed_response(
+        self, page_numbers: List[int], response: str
+    ) -> List[PageAnalysis]:
+        """
+        Split a multi-page response into one PageAnalysis per page.
+
+        Args:
+            page_numbers: Notebook page numbers, in the order the images were sent
+            response: Raw response text from API
+
+        Returns:
+            Parsed PageAnalysis objects in the same order as ``page_numbers``
+
+        Raises:
+            ValueError: If the response does not contain exactly one
+                well-formed block per page
+        """
+        if self.structured_output:
+            return self._parse_structured_pack(page_numbers, response)
+
+        parts = PAGE_SEPARATOR.split(response)
+        blocks = dict(zip(parts[1::2], parts[2::2]))
+
+        analyses = []
+        for index, page_number in enumerate(page_numbers, start=1):
+            block = blocks.get(str(index))
+            if block is None or "CONTENT_TYPE:" not in block:
+                raise ValueError(f"Packed response is missing page {index}")
+            analyses.append(self._parse_analysis_response(page_number, block))
+
+        if len(blocks) != len(page_numbers):
+            raise ValueError(
+                f"Packed response has {len(blocks)} pages, expected {len(page_numbers)}"
+            )
+
+        return analyses
+
+    def _parse_structured_pack(
+        self, page_numbers: List[int], response: str
+    ) -> List[PageAnalysis]:
+        """Validate a structured multi-page response (see ``_parse_packed_response``)."""
+        self.parse_stats.parsed += len(page_numbers)
+        pack = self._validate_structured(StructuredPack, response, len(page_numbers))
+        if len(pack.pages) != len(page_numbers):
+            self.parse_stats.malformed += len(page_numbers)
+            raise ValueError(
+                f"Packed response has {len(pack.pages)} pages, expected {len(page_numbers)}"
             )
+        return [
+            self._structured_analysis(page_number, parsed)
+            for page_number, parsed in zip(page_numbers, pack.pages)
+        ]
+
+    def _validate_structured(
+        self, model_class: type, response: str, pages: int = 1
+    ) -> BaseModel:
+        """
+        Validate a structured response, repairing wrapped JSON if needed.
+
+        Args:
+            model_class: Pydantic model the response must match
+            response: Raw response text from API
+            pages: Pages the response covers, for the parse stats
+
+        Returns:
+            Validated model instance
+
+        Raises:
+            ValueError: If the response does not match even after repair
+        """
+        try:
+            return model_class.model_validate_json(response)
+        except ValidationError:
+            self.parse_stats.malformed += pages
+            candidate = extract_json_object(response)
+            if candidate is None or candidate == response.strip():
+                raise
+        # Repair: the object was wrapped in code fences or prose
+        parsed = model_class.model_validate_json(candidate)
+        self.parse_stats.repaired += pages
+        return parsed
+
+    def _structured_analysis(
+        self,
+        page_number: int,
+        parsed: StructuredAnalysis,
+        model: Optional[str] = None,
+        settled: Optional[Dict[str, bool]] = None,
+    ) -> PageAnalysis:
+        """Build the PageAnalysis for a validated structured response."""
+        confidence = parsed.confidence
+        return PageAnalysis(
+            page_number=page_number,
+            content_type=parsed.content_type,
+            summary=parsed.summary,
+            rubric_categories=parsed.rubric_categories,
+            key_elements={**parsed.key_elements, **(settled or {})},
+            notes=parsed.notes,
+            confidence=None if confidence is None else min(1.0, max(0.0, confidence)),
+            analyzed_by=model or self.model,
+        )
+
+    def _parse_page_response(
+        self,
+        page_number: int,
+        response: str,
+        model: Optional[str] = None,
+        settled: Optional[Dict[str, bool]] = None,
+    ) -> PageAnalysis:
+        """
+        Parse a single-page response in the analyzer's response format.
+
+        Args:
+            page_number: Page number being analyzed
+            response: Raw response text from API
+            model: Model that produced the response. If None, the analyzer's
+                model.
+            settled: Key elements detected locally, merged into the result
+
+        Returns:
+            Parsed PageAnalysis object
+
+        Raises:
+            ValueError: In structured output mode, if the response does not
+                match the schema even after repair
+        """
+        if not self.structured_output:
+            return self._parse_analysis_response(page_number, response, model, settled)
+
+        self.parse_stats.parsed += 1
+        parsed = self._validate_structured(StructuredAnalysis, response)
+        return self._structured_analysis(page_number, parsed, model, settled)
 
     def _parse_analysis_response(
-        self, page_number: int, response: str
+        self,
+        page_number: int,
+        response: str,
+        model: Optional[str] = None,
+        settled: Optional[Dict[str, bool]] = None,
     ) -> PageAnalysis:
         """
         Parse the GPT-4 Vision response into PageAnalysis.
@@ -134,6 +1152,10 @@ class VisionAnalyzer:
         Args:
             page_number: Page number being analyzed
             response: Raw response text from API
+            model: Model that produced the response. If None, the analyzer's
+                model.
+            settled: Key elements detected locally and left out of the
+                prompt; merged into the parsed key elements
 
         Returns:
             Parsed PageAnalysis object
@@ -161,45 +1183,206 @@ class VisionAnalyzer:
                     try:
                         data["key_elements"] = json.loads(value)
                     except json.JSONDecodeError:
-                        data["key_elements"] = {}
+                        pass
                 elif key == "NOTES":
                     data["notes"] = value
+                elif key == "CONFIDENCE":
+                    try:
+                        data["confidence"] = min(1.0, max(0.0, float(value)))
+                    except ValueError:
+                        pass
+
+        # Missing fields fall back to defaults below; count them so the
+        # damage is visible in the run report
+        self.parse_stats.parsed += 1
+        if not TEXT_RESPONSE_FIELDS <= data.keys():
+            self.parse_stats.malformed += 1
 
         return PageAnalysis(
             page_number=page_number,
             content_type=data.get("content_type", "unknown"),
             summary=data.get("summary", "No summary available"),
             rubric_categories=data.get("rubric_categories", []),
-            key_elements=data.get("key_elements", {}),
+            key_elements={**data.get("key_elements", {}), **(settled or {})},
             notes=data.get("notes", ""),
+            confidence=data.get("confidence"),
+            analyzed_by=model or self.model,
+        )
+
+    async def analyze_pages_async(
+        self,
+        pages: List[NotebookPage],
+        max_concurrency: Optional[int] = None,
+        on_result: Optional[Callable[[PageAnalysis], None]] = None,
+        pages_per_request: Optional[int] = None,
+        collect_results: bool = True,
+    ) -> List[PageAnalysis]:
+        """
+        Analyze multiple pages concurrently with bounded in-flight requests.
+
+        Runs as a two-stage pipeline so requests never wait on disk or CPU:
+        reader threads read, preprocess and encode upcoming packs into a
+        bounded queue while a fixed pool of network workers sends them.
+        Only the queued and in-flight packs are held in memory. Stage
+        timings are left in ``pipeline_stats``.
+
+        Args:
+            pages: List of NotebookPages to analyze
+            max_concurrency: Maximum requests in flight. If None, uses the
+                analyzer default.
+            on_result: Optional callback invoked as each page completes
+                (in completion order, not page order)
+            pages_per_request: Pages packed into each request. If None, uses
+                the analyzer default. Ignored in cascade mode.
+            collect_results: Whether to keep and return every analysis. Pass
+                False when ``on_result`` persists results itself.
+
+        Returns:
+            List of PageAnalysis results in the same order as ``pages``
+            (empty when ``collect_results`` is False)
+        """
+        # Cascade triage is per page, so packing does not apply
+        pack_size = 1 if self.cascade else pages_per_request or self.pages_per_request
+        packs = enumerate(
+            pages[i : i + pack_size] for i in range(0, len(pages), pack_size)
         )
+        concurrency = max_concurrency or self.max_concurrency
+        # The shared limiter would otherwise hold extra workers to its default
+        get_rate_limiter().allow_concurrency(concurrency)
+        readers = max(1, self.prefetch_workers)
+        queue: asyncio.Queue = asyncio.Queue(maxsize=max(1, self.prefetch_queue_size))
+        stats = PipelineStats(
+            reader_workers=readers,
+            network_workers=concurrency,
+            queue_size=queue.maxsize,
+        )
+        self.pipeline_stats = stats
+        results = {}
+        loop = asyncio.get_running_loop()
+
+        def prepare(pack: List[NotebookPage]) -> list:
+            return [self._prepare_page(page, len(pack)) for page in pack]
+
+        async def reader(executor: ThreadPoolExecutor) -> None:
+            for index, pack in packs:
+                started = time.perf_counter()
+                try:
+                    prepared = await loop.run_in_executor(executor, prepare, pack)
+                except Exception as e:
+                    prepared = e
+                queued = time.perf_counter()
+                stats.reader_busy_seconds += queued - started
+
+                await queue.put((index, pack, prepared))
+                stats.reader_blocked_seconds += time.perf_counter() - queued
+
+        async def network_worker() -> None:
+            while True:
+                waiting = time.perf_counter()
+                stats.sample_depth(queue.qsize())
+                item = await queue.get()
+                started = time.perf_counter()
+                if item is None:
+                    return
+                stats.network_starved_seconds += started - waiting
+
+                index, pack, prepared = item
+                if isinstance(prepared, Exception):
+                    analyses = [
+                        self._error_analysis(page.page_number, prepared) for page in pack
+                    ]
+                elif len(pack) == 1:
+                    analyses = [await self._analyze_prepared_async(pack[0], prepared[0])]
+                else:
+                    analyses = await self._analyze_pack_prepared_async(pack, prepared)
+                stats.network_busy_seconds += time.perf_counter() - started
+
+                if on_result:
+                    for analysis in analyses:
+                        on_result(analysis)
+                if collect_results:
+                    results[index] = analyses
+
+        async def read_all(executor: ThreadPoolExecutor) -> None:
+            await asyncio.gather(*(reader(executor) for _ in range(readers)))
+            for _ in range(concurrency):
+                await queue.put(None)
+
+        start = time.perf_counter()
+        with ThreadPoolExecutor(
+            max_workers=readers, thread_name_prefix="page-reader"
+        ) as executor:
+            await asyncio.gather(
+                read_all(executor), *(network_worker() for _ in range(concurrency))
+            )
+        stats.wall_seconds = time.perf_counter() - start
+
+        return [analysis for index in sorted(results) for analysis in results[index]]
+
+    def _run(self, coroutine: Awaitable[Any]) -> Any:
+        """Run a coroutine to completion with ``asyncio.run``."""
+
+        async def run() -> Any:
+            try:
+                return await coroutine
+            finally:
+                # The async connection pool is bound to this event loop, so
+                # close it and start fresh for the next asyncio.run().
+                await self.async_client.close()
+                self.async_client = get_client_factory().async_client(
+                    self.api_key, self.base_url
+                )
+
+        return asyncio.run(run())
 
     def analyze_pages(
-        self, pages: List[NotebookPage], batch_size: int = 10
+        self,
+        pages: List[NotebookPage],
+        max_concurrency: Optional[int] = None,
+        on_result: Optional[Callable[[PageAnalysis], None]] = None,
+        pages_per_request: Optional[int] = None,
+        collect_results: bool = True,
     ) -> List[PageAnalysis]:
         """
         Analyze multiple pages.
 
+        Runs the async analysis engine to completion, so it must not be
+        called from inside a running event loop (use
+        ``analyze_pages_async`` there instead).
+
         Args:
             pages: List of NotebookPages to analyze
-            batch_size: Number of pages to analyze in each batch
+            max_concurrency: Maximum requests in flight. If None, uses the
+                analyzer default.
+            on_result: Optional callback invoked as each page completes
+            pages_per_request: Pages packed into each request. If None, uses
+                the analyzer default. Ignored in cascade mode.
+            collect_results: Whether to keep and return every analysis
 
         Returns:
-            List of PageAnalysis results
+            List of PageAnalysis results in page order
         """
-        analyses = []
 
-        for i in range(0, len(pages), batch_size):
-            batch = pages[i : i + batch_size]
-            print(
-                f"Analyzing pages {i + 1}-{min(i + batch_size, len(pages))} of {len(pages)}..."
+        return self._run(
+            self.analyze_pages_async(
+                pages, max_concurrency, on_result, pages_per_request, collect_results
             )
+        )
+
+    def analyze_pdf(self, pdf_path: Path) -> List[PageAnalysis]:
+        """
+        Analyze every page of an exported notebook PDF.
 
-            for page in batch:
-                analysis = self.analyze_page(page)
-                analyses.append(analysis)
+        Pages are rendered one at a time by the pipeline's reader threads,
+        so memory stays bounded by the prefetch queue, not the page count.
 
-        return analyses
+        Args:
+            pdf_path: Path to the notebook PDF
+
+        Returns:
+            List of PageAnalysis results, numbered by page in the PDF
+        """
+        return self.analyze_pages(self._pdf_document(pdf_path).pages())
 
     def analyze_notebook_directory(
         self, notebook_dir: Path, page_pattern: str = "page_*.png"
@@ -17,6 +17,7 @@ class Settings(BaseSettings):
     # OpenAI Configuration
     openai_api_key: str
     openai_model: str = "gpt-4-vision-preview"
+    openai_base_url: Optional[str] = None
 
     # Project Paths
     project_root: Path = Path(__file__).parent.parent
@@ -30,7 +31,84 @@ class Settings(BaseSettings):
     debug: bool = True
 
     # Analysis Settings
-    max_pages_per_batch: int = 10
+    max_concurrent_requests: int = 10
+    pages_per_request: int = 1
+    # Pages are read, preprocessed and encoded by prefetch_workers threads
+    # into a queue of up to prefetch_queue_size packs ahead of the requests
+    prefetch_workers: int = 2
+    prefetch_queue_size: int = 8
+    analysis_cache_enabled: bool = True
+    analysis_cache_max_entries: int = 5000
+
+    # Rate Limiting (shared by all model calls; unset budgets are learned
+    # from the API's x-ratelimit-* response headers)
+    rate_limit_requests_per_minute: Optional[int] = None
+    rate_limit_tokens_per_minute: Optional[int] = None
+    rate_limit_max_retries: int = 5
+    rate_limit_backoff_base: float = 1.0
+    rate_limit_backoff_max: float = 60.0
+
+    # HTTP Connection Pool (shared by every OpenAI client in the process;
+    # http2 needs the h2 package)
+    http_max_connections: int = 50
+    http_max_keepalive_connections: int = 20
+    http_keepalive_expiry: float = 60.0
+    http2: bool = False
+
+    # Request Hedging (duplicate calls slower than a latency percentile)
+    hedge_requests: bool = False
+    hedge_percentile: float = 95.0
+    hedge_budget: float = 0.05
+
+    # Model Cascade (cheap first pass; only uncertain or high-value pages
+    # are re-analyzed with openai_model)
+    cascade_enabled: bool = False
+    cascade_model: str = "gpt-4o-mini"
+    cascade_detail: str = "low"
+    cascade_min_confidence: float = 0.7
+    cascade_escalate_types: str = "design,testing,brainstorming"
+
+    # Local Page Filter (blank and near-duplicate pages skip the vision call)
+    page_filter_enabled: bool = True
+    blank_ink_threshold: float = 0.005
+    duplicate_hash_distance: int = 24
+    duplicate_max_pixel_diff: float = 0.0003
+
+    # Local Layout Hints (key elements detected on-CPU are left out of the prompt)
+    layout_hints_enabled: bool = False
+    layout_min_confidence: float = 0.9
+
+    # Scan Ingestion (raw scans/photos normalized into page_NNN.png by `ingest`)
+    ingest_max_long_edge: int = 1650
+    ingest_deskew: bool = True
+    ingest_max_skew_degrees: float = 5.0
+    ingest_trim_margins: bool = True
+
+    # PDF Notebooks (pages rendered on demand; text-only pages sent as text)
+    pdf_render_long_edge: int = 1650
+    pdf_text_layer: bool = True
+    pdf_min_text_chars: int = 200
+
+    # Structured Output (page analyses requested as schema-checked JSON)
+    structured_output: bool = False
+
+    # Priority Scheduling (pages tied to borderline criteria analyzed first)
+    priority_scheduling: bool = True
+
+    # Sampled Runs (analyze --sample: rubric estimates with confidence bounds)
+    sample_confidence: float = 0.9
+    sample_replicates: int = 200
+
+    # Call Metrics (latency, tokens and cost of every model call)
+    metrics_enabled: bool = True
+
+    # Image Preprocessing (applied before upload)
+    image_preprocessing: bool = True
+    image_max_long_edge: int = 1024
+    image_format: str = "jpeg"
+    image_quality: int = 80
+    image_trim_margins: bool = True
+    vision_detail: str = "auto"
     analysis_temperature: float = 0.7
 
     class Config:
@@ -55,6 +133,21 @@ class Settings(BaseSettings):
         """Path to interview questions YAML file."""
         return self.data_dir / "questions" / "questions.yaml"
 
+    @property
+    def analysis_cache_file(self) -> Path:
+        """Path to the per-page analysis cache database."""
+        return self.results_dir / "analysis_cache.sqlite3"
+
+    @property
+    def analysis_journal_file(self) -> Path:
+        """Path to the JSONL journal of the current analysis run."""
+        return self.results_dir / "analysis_journal.jsonl"
+
+    @property
+    def metrics_file(self) -> Path:
+        """Path to the JSONL log of model call metrics."""
+        return self.results_dir / "call_metrics.jsonl"
+
     @property
     def tracking_file(self) -> Path:
         """Path to progress tracking JSON file."""
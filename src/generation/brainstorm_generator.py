@@ -47,7 +47,8 @@ class BrainstormGenerator(ContentGenerator):
         2-3 paragraphs, conversational but thorough.
         """
 
-        initial_analysis = self.client.chat.completions.create(
+        initial_analysis = self._create_completion(
+            "generate_complete_brainstorm_section",
             model=self.model,
             messages=[{"role": "user", "content": analysis_prompt}],
             temperature=0.7,
@@ -79,7 +80,8 @@ class BrainstormGenerator(ContentGenerator):
         1 paragraph, enthusiastic student voice.
         """
 
-        conclusion = self.client.chat.completions.create(
+        conclusion = self._create_completion(
+            "generate_complete_brainstorm_section",
             model=self.model,
             messages=[{"role": "user", "content": conclusion_prompt}],
             temperature=0.7,
@@ -5,18 +5,36 @@ from typing import List, Dict, Optional
 from openai import OpenAI
 
 from ..config import get_settings
+from ..llm import create_chat_completion, get_client_factory
 
 
 class ContentGenerator:
     """Generate notebook content using AI."""
 
-    def __init__(self, api_key: Optional[str] = None):
-        """Initialize content generator."""
+    def __init__(self, api_key: Optional[str] = None, client: Optional[OpenAI] = None):
+        """
+        Initialize content generator.
+
+        Args:
+            api_key: OpenAI API key. If None, uses config settings.
+            client: OpenAI client to send requests with. If None, uses the
+                process-wide pooled client.
+        """
         settings = get_settings()
         self.api_key = api_key or settings.openai_api_key
-        self.client = OpenAI(api_key=self.api_key)
+        self.client = client or get_client_factory().sync_client(self.api_key)
         self.model = "gpt-4-turbo-preview"  # Use GPT-4 Turbo for text generation
 
+    def _create_completion(self, tag: str, **kwargs):
+        """
+        Create a chat completion through the shared rate limiter.
+
+        Args:
+            tag: Name of the generator method, used to group call metrics
+            **kwargs: Arguments for ``client.chat.completions.create``
+        """
+        return create_chat_completion(self.client, tag=tag, **kwargs)
+
     def generate_game_analysis(
         self, game_name: str = "VRC High Stakes", num_strategies: int = 8
     ) -> str:
@@ -50,7 +68,8 @@ class ContentGenerator:
         Use authentic student voice (enthusiastic but not overly technical).
         """
 
-        response = self.client.chat.completions.create(
+        response = self._create_completion(
+            "generate_game_analysis",
             model=self.model,
             messages=[{"role": "user", "content": prompt}],
             temperature=0.7,
@@ -96,7 +115,8 @@ class ContentGenerator:
         Make options genuinely different (not just minor variations).
         """
 
-        response = self.client.chat.completions.create(
+        response = self._create_completion(
+            "generate_brainstorming_options",
             model=self.model,
             messages=[{"role": "user", "content": prompt}],
             temperature=0.8,  # Higher temperature for more creative options
@@ -149,7 +169,8 @@ class ContentGenerator:
         Write as a student documenting their testing process.
         """
 
-        response = self.client.chat.completions.create(
+        response = self._create_completion(
+            "generate_testing_documentation",
             model=self.model,
             messages=[{"role": "user", "content": prompt}],
             temperature=0.7,
@@ -198,7 +219,8 @@ class ContentGenerator:
         {f'Make sure the changes directly address: {previous_issues}' if previous_issues else ''}
         """
 
-        response = self.client.chat.completions.create(
+        response = self._create_completion(
+            "generate_design_iteration",
             model=self.model,
             messages=[{"role": "user", "content": prompt}],
             temperature=0.7,
@@ -252,7 +274,8 @@ class ContentGenerator:
         Show collaborative decision-making process.
         """
 
-        response = self.client.chat.completions.create(
+        response = self._create_completion(
+            "generate_meeting_notes",
             model=self.model,
             messages=[{"role": "user", "content": prompt}],
             temperature=0.7,
@@ -303,7 +326,8 @@ class ContentGenerator:
         Write as a student documenting their build process.
         """
 
-        response = self.client.chat.completions.create(
+        response = self._create_completion(
+            "generate_build_documentation",
             model=self.model,
             messages=[{"role": "user", "content": prompt}],
             temperature=0.7,
@@ -348,7 +372,8 @@ class ContentGenerator:
         Explain technical concepts clearly.
         """
 
-        response = self.client.chat.completions.create(
+        response = self._create_completion(
+            "generate_programming_documentation",
             model=self.model,
             messages=[{"role": "user", "content": prompt}],
             temperature=0.7,
@@ -401,7 +426,8 @@ class ContentGenerator:
         Make the winner clear but close enough to show real consideration.
         """
 
-        response = self.client.chat.completions.create(
+        response = self._create_completion(
+            "generate_decision_matrix",
             model=self.model,
             messages=[{"role": "user", "content": prompt}],
             temperature=0.7,
@@ -0,0 +1,20 @@
+"""Shared model-client layer: pooled clients, rate limiting, retries, hedging and metrics for all API calls."""
+
+from .clients import ClientFactory, get_client_factory
+from .rate_limiter import RateLimiter, get_rate_limiter
+from .hedging import Hedger, get_hedger
+from .metrics import MetricsRecorder, get_metrics_recorder
+from .completions import create_chat_completion, create_chat_completion_async
+
+__all__ = [
+    "ClientFactory",
+    "get_client_factory",
+    "RateLimiter",
+    "get_rate_limiter",
+    "Hedger",
+    "get_hedger",
+    "MetricsRecorder",
+    "get_metrics_recorder",
+    "create_chat_completion",
+    "create_chat_completion_async",
+]
@@ -0,0 +1,121 @@
+"""Process-wide OpenAI clients sharing one tuned HTTP connection pool."""
+
+import threading
+from typing import Dict, Optional, Tuple
+
+import httpx
+import openai
+
+from ..config import get_settings
+
+
+def _http2_enabled() -> bool:
+    """Whether to negotiate HTTP/2, checking its optional dependency first."""
+    if not get_settings().http2:
+        return False
+    try:
+        import h2  # noqa: F401
+    except ImportError as e:
+        raise ImportError("HTTP2=true requires h2 (pip install 'httpx[http2]')") from e
+    return True
+
+
+def _pool_limits() -> httpx.Limits:
+    """Connection pool limits from config settings."""
+    settings = get_settings()
+    return httpx.Limits(
+        max_connections=settings.http_max_connections,
+        max_keepalive_connections=settings.http_max_keepalive_connections,
+        keepalive_expiry=settings.http_keepalive_expiry,
+    )
+
+
+class ClientFactory:
+    """
+    Hands out OpenAI clients that reuse connections across the process.
+
+    One synchronous client is kept per API key and base URL, so every
+    generator and analyzer talks to the API over the same keep-alive pool
+    instead of each opening (and TLS-handshaking) its own. Async clients
+    are created per event loop, since an httpx async pool cannot outlive
+    the loop it first ran on.
+    """
+
+    def __init__(self):
+        self._clients: Dict[Tuple[str, Optional[str]], openai.OpenAI] = {}
+        self._lock = threading.Lock()
+
+    def sync_client(
+        self, api_key: Optional[str] = None, base_url: Optional[str] = None
+    ) -> openai.OpenAI:
+        """
+        Get the shared synchronous client for an API key and base URL.
+
+        Args:
+            api_key: OpenAI API key. If None, uses config settings.
+            base_url: API base URL. If None, uses config settings.
+
+        Returns:
+            OpenAI client on the shared connection pool
+        """
+        settings = get_settings()
+        key = (api_key or settings.openai_api_key, base_url or settings.openai_base_url)
+        with self._lock:
+            client = self._clients.get(key)
+            if client is None:
+                # Retries are handled by the shared rate limiter, not the SDK
+                client = openai.OpenAI(
+                    api_key=key[0],
+                    base_url=key[1],
+                    max_retries=0,
+                    http_client=openai.DefaultHttpxClient(
+                        limits=_pool_limits(), http2=_http2_enabled()
+                    ),
+                )
+                self._clients[key] = client
+            return client
+
+    def async_client(
+        self, api_key: Optional[str] = None, base_url: Optional[str] = None
+    ) -> openai.AsyncOpenAI:
+        """
+        Create an async client with the tuned pool for one event loop.
+
+        The caller closes it before its event loop ends.
+
+        Args:
+            api_key: OpenAI API key. If None, uses config settings.
+            base_url: API base URL. If None, uses config settings.
+
+        Returns:
+            A new AsyncOpenAI client
+        """
+        settings = get_settings()
+        return openai.AsyncOpenAI(
+            api_key=api_key or settings.openai_api_key,
+            base_url=base_url or settings.openai_base_url,
+            max_retries=0,
+            http_client=openai.DefaultAsyncHttpxClient(
+                limits=_pool_limits(), http2=_http2_enabled()
+            ),
+        )
+
+    def close(self) -> None:
+        """Close the shared synchronous clients and their connections."""
+        with self._lock:
+            for client in self._clients.values():
+                client.close()
+            self._clients.clear()
+
+
+_client_factory: Optional[ClientFactory] = None
+_client_factory_lock = threading.Lock()
+
+
+def get_client_factory() -> ClientFactory:
+    """Get the process-wide client factory shared by all model clients."""
+    global _client_factory
+    with _client_factory_lock:
+        if _client_factory is None:
+            _client_factory = ClientFactory()
+        return _client_factory
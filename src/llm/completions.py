@@ -0,0 +1,229 @@
+"""Chat completion calls routed through the shared rate limiter."""
+
+import asyncio
+import json
+import time
+from typing import Any, List, Optional
+
+import openai
+
+from .hedging import HedgeOutcome, get_hedger, send_hedged
+from .metrics import get_metrics_recorder
+from .rate_limiter import RateLimiter, get_rate_limiter
+
+# Errors worth retrying: throttling, timeouts, dropped connections and 5xx
+RETRYABLE_ERRORS = (
+    openai.RateLimitError,
+    openai.APITimeoutError,
+    openai.APIConnectionError,
+    openai.InternalServerError,
+)
+
+# Rough prompt-token cost of one image part at each detail level
+IMAGE_TOKEN_ESTIMATE = {"low": 85, "high": 765, "auto": 765}
+
+
+def estimate_request_tokens(messages: List[dict], max_tokens: int = 0) -> int:
+    """
+    Estimate the tokens a chat completion will consume, for budgeting.
+
+    Text is counted at ~4 characters per token, images by detail level,
+    and the full ``max_tokens`` completion allowance is reserved.
+
+    Args:
+        messages: Chat messages
+        max_tokens: Completion token limit of the request
+
+    Returns:
+        Estimated total tokens
+    """
+    chars, images = 0, 0
+    for message in messages:
+        content = message.get("content")
+        if isinstance(content, str):
+            chars += len(content)
+            continue
+        for part in content or []:
+            if part.get("type") == "text":
+                chars += len(part.get("text", ""))
+            elif part.get("type") == "image_url":
+                detail = part.get("image_url", {}).get("detail", "auto")
+                images += IMAGE_TOKEN_ESTIMATE.get(detail, 765)
+    return chars // 4 + images + max_tokens
+
+
+def _usage_tokens(completion: Any) -> Optional[int]:
+    usage = getattr(completion, "usage", None)
+    return getattr(usage, "total_tokens", None)
+
+
+class _CallMeasurement:
+    """Timings for one logical call, accumulated across its retries."""
+
+    def __init__(self, tag: str, pages: Optional[List[int]], kwargs: dict):
+        self.tag = tag
+        self.pages = pages or []
+        self.model = kwargs.get("model", "")
+        self.request_bytes = len(json.dumps(kwargs, default=str).encode())
+        self.started = time.monotonic()
+        self.attempts = 0
+        self.queue_seconds = 0.0
+        self.backoff_seconds = 0.0
+        self.hedge = HedgeOutcome()
+
+    def finish(self, completion: Any = None, error: Optional[BaseException] = None) -> None:
+        usage = getattr(completion, "usage", None)
+        get_metrics_recorder().record(
+            tag=self.tag,
+            pages=self.pages,
+            model=self.model,
+            status="ok" if error is None else "error",
+            error=f"{type(error).__name__}: {error}"[:300] if error is not None else None,
+            attempts=self.attempts,
+            wall_seconds=time.monotonic() - self.started,
+            queue_seconds=self.queue_seconds,
+            backoff_seconds=self.backoff_seconds,
+            request_bytes=self.request_bytes,
+            prompt_tokens=getattr(usage, "prompt_tokens", None),
+            completion_tokens=getattr(usage, "completion_tokens", None),
+            hedged=self.hedge.hedged,
+            hedge_won=self.hedge.hedge_won,
+            hedge_tokens=self.hedge.extra_tokens,
+        )
+
+
+def _on_error(limiter: RateLimiter, error: Exception, estimated: int, attempt: int) -> float:
+    """Record a failed attempt and return the delay before retrying."""
+    throttled = isinstance(error, openai.RateLimitError)
+    retry_after = limiter.release_failed(error, throttled, estimated)
+    return limiter.backoff_delay(attempt, retry_after)
+
+
+def create_chat_completion(
+    client: openai.OpenAI,
+    limiter: Optional[RateLimiter] = None,
+    tag: str = "chat_completion",
+    pages: Optional[List[int]] = None,
+    **kwargs,
+) -> Any:
+    """
+    Create a chat completion with rate limiting and retries.
+
+    Throttling (429), timeouts, connection errors and 5xx responses are
+    retried with jittered exponential backoff; anything else is raised
+    immediately, as is the last error once retries run out. Every call is
+    recorded with the shared metrics recorder.
+
+    Args:
+        client: OpenAI client
+        limiter: RateLimiter to use. If None, uses the shared limiter.
+        tag: Name of the caller the call's metrics are grouped under
+        pages: Notebook pages the call is about, if any
+        **kwargs: Arguments for ``client.chat.completions.create``
+
+    Returns:
+        Parsed ChatCompletion
+    """
+    limiter = limiter or get_rate_limiter()
+    estimated = estimate_request_tokens(kwargs["messages"], kwargs.get("max_tokens") or 0)
+
+    call = _CallMeasurement(tag, pages, kwargs)
+
+    for attempt in range(limiter.max_retries + 1):
+        call.attempts += 1
+        queued = time.monotonic()
+        limiter.acquire(estimated)
+        call.queue_seconds += time.monotonic() - queued
+        try:
+            raw = client.chat.completions.with_raw_response.create(**kwargs)
+        except RETRYABLE_ERRORS as e:
+            delay = _on_error(limiter, e, estimated, attempt)
+            if attempt == limiter.max_retries:
+                call.finish(error=e)
+                raise
+            call.backoff_seconds += delay
+            time.sleep(delay)
+            continue
+        except BaseException as e:
+            limiter.release(estimated_tokens=estimated, actual_tokens=0)
+            call.finish(error=e)
+            raise
+
+        completion = raw.parse()
+        limiter.release(
+            estimated_tokens=estimated,
+            actual_tokens=_usage_tokens(completion),
+            succeeded=True,
+        )
+        limiter.update_from_headers(raw.headers)
+        call.finish(completion=completion)
+        return completion
+
+
+async def create_chat_completion_async(
+    client: openai.AsyncOpenAI,
+    limiter: Optional[RateLimiter] = None,
+    tag: str = "chat_completion",
+    pages: Optional[List[int]] = None,
+    **kwargs,
+) -> Any:
+    """
+    Async counterpart of ``create_chat_completion``.
+
+    When hedging is enabled, an attempt still running past the hedge
+    threshold is duplicated (see ``send_hedged``); the synchronous client
+    never hedges.
+
+    Args:
+        client: AsyncOpenAI client
+        limiter: RateLimiter to use. If None, uses the shared limiter.
+        tag: Name of the caller the call's metrics are grouped under
+        pages: Notebook pages the call is about, if any
+        **kwargs: Arguments for ``client.chat.completions.create``
+
+    Returns:
+        Parsed ChatCompletion
+    """
+    limiter = limiter or get_rate_limiter()
+    hedger = get_hedger()
+    estimated = estimate_request_tokens(kwargs["messages"], kwargs.get("max_tokens") or 0)
+
+    call = _CallMeasurement(tag, pages, kwargs)
+
+    for attempt in range(limiter.max_retries + 1):
+        call.attempts += 1
+        queued = time.monotonic()
+        await limiter.acquire_async(estimated)
+        call.queue_seconds += time.monotonic() - queued
+        try:
+            raw = await send_hedged(
+                lambda: client.chat.completions.with_raw_response.create(**kwargs),
+                hedger,
+                limiter,
+                tag,
+                call.model,
+                estimated,
+                call.hedge,
+            )
+        except RETRYABLE_ERRORS as e:
+            delay = _on_error(limiter, e, estimated, attempt)
+            if attempt == limiter.max_retries:
+                call.finish(error=e)
+                raise
+            call.backoff_seconds += delay
+            await asyncio.sleep(delay)
+            continue
+        except BaseException as e:
+            limiter.release(estimated_tokens=estimated, actual_tokens=0)
+            call.finish(error=e)
+            raise
+
+        completion = raw.parse()
+        limiter.release(
+            estimated_tokens=estimated,
+            actual_tokens=_usage_tokens(completion),
+            succeeded=True,
+        )
+        limiter.update_from_headers(raw.headers)
+        call.finish(completion=completion)
+        return completion
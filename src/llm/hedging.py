@@ -0,0 +1,214 @@
+"""Hedged requests: duplicate a straggling call and keep the first answer."""
+
+import asyncio
+import threading
+from collections import deque
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+import openai
+from pydantic import BaseModel
+
+from ..config import get_settings
+from .rate_limiter import RateLimiter
+
+# Recent latencies kept per call type to place the hedge threshold
+HEDGE_WINDOW = 200
+# Calls observed before a call type is hedged at all
+HEDGE_MIN_SAMPLES = 20
+
+
+class Hedger:
+    """
+    Decides when to send a duplicate of a slow call, within a token budget.
+
+    The hedge threshold for a call type is a percentile of its recently
+    observed latencies. Duplicates are only sent while the tokens they
+    reserve stay under ``budget`` times the tokens of all calls sent, and
+    only when the rate limiter's request and token budgets can admit them
+    at once. They may run above the concurrency limit, which a busy run
+    keeps full, but never wait for a slot or while the API is throttling.
+    """
+
+    def __init__(
+        self,
+        enabled: Optional[bool] = None,
+        percentile: Optional[float] = None,
+        budget: Optional[float] = None,
+    ):
+        """
+        Initialize the hedger.
+
+        Args:
+            enabled: Whether to hedge calls. If None, uses config settings.
+            percentile: Latency percentile after which a call is hedged. If
+                None, uses config settings.
+            budget: Most extra tokens, as a fraction of the tokens of all
+                calls sent. If None, uses config settings.
+        """
+        settings = get_settings()
+        self.enabled = settings.hedge_requests if enabled is None else enabled
+        self.percentile = percentile or settings.hedge_percentile
+        self.budget = settings.hedge_budget if budget is None else budget
+
+        self.sent_tokens = 0
+        self.extra_tokens = 0
+        self._latencies: Dict[Tuple[str, str], deque] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, tag: str, model: str, seconds: float) -> None:
+        """Record the latency of a request that returned a response."""
+        with self._lock:
+            key = (tag, model)
+            window = self._latencies.setdefault(key, deque(maxlen=HEDGE_WINDOW))
+            window.append(seconds)
+
+    def delay(self, tag: str, model: str) -> Optional[float]:
+        """
+        Seconds to wait on a call before hedging it.
+
+        Returns:
+            The call type's latency percentile, or None when hedging is off
+            or too few calls of the type have been seen
+        """
+        if not self.enabled:
+            return None
+        with self._lock:
+            window = self._latencies.get((tag, model))
+            if window is None or len(window) < HEDGE_MIN_SAMPLES:
+                return None
+            ordered = sorted(window)
+        index = min(len(ordered) - 1, int(self.percentile / 100 * len(ordered)))
+        return ordered[index]
+
+    def charge(self, tokens: int) -> None:
+        """Count the estimated tokens of a regular request towards the budget base."""
+        with self._lock:
+            self.sent_tokens += tokens
+
+    def reserve(self, tokens: int, limiter: RateLimiter) -> bool:
+        """
+        Reserve budget and a rate-limiter slot for a duplicate request.
+
+        Args:
+            tokens: Estimated tokens of the duplicate
+            limiter: Rate limiter the duplicate must be admitted by
+
+        Returns:
+            Whether the duplicate may be sent; if so, the caller must
+            release its limiter slot
+        """
+        with self._lock:
+            if self.extra_tokens + tokens > self.budget * self.sent_tokens:
+                return False
+            if not limiter.try_acquire(tokens, over_limit=True):
+                return False
+            self.extra_tokens += tokens
+            return True
+
+
+class HedgeOutcome(BaseModel):
+    """What hedging did for one call, across its retries."""
+
+    hedged: bool = False
+    hedge_won: bool = False
+    extra_tokens: int = 0
+
+
+async def send_hedged(
+    send: Callable[[], Awaitable[Any]],
+    hedger: Hedger,
+    limiter: RateLimiter,
+    tag: str,
+    model: str,
+    estimated: int,
+    outcome: HedgeOutcome,
+) -> Any:
+    """
+    Send a request, duplicating it if it outlives the hedge threshold.
+
+    The first successful response wins and the other request is
+    cancelled. If one request fails, the other is awaited; if both fail,
+    the original's error is raised. The caller owns the limiter slot of
+    the request whose response or error is returned, and this function
+    releases the other one, as throttled if it was rejected with a 429.
+
+    Args:
+        send: Starts one request and returns its raw response
+        hedger: Hedger deciding when to duplicate
+        limiter: Rate limiter that admitted the original request
+        tag: Call type, for the hedge threshold
+        model: Model of the request, for the hedge threshold
+        estimated: Estimated tokens of one request
+        outcome: Filled in with whether the request was hedged and won
+
+    Returns:
+        Raw response of the first request to succeed
+    """
+    loop = asyncio.get_running_loop()
+    hedger.charge(estimated)
+    started = loop.time()
+    delay = hedger.delay(tag, model)
+
+    primary = asyncio.ensure_future(send())
+    try:
+        if delay is not None:
+            await asyncio.wait({primary}, timeout=delay)
+        if primary.done() or delay is None or not hedger.reserve(estimated, limiter):
+            raw = await primary
+            hedger.observe(tag, model, loop.time() - started)
+            return raw
+    except BaseException:
+        primary.cancel()
+        raise
+
+    outcome.hedged = True
+    outcome.extra_tokens += estimated
+    hedge_started = loop.time()
+    backup = asyncio.ensure_future(send())
+    pending = {primary, backup}
+    winner = None
+    try:
+        while pending and winner is None:
+            done, pending = await asyncio.wait(
+                pending, return_when=asyncio.FIRST_COMPLETED
+            )
+            winner = next((t for t in done if t.exception() is None), None)
+    finally:
+        for task in pending:
+            task.cancel()
+        # The caller releases the slot of the request it gets back and this
+        # releases the other's, reporting a 429 on it like any throttled
+        # call; only a copy that also answered counts as a success. An
+        # abandoned request may already have been billed, so its token
+        # reservation is kept.
+        other = primary if winner is backup else backup
+        answered = other.done() and not other.cancelled()
+        error = other.exception() if answered else None
+        if error is None:
+            limiter.release(estimated_tokens=estimated, succeeded=answered)
+        else:
+            limiter.release_failed(
+                error, isinstance(error, openai.RateLimitError), estimated
+            )
+
+    if winner is None:
+        raise primary.exception()
+    if winner is backup:
+        outcome.hedge_won = True
+        hedger.observe(tag, model, loop.time() - hedge_started)
+    else:
+        hedger.observe(tag, model, loop.time() - started)
+    return winner.result()
+
+
+_hedger: Optional[Hedger] = None
+_hedger_lock = threading.Lock()
+
+
+def get_hedger() -> Hedger:
+    """Get the process-wide hedger shared by all model clients."""
+    global _hedger
+    with _hedger_lock:
+        if _hedger is None:
+            _hedger = Hedger()
+        return _hedger
@@ -0,0 +1,233 @@
+"""Latency, token and cost metrics for every model call."""
+
+import threading
+import time
+import uuid
+from pathlib import Path
+from typing import List, Optional
+
+from pydantic import BaseModel, Field
+
+from ..config import get_settings
+
+# USD per 1K (prompt, completion) tokens, matched by model name prefix
+# (longest prefix wins). Image inputs are billed as prompt tokens.
+MODEL_PRICES = {
+    "gpt-4-vision-preview": (0.01, 0.03),
+    "gpt-4-turbo": (0.01, 0.03),
+    "gpt-4-1106": (0.01, 0.03),
+    "gpt-4-0125": (0.01, 0.03),
+    "gpt-4o-mini": (0.00015, 0.0006),
+    "gpt-4o": (0.0025, 0.01),
+    "gpt-4": (0.03, 0.06),
+    "gpt-3.5-turbo": (0.0005, 0.0015),
+}
+
+
+def estimate_cost(
+    model: str, prompt_tokens: Optional[int], completion_tokens: Optional[int]
+) -> Optional[float]:
+    """
+    Estimate the USD cost of a call from its token usage.
+
+    Args:
+        model: Model name sent with the request
+        prompt_tokens: Prompt tokens reported by the API
+        completion_tokens: Completion tokens reported by the API
+
+    Returns:
+        Estimated cost, or None if the model or usage is unknown
+    """
+    if prompt_tokens is None or completion_tokens is None:
+        return None
+    matches = [prefix for prefix in MODEL_PRICES if model.startswith(prefix)]
+    if not matches:
+        return None
+    prompt_price, completion_price = MODEL_PRICES[max(matches, key=len)]
+    return (prompt_tokens * prompt_price + completion_tokens * completion_price) / 1000
+
+
+class CallMetric(BaseModel):
+    """Measurements for one model call, including its retries."""
+
+    run_id: str
+    timestamp: float
+    tag: str  # Caller, e.g. "analyze_page" or "generate_game_analysis"
+    pages: List[int] = Field(default_factory=list)
+    model: str
+    status: str  # "ok" or "error"
+    error: Optional[str] = None
+    attempts: int
+    wall_seconds: float
+    queue_seconds: float  # Waiting on the rate limiter
+    backoff_seconds: float  # Sleeping between retries
+    request_bytes: int
+    prompt_tokens: Optional[int] = None
+    completion_tokens: Optional[int] = None
+    cost_usd: Optional[float] = None
+    hedged: bool = False  # A duplicate request was sent
+    hedge_won: bool = False  # The duplicate answered first
+    hedge_tokens: int = 0  # Estimated tokens reserved by duplicates
+
+
+class MetricsSummary(BaseModel):
+    """Aggregate of a group of call metrics."""
+
+    calls: int = 0
+    errors: int = 0
+    attempts: int = 0
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+    cost_usd: float = 0.0
+    request_bytes: int = 0
+    wall_p50: float = 0.0
+    wall_p95: float = 0.0
+    wall_p99: float = 0.0
+    mean_queue_seconds: float = 0.0
+    hedged: int = 0
+    hedge_won: int = 0
+    hedge_tokens: int = 0
+    unhedged_p99: float = 0.0  # Estimated p99 had no call been hedged
+
+
+def _percentile(values: List[float], q: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = max(0, min(len(ordered) - 1, int(round(q / 100 * len(ordered))) - 1))
+    return ordered[index]
+
+
+def unhedged_walls(metrics: List[CallMetric]) -> List[float]:
+    """
+    Estimate each call's wall time had it not been hedged.
+
+    A call whose duplicate answered first had its original cancelled, so
+    its own latency is unknown beyond the moment it was abandoned. It is
+    imputed as the median wall time of the unhedged calls of the same type
+    that ran longer than that, or the abandoned time when none did.
+
+    Args:
+        metrics: Calls to estimate
+
+    Returns:
+        Wall seconds per call, in the order given
+    """
+    walls = []
+    for metric in metrics:
+        if not metric.hedge_won:
+            walls.append(metric.wall_seconds)
+            continue
+        longer = sorted(
+            m.wall_seconds
+            for m in metrics
+            if m.tag == metric.tag
+            and not m.hedge_won
+            and m.wall_seconds > metric.wall_seconds
+        )
+        walls.append(longer[len(longer) // 2] if longer else metric.wall_seconds)
+    return walls
+
+
+def summarize(metrics: List[CallMetric]) -> MetricsSummary:
+    """
+    Aggregate call metrics.
+
+    Args:
+        metrics: Calls to summarize
+
+    Returns:
+        MetricsSummary over all of them
+    """
+    if not metrics:
+        return MetricsSummary()
+
+    walls = [m.wall_seconds for m in metrics]
+    return MetricsSummary(
+        calls=len(metrics),
+        errors=sum(m.status != "ok" for m in metrics),
+        attempts=sum(m.attempts for m in metrics),
+        prompt_tokens=sum(m.prompt_tokens or 0 for m in metrics),
+        completion_tokens=sum(m.completion_tokens or 0 for m in metrics),
+        cost_usd=sum(m.cost_usd or 0.0 for m in metrics),
+        request_bytes=sum(m.request_bytes for m in metrics),
+        wall_p50=_percentile(walls, 50),
+        wall_p95=_percentile(walls, 95),
+        wall_p99=_percentile(walls, 99),
+        mean_queue_seconds=sum(m.queue_seconds for m in metrics) / len(metrics),
+        hedged=sum(m.hedged for m in metrics),
+        hedge_won=sum(m.hedge_won for m in metrics),
+        hedge_tokens=sum(m.hedge_tokens for m in metrics),
+        unhedged_p99=_percentile(unhedged_walls(metrics), 99),
+    )
+
+
+class MetricsRecorder:
+    """
+    Collects call metrics in memory and appends them to a JSONL file.
+
+    Every line carries the ``run_id`` of the process that wrote it, so one
+    file can hold the history of many runs.
+    """
+
+    def __init__(self, metrics_file: Optional[Path] = None, enabled: Optional[bool] = None):
+        """
+        Initialize the recorder.
+
+        Args:
+            metrics_file: Path to the JSONL metrics file. If None, uses config default.
+            enabled: Whether to write the metrics file. If None, uses config
+                settings. Metrics are always kept in memory.
+        """
+        settings = get_settings()
+        self.metrics_file = metrics_file or settings.metrics_file
+        self.enabled = settings.metrics_enabled if enabled is None else enabled
+        self.run_id = uuid.uuid4().hex[:12]
+        self.records: List[CallMetric] = []
+        self._lock = threading.Lock()
+
+    def record(self, **fields) -> CallMetric:
+        """
+        Record one call.
+
+        Args:
+            **fields: CallMetric fields other than run_id, timestamp and cost
+
+        Returns:
+            The recorded CallMetric
+        """
+        metric = CallMetric(
+            run_id=self.run_id,
+            timestamp=time.time(),
+            cost_usd=estimate_cost(
+                fields["model"],
+                fields.get("prompt_tokens"),
+                fields.get("completion_tokens"),
+            ),
+            **fields,
+        )
+        with self._lock:
+            self.records.append(metric)
+            if self.enabled:
+                self.metrics_file.parent.mkdir(parents=True, exist_ok=True)
+                with open(self.metrics_file, "a") as f:
+                    f.write(metric.model_dump_json() + "\n")
+        return metric
+
+    def snapshot(self) -> List[CallMetric]:
+        """Copy of the metrics recorded so far in this process."""
+        with self._lock:
+            return list(self.records)
+
+
+_metrics_recorder: Optional[MetricsRecorder] = None
+_metrics_recorder_lock = threading.Lock()
+
+
+def get_metrics_recorder() -> MetricsRecorder:
+    """Get the process-wide metrics recorder shared by all model clients."""
+    global _metrics_recorder
+    with _metrics_recorder_lock:
+        if _metrics_recorder is None:
+            _metrics_recorder = MetricsRecorder()
+        return _metrics_recorder
@@ -0,0 +1,307 @@
+"""Client-side rate limiting shared by every model call."""
+
+import asyncio
+import random
+import re
+import threading
+import time
+from typing import Mapping, Optional
+
+from ..config import get_settings
+
+DURATION_PART = re.compile(r"(\d+(?:\.\d+)?)(ms|s|m|h)")
+DURATION_SECONDS = {"ms": 0.001, "s": 1.0, "m": 60.0, "h": 3600.0}
+
+
+def retry_after(error: Exception) -> Optional[float]:
+    """Read the server's retry hint from an API error, if present."""
+    response = getattr(error, "response", None)
+    headers = getattr(response, "headers", None) or {}
+    for name, scale in (("retry-after-ms", 0.001), ("retry-after", 1.0)):
+        value = headers.get(name)
+        if value is None:
+            continue
+        try:
+            return float(value) * scale
+        except ValueError:
+            continue
+    return None
+
+
+def parse_reset_duration(value: str) -> Optional[float]:
+    """
+    Parse an OpenAI reset header such as "1s", "6m0s" or "20ms" into seconds.
+
+    Args:
+        value: Header value
+
+    Returns:
+        Duration in seconds, or None if the value is not a duration
+    """
+    parts = DURATION_PART.findall(value or "")
+    if not parts:
+        return None
+    return sum(float(amount) * DURATION_SECONDS[unit] for amount, unit in parts)
+
+
+class TokenBucket:
+    """Continuously refilling budget of units per minute."""
+
+    def __init__(self, per_minute: Optional[float]):
+        self.capacity = per_minute
+        self.level = per_minute or 0.0
+        self.updated = time.monotonic()
+
+    def refill(self, now: float) -> None:
+        if self.capacity is None:
+            return
+        elapsed = now - self.updated
+        self.level = min(self.capacity, self.level + elapsed * self.capacity / 60.0)
+        self.updated = now
+
+    def wait_time(self, amount: float) -> float:
+        """Seconds until ``amount`` units are available (0 if available now)."""
+        if self.capacity is None or self.level >= amount:
+            return 0.0
+        # A request larger than the whole bucket is admitted once it is full
+        needed = min(amount, self.capacity) - self.level
+        return max(0.0, needed * 60.0 / self.capacity)
+
+    def take(self, amount: float) -> None:
+        if self.capacity is not None:
+            self.level -= amount
+
+
+class RateLimiter:
+    """
+    Requests/min and tokens/min limiter with adaptive concurrency.
+
+    Budgets start from config (or unlimited) and are corrected from the
+    ``x-ratelimit-*`` headers on every response. Concurrency follows AIMD:
+    it grows by roughly one slot per window of successful calls, halves
+    whenever the API throttles us, and holds still on other failures.
+    """
+
+    POLL_INTERVAL = 0.05
+
+    def __init__(
+        self,
+        requests_per_minute: Optional[int] = None,
+        tokens_per_minute: Optional[int] = None,
+        max_concurrency: Optional[int] = None,
+        min_concurrency: int = 1,
+        max_retries: Optional[int] = None,
+    ):
+        """
+        Initialize the rate limiter.
+
+        Args:
+            requests_per_minute: Request budget. If None, uses config, where
+                unset means "learn it from response headers".
+            tokens_per_minute: Token budget. If None, uses config.
+            max_concurrency: Upper bound on calls in flight. If None, uses config.
+            min_concurrency: Lower bound the AIMD controller never goes below.
+            max_retries: Retries per call on throttling or transient errors.
+                If None, uses config.
+        """
+        settings = get_settings()
+        self.requests = TokenBucket(
+            requests_per_minute or settings.rate_limit_requests_per_minute
+        )
+        self.tokens = TokenBucket(tokens_per_minute or settings.rate_limit_tokens_per_minute)
+        self.max_concurrency = max_concurrency or settings.max_concurrent_requests
+        self.min_concurrency = min_concurrency
+        self.max_retries = (
+            settings.rate_limit_max_retries if max_retries is None else max_retries
+        )
+        self.backoff_base = settings.rate_limit_backoff_base
+        self.backoff_max = settings.rate_limit_backoff_max
+
+        self.concurrency_limit = float(self.max_concurrency)
+        self.in_flight = 0
+        self.throttle_count = 0
+        self._blocked_until = 0.0
+        self._lock = threading.Lock()
+
+    def _try_acquire(self, tokens: float, over_limit: bool = False) -> float:
+        """Admit a call if possible; otherwise return seconds to wait."""
+        with self._lock:
+            now = time.monotonic()
+            if now < self._blocked_until:
+                return self._blocked_until - now
+            if not over_limit and self.in_flight >= int(self.concurrency_limit):
+                return self.POLL_INTERVAL
+
+            self.requests.refill(now)
+            self.tokens.refill(now)
+            wait = max(self.requests.wait_time(1), self.tokens.wait_time(tokens))
+            if wait > 0:
+                return wait
+
+            self.requests.take(1)
+            self.tokens.take(tokens)
+            self.in_flight += 1
+            return 0.0
+
+    def try_acquire(self, tokens: float = 0, over_limit: bool = False) -> bool:
+        """
+        Admit a call estimated at ``tokens`` tokens only if it may start now.
+
+        Args:
+            tokens: Estimated tokens of the call
+            over_limit: Admit the call even when the concurrency limit is
+                reached, as long as the request and token budgets allow it
+                and the API is not throttling us
+
+        Returns:
+            Whether the call was admitted; if so, the caller must release it
+        """
+        return self._try_acquire(tokens, over_limit) <= 0
+
+    def acquire(self, tokens: float = 0) -> None:
+        """Block until a call estimated at ``tokens`` tokens may start."""
+        while True:
+            wait = self._try_acquire(tokens)
+            if wait <= 0:
+                return
+            time.sleep(min(wait, 1.0))
+
+    async def acquire_async(self, tokens: float = 0) -> None:
+        """Wait without blocking the event loop until a call may start."""
+        while True:
+            wait = self._try_acquire(tokens)
+            if wait <= 0:
+                return
+            await asyncio.sleep(min(wait, 1.0))
+
+    def release(
+        self,
+        throttled: bool = False,
+        estimated_tokens: float = 0,
+        actual_tokens: Optional[float] = None,
+        succeeded: bool = False,
+    ) -> None:
+        """
+        Finish a call and adjust concurrency.
+
+        Args:
+            throttled: Whether the API rejected the call with a rate limit
+            estimated_tokens: Tokens reserved at ``acquire``
+            actual_tokens: Tokens the API reported using, to correct the
+                reservation
+            succeeded: Whether the API answered the call. Only answered
+                calls grow the limit; errors, timeouts and cancelled calls
+                leave it unchanged.
+        """
+        with self._lock:
+            self.in_flight -= 1
+            if actual_tokens is not None:
+                self.tokens.take(actual_tokens - estimated_tokens)
+
+            if throttled:
+                self.throttle_count += 1
+                self.concurrency_limit = max(
+                    float(self.min_concurrency), self.concurrency_limit / 2
+                )
+            elif succeeded:
+                self.concurrency_limit = min(
+                    float(self.max_concurrency),
+                    self.concurrency_limit + 1.0 / self.concurrency_limit,
+                )
+
+    def allow_concurrency(self, max_concurrency: int) -> None:
+        """
+        Raise the ceiling on calls in flight to at least ``max_concurrency``.
+
+        The current limit moves up by the same amount, so a run asking for
+        more concurrency than the configured default gets it right away
+        while any backoff from earlier throttling is kept. The ceiling is
+        never lowered, since other runs may share the limiter.
+
+        Args:
+            max_concurrency: Calls the caller wants in flight at once
+        """
+        with self._lock:
+            if max_concurrency <= self.max_concurrency:
+                return
+            self.concurrency_limit += max_concurrency - self.max_concurrency
+            self.max_concurrency = max_concurrency
+
+    def update_from_headers(self, headers: Optional[Mapping[str, str]]) -> None:
+        """Align the budgets with the API's ``x-ratelimit-*`` response headers."""
+        if not headers:
+            return
+
+        with self._lock:
+            now = time.monotonic()
+            for name, bucket in (("requests", self.requests), ("tokens", self.tokens)):
+                limit = headers.get(f"x-ratelimit-limit-{name}")
+                remaining = headers.get(f"x-ratelimit-remaining-{name}")
+                reset = parse_reset_duration(headers.get(f"x-ratelimit-reset-{name}", ""))
+
+                if limit and limit.isdigit():
+                    if bucket.capacity is None:
+                        bucket.level = float(limit)
+                    bucket.capacity = min(bucket.capacity or float(limit), float(limit))
+                if remaining and remaining.isdigit():
+                    bucket.refill(now)
+                    bucket.level = min(bucket.level, float(remaining))
+                    if float(remaining) == 0 and reset:
+                        self._blocked_until = max(self._blocked_until, now + reset)
+
+    def backoff_delay(self, attempt: int, retry_after: Optional[float] = None) -> float:
+        """
+        Seconds to wait before retry number ``attempt`` (0-based).
+
+        Uses the server's retry-after hint when given, otherwise full-jitter
+        exponential backoff capped at the configured maximum.
+        """
+        if retry_after is not None:
+            return min(retry_after, self.backoff_max)
+        ceiling = min(self.backoff_max, self.backoff_base * (2 ** attempt))
+        return random.uniform(0, ceiling)
+
+    def block_for(self, seconds: float) -> None:
+        """Hold back every new call for ``seconds`` (e.g. after a 429)."""
+        with self._lock:
+            self._blocked_until = max(self._blocked_until, time.monotonic() + seconds)
+
+    def release_failed(
+        self, error: Exception, throttled: bool, estimated_tokens: float = 0
+    ) -> Optional[float]:
+        """
+        Finish a call that failed, learning what its error says about the limits.
+
+        The token reservation is returned, the limits are aligned with the
+        error response's headers, and a throttled call's retry hint holds
+        back every new call.
+
+        Args:
+            error: Error the call raised
+            throttled: Whether the API rejected the call with a rate limit
+            estimated_tokens: Tokens reserved at ``acquire``
+
+        Returns:
+            The server's retry hint in seconds, if the error carried one
+        """
+        self.release(throttled=throttled, estimated_tokens=estimated_tokens, actual_tokens=0)
+        response = getattr(error, "response", None)
+        self.update_from_headers(getattr(response, "headers", None))
+
+        hint = retry_after(error)
+        if throttled and hint is not None:
+            self.block_for(hint)
+        return hint
+
+
+_rate_limiter: Optional[RateLimiter] = None
+_rate_limiter_lock = threading.Lock()
+
+
+def get_rate_limiter() -> RateLimiter:
+    """Get the process-wide rate limiter shared by all model clients."""
+    global _rate_limiter
+    with _rate_limiter_lock:
+        if _rate_limiter is None:
+            _rate_limiter = RateLimiter()
+        return _rate_limiter
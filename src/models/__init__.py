@@ -1,16 +1,20 @@
 """Data models for V5-Notebook-Helper."""
 
-from .notebook import NotebookPage, PageAnalysis, NotebookAnalysis
-from .rubric import RubricCriterion, RubricScore, RubricStatus
+from .notebook import KEY_ELEMENTS, NotebookPage, PageAnalysis, PageFingerprint, NotebookAnalysis
+from .rubric import RubricCriterion, RubricScore, RubricStatus, ScoreEstimate, NotebookEstimate
 from .progress import ActionItem, ProgressSnapshot
 
 __all__ = [
+    "KEY_ELEMENTS",
     "NotebookPage",
     "PageAnalysis",
+    "PageFingerprint",
     "NotebookAnalysis",
     "RubricCriterion",
     "RubricScore",
     "RubricStatus",
+    "ScoreEstimate",
+    "NotebookEstimate",
     "ActionItem",
     "ProgressSnapshot",
 ]
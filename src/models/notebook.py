@@ -6,6 +6,18 @@ from typing import List, Optional, Dict, Any
 
 from pydantic import BaseModel, Field
 
+# Key elements a page analysis reports on, in prompt order
+KEY_ELEMENTS = (
+    "brainstorming",
+    "decision_matrix",
+    "cad_drawings",
+    "testing_data",
+    "meeting_notes",
+    "dates_timestamps",
+    "design_iteration",
+    "failure_documentation",
+)
+
 
 class NotebookPage(BaseModel):
     """Represents a single page in the engineering notebook."""
@@ -13,6 +25,9 @@ class NotebookPage(BaseModel):
     page_number: int
     file_path: Path
     image_data: Optional[bytes] = None
+    pdf_page_index: Optional[int] = Field(
+        default=None, description="Zero-based page index when file_path is a PDF"
+    )
 
     class Config:
         arbitrary_types_allowed = True
@@ -34,15 +49,40 @@ class PageAnalysis(BaseModel):
         description="Key elements found: brainstorming, decision_matrix, cad, testing_data, etc.",
     )
     notes: str = Field(default="", description="Additional notes or observations")
+    confidence: Optional[float] = Field(
+        default=None, description="Model's 0-1 confidence in the analysis, when requested"
+    )
+    analyzed_by: Optional[str] = Field(
+        default=None, description="Model that produced the analysis"
+    )
     timestamp: datetime = Field(default_factory=datetime.now)
 
 
+class PageFingerprint(BaseModel):
+    """Identity of a page image, used to detect changes between runs."""
+
+    page_number: int
+    file_path: Path
+    size: int
+    mtime: float
+    content_hash: str = Field(description="SHA-256 of the image bytes")
+    ink_coverage: Optional[float] = Field(
+        default=None, description="Fraction of the page covered by ink"
+    )
+    perceptual_hash: Optional[str] = Field(
+        default=None, description="Hex dHash used to find near-duplicate pages"
+    )
+
+
 class NotebookAnalysis(BaseModel):
     """Complete analysis of the engineering notebook."""
 
     total_pages: int
     pages_analyzed: int
     page_analyses: List[PageAnalysis] = Field(default_factory=list)
+    page_manifest: List[PageFingerprint] = Field(
+        default_factory=list, description="Fingerprints of the analyzed page images"
+    )
     rubric_scores: Dict[str, Any] = Field(
         default_factory=dict, description="Scores for EN1-EN10 criteria"
     )
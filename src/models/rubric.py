@@ -1,7 +1,10 @@
 """Rubric-related data models."""
 
+import os
+from datetime import datetime
 from enum import Enum
-from typing import List, Optional
+from pathlib import Path
+from typing import Dict, List, Optional
 
 from pydantic import BaseModel, Field
 
@@ -51,3 +54,55 @@ class RubricScore(BaseModel):
     def is_fully_developed(self) -> bool:
         """Check if criterion meets 'Fully Developed' standard."""
         return self.status == RubricStatus.FULLY_DEVELOPED and self.score >= 2
+
+
+class ScoreEstimate(BaseModel):
+    """Estimated score for a rubric criterion while pages are still pending."""
+
+    criterion_code: str
+    score: int = Field(ge=0, le=3, description="Median 0-3 point score")
+    mean: float = Field(description="Expected score across resampled notebooks")
+    low: int = Field(ge=0, le=3, description="Lower confidence bound")
+    high: int = Field(ge=0, le=3, description="Upper confidence bound")
+
+    @property
+    def is_settled(self) -> bool:
+        """
+        Check if every resampled notebook gave the same score.
+
+        The bounds come from resampling the pages analyzed so far, so a
+        collapsed interval only means the sampled replicates agree; the
+        pending pages can still change the final score.
+        """
+        return self.low == self.high
+
+
+class NotebookEstimate(BaseModel):
+    """Rubric score estimates from the pages analyzed so far."""
+
+    total_pages: int
+    pages_analyzed: int
+    confidence: float = Field(description="Coverage of the low-high bounds")
+    complete: bool = Field(
+        default=False, description="Whether every page has been analyzed"
+    )
+    scores: Dict[str, ScoreEstimate] = Field(default_factory=dict)
+    updated: datetime = Field(default_factory=datetime.now)
+
+    def save_to_file(self, filepath: Path) -> None:
+        """Save estimate to JSON file, replacing it atomically for live readers."""
+        import json
+
+        partial = filepath.with_suffix(".tmp")
+        with open(partial, "w") as f:
+            json.dump(self.model_dump(), f, indent=2, default=str)
+        os.replace(partial, filepath)
+
+    @classmethod
+    def load_from_file(cls, filepath: Path) -> "NotebookEstimate":
+        """Load estimate from JSON file."""
+        import json
+
+        with open(filepath, "r") as f:
+            data = json.load(f)
+        return cls(**data)
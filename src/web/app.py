@@ -11,8 +11,9 @@ from fastapi import Request
 
 from ..config import get_settings
 from ..analysis import VisionAnalyzer, RubricMatcher, GapDetector, ReportGenerator
+from ..analysis.score_simulator import ScoreSimulator, WhatIf
 from ..progress import ProgressTracker, ActionItemManager
-from ..models import NotebookAnalysis
+from ..models import NotebookAnalysis, NotebookEstimate
 
 # Initialize FastAPI app
 app = FastAPI(
@@ -29,6 +30,32 @@ templates = Jinja2Templates(directory=str(templates_dir))
 _latest_analysis: Optional[NotebookAnalysis] = None
 _settings = get_settings()
 
+# What-if simulator over the latest analysis, and what it was built from
+_simulator: Optional[ScoreSimulator] = None
+_simulator_source: Optional[object] = None
+
+
+def _get_simulator() -> ScoreSimulator:
+    """Simulator over the latest analysis, rebuilt only when it changes."""
+    global _simulator, _simulator_source
+
+    if _latest_analysis is not None:
+        source = id(_latest_analysis)
+        analysis = _latest_analysis
+    else:
+        analysis_file = _settings.results_dir / "latest_analysis.json"
+        if not analysis_file.exists():
+            raise HTTPException(status_code=404, detail="No analysis available")
+        source = analysis_file.stat().st_mtime_ns
+        analysis = None
+
+    if _simulator is None or source != _simulator_source:
+        if analysis is None:
+            analysis = NotebookAnalysis.load_from_file(analysis_file)
+        _simulator = ScoreSimulator(RubricMatcher(), analysis.page_analyses)
+        _simulator_source = source
+    return _simulator
+
 
 @app.get("/", response_class=HTMLResponse)
 async def home(request: Request):
@@ -65,6 +92,29 @@ async def get_rubric_scores():
     return JSONResponse(_latest_analysis.rubric_scores)
 
 
+@app.get("/api/estimate")
+async def get_estimate():
+    """Get the live score estimate of the latest sampled run (analyze --sample)."""
+    estimate_file = _settings.results_dir / "score_estimate.json"
+    if not estimate_file.exists():
+        raise HTTPException(status_code=404, detail="No score estimate available")
+
+    estimate = NotebookEstimate.load_from_file(estimate_file)
+    return JSONResponse(estimate.model_dump(mode="json"))
+
+
+@app.post("/api/whatif")
+async def simulate_whatif(what_if: WhatIf):
+    """Get the scores the latest analysis would get with pages added or removed."""
+    simulator = _get_simulator()
+    try:
+        result = simulator.simulate(what_if)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    return JSONResponse(result.model_dump(mode="json"))
+
+
 @app.get("/api/gaps")
 async def get_gaps():
     """Get identified gaps."""